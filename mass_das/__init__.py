@@ -3,4 +3,4 @@ MASS-DAS - Sistema Meta-Agente para Arquitetura de Soluções
 """
 from . import agent
 
-__all__ = ["agent"] 
\ No newline at end of file
+__all__ = ["agent"]
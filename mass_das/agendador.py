@@ -0,0 +1,230 @@
+"""
+Agendador do pipeline de agentes do MASS-DAS.
+
+Cada agente declara em `prompts.CONTRATOS_ESTADO` as chaves do session.state
+que lê e a chave que escreve (output_key). A partir desses contratos o
+agendador monta o DAG de dependências, agrupa as etapas em ondas topológicas
+e executa cada onda com paralelismo máximo: um SequentialAgent de ondas, em
+que ondas com mais de uma etapa viram ParallelAgent. A latência de ponta a
+ponta passa a ser a do caminho crítico, não a soma das etapas.
+
+Relatório de ondas e caminho crítico (durações p50 dos traces, se houver):
+    python -m mass_das.agendador [traces.jsonl]
+"""
+import sys
+import logging
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+from google.adk.agents import BaseAgent, ParallelAgent, SequentialAgent
+from google.adk.agents.callback_context import CallbackContext
+from .prompts import CONTRATOS_ESTADO
+from .callbacks import antes_do_agente, depois_do_agente
+from .projecao import PROJECAO_ESTADO
+from .tracing import ARQUIVO_TRACES, carregar_spans, _percentil
+from .sub_agents import (
+    analista,
+    arquiteto,
+    especialista_prompts,
+    definidor_ferramentas,
+    compilador,
+    otimizador,
+    gerador_codigo,
+    publicador,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Chave do estado com a descrição do projeto enviada pelo usuário
+CHAVE_CONSULTA_INICIAL = "initial_query"
+
+
+@dataclass(frozen=True)
+class Etapa:
+    """Agente do pipeline com o seu contrato de estado"""
+    nome: str
+    le: Tuple[str, ...]
+    escreve: str
+    fabrica: Callable[[], BaseAgent]
+
+
+# Agentes LLM do pipeline recebem só o estado que leem (MASS_DAS_PROJECAO_ESTADO)
+_FABRICAS: Dict[str, Callable[[], BaseAgent]] = {
+    "analista_requisitos": partial(analista.criar_agente, projetar_estado=PROJECAO_ESTADO, pipeline=True),
+    "arquiteto_coordenador": partial(arquiteto.criar_agente, projetar_estado=PROJECAO_ESTADO, pipeline=True),
+    "especialista_prompts": partial(especialista_prompts.criar_agente, projetar_estado=PROJECAO_ESTADO, pipeline=True),
+    "definidor_ferramentas": partial(definidor_ferramentas.criar_agente, projetar_estado=PROJECAO_ESTADO, pipeline=True),
+    "compilador_documentacao": partial(compilador.criar_agente, projetar_estado=PROJECAO_ESTADO, pipeline=True),
+    "otimizador_arquitetura": partial(otimizador.criar_agente, projetar_estado=PROJECAO_ESTADO, pipeline=True),
+    "gerador_codigo": partial(gerador_codigo.criar_agente, projetar_estado=PROJECAO_ESTADO, pipeline=True),
+    "publicador_documento": publicador.criar_agente,
+}
+
+
+def etapas_padrao() -> List[Etapa]:
+    """Etapas do MASS-DAS, na ordem em que os contratos foram declarados"""
+    return [
+        Etapa(nome, tuple(le), escreve, _FABRICAS[nome])
+        for nome, (le, escreve) in CONTRATOS_ESTADO.items()
+    ]
+
+
+def dependencias(etapas: Sequence[Etapa]) -> Dict[str, Set[str]]:
+    """
+    Etapas de que cada etapa depende (as que escrevem as chaves que ela lê).
+
+    Chaves que nenhuma etapa escreve são entradas externas e não geram aresta.
+    """
+    produtores: Dict[str, str] = {}
+    for etapa in etapas:
+        if etapa.escreve in produtores:
+            raise ValueError(
+                f"Chave '{etapa.escreve}' escrita por '{produtores[etapa.escreve]}' e '{etapa.nome}'"
+            )
+        produtores[etapa.escreve] = etapa.nome
+    return {
+        etapa.nome: {produtores[chave] for chave in etapa.le if chave in produtores} - {etapa.nome}
+        for etapa in etapas
+    }
+
+
+def ondas(etapas: Sequence[Etapa]) -> List[List[Etapa]]:
+    """
+    Ondas topológicas: cada onda reúne as etapas cujas dependências já foram
+    satisfeitas pelas ondas anteriores e que, portanto, podem rodar em paralelo.
+    """
+    pendentes = dependencias(etapas)
+    por_nome = {etapa.nome: etapa for etapa in etapas}
+    concluidas: Set[str] = set()
+    resultado: List[List[Etapa]] = []
+    while pendentes:
+        prontas = [nome for nome, deps in pendentes.items() if deps <= concluidas]
+        if not prontas:
+            raise ValueError(f"Dependência circular entre as etapas: {', '.join(sorted(pendentes))}")
+        resultado.append([por_nome[nome] for nome in prontas])
+        concluidas.update(prontas)
+        for nome in prontas:
+            del pendentes[nome]
+    return resultado
+
+
+def caminho_critico(etapas: Sequence[Etapa], duracoes: Optional[Dict[str, float]] = None) -> Tuple[List[str], float]:
+    """
+    Caminho mais longo do DAG, ponderado pela duração de cada etapa.
+
+    Etapas sem duração conhecida recebem a mediana das conhecidas (ou 1, sem
+    nenhuma medição: o caminho é então medido em número de etapas).
+
+    Returns:
+        (nomes das etapas do caminho, duração total)
+    """
+    duracoes = duracoes or {}
+    conhecidas = [duracoes[etapa.nome] for etapa in etapas if etapa.nome in duracoes]
+    padrao = _percentil(conhecidas, 0.50) if conhecidas else 1.0
+    deps = dependencias(etapas)
+
+    # Maior custo acumulado até o fim de cada etapa, em ordem topológica
+    custo: Dict[str, float] = {}
+    anterior: Dict[str, Optional[str]] = {}
+    for onda in ondas(etapas):
+        for etapa in onda:
+            predecessor = max(deps[etapa.nome], key=lambda nome: custo[nome], default=None)
+            base = custo[predecessor] if predecessor else 0.0
+            custo[etapa.nome] = base + duracoes.get(etapa.nome, padrao)
+            anterior[etapa.nome] = predecessor
+
+    if not custo:
+        return [], 0.0
+    atual: Optional[str] = max(custo, key=lambda nome: custo[nome])
+    total = custo[atual]
+    caminho: List[str] = []
+    while atual:
+        caminho.append(atual)
+        atual = anterior[atual]
+    return caminho[::-1], total
+
+
+def duracoes_dos_traces(spans: List[Dict]) -> Dict[str, float]:
+    """Duração p50 (ms) de cada agente nos traces gravados"""
+    amostras: Dict[str, List[float]] = {}
+    for span in spans:
+        if span["tipo"] == "agente" and span.get("fim"):
+            amostras.setdefault(span["nome"], []).append((span["fim"] - span["inicio"]) * 1000)
+    return {nome: _percentil(valores, 0.50) for nome, valores in amostras.items()}
+
+
+def _registrar_consulta_inicial(callback_context: CallbackContext) -> None:
+    """Copia a mensagem do usuário para `initial_query`, lida pelas primeiras etapas"""
+    if callback_context.state.get(CHAVE_CONSULTA_INICIAL):
+        return None
+    conteudo = callback_context.user_content
+    if conteudo and conteudo.parts:
+        texto = "".join(parte.text or "" for parte in conteudo.parts)
+        if texto:
+            callback_context.state[CHAVE_CONSULTA_INICIAL] = texto
+    return None
+
+
+def criar_pipeline(etapas: Optional[Sequence[Etapa]] = None, nome: str = "mass_das_pipeline") -> SequentialAgent:
+    """
+    Monta o pipeline agendado: um SequentialAgent com uma entrada por onda.
+
+    Ondas de uma etapa usam o próprio agente; ondas com várias etapas viram um
+    ParallelAgent. Cada chamada cria instâncias novas dos agentes.
+    """
+    etapas = list(etapas or etapas_padrao())
+    grupos: List[BaseAgent] = []
+    for numero, onda in enumerate(ondas(etapas), start=1):
+        agentes = [etapa.fabrica() for etapa in onda]
+        if len(agentes) == 1:
+            grupos.append(agentes[0])
+        else:
+            grupos.append(ParallelAgent(
+                name=f"onda_{numero}",
+                sub_agents=agentes,
+                before_agent_callback=antes_do_agente,
+                after_agent_callback=depois_do_agente,
+            ))
+    logger.debug("Pipeline %s: %s", nome, " -> ".join(agente.name for agente in grupos))
+    return SequentialAgent(
+        name=nome,
+        sub_agents=grupos,
+        before_agent_callback=[_registrar_consulta_inicial, antes_do_agente],
+        after_agent_callback=depois_do_agente,
+    )
+
+
+def relatorio(etapas: Optional[Sequence[Etapa]] = None, duracoes: Optional[Dict[str, float]] = None) -> str:
+    """Ondas, caminho crítico e estimativa de latência sequencial x agendada"""
+    etapas = list(etapas or etapas_padrao())
+    duracoes = duracoes or {}
+    deps = dependencias(etapas)
+    caminho, total = caminho_critico(etapas, duracoes)
+    unidade = "ms" if duracoes else "etapas"
+    conhecidas = [duracoes[etapa.nome] for etapa in etapas if etapa.nome in duracoes]
+    padrao = _percentil(conhecidas, 0.50) if conhecidas else 1.0
+    soma = sum(duracoes.get(etapa.nome, padrao) for etapa in etapas)
+
+    linhas = ["Ondas:"]
+    for numero, onda in enumerate(ondas(etapas), start=1):
+        descricao = " | ".join(
+            f"{etapa.nome}{'*' if etapa.nome in caminho else ''} ({', '.join(sorted(deps[etapa.nome])) or 'entrada'})"
+            for etapa in onda
+        )
+        linhas.append(f"  {numero}. {descricao}")
+    linhas.append(f"\nCaminho crítico (*): {' -> '.join(caminho)}")
+    linhas.append(f"Duração estimada: {total:.1f} {unidade} agendado x {soma:.1f} {unidade} sequencial")
+    return "\n".join(linhas)
+
+
+if __name__ == "__main__":
+    from .logs import configurar_logging
+
+    configurar_logging()
+    arquivo_traces = Path(sys.argv[1]) if len(sys.argv) > 1 else ARQUIVO_TRACES
+    medidas = duracoes_dos_traces(carregar_spans(arquivo_traces)) if arquivo_traces.exists() else {}
+    if not medidas:
+        print(f"ℹ️ Sem traces em {arquivo_traces}: caminho crítico medido em número de etapas\n")
+    print(relatorio(duracoes=medidas))
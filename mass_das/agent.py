@@ -3,18 +3,27 @@ Agente Principal do MASS-DAS - Sistema Meta-Agente para Arquitetura de Soluçõe
 
 Este é o agente orquestrador que coordena os 6 agentes especializados
 para automatizar a criação de Documentos de Arquitetura de Solução (DAS).
+
+MASS_DAS_MODO escolhe o `root_agent`:
+- "llm" (padrão): coordenador LLM que transfere a tarefa entre os sub-agentes
+- "pipeline": etapas fixas executadas pelo agendador, sem chamadas ao modelo
+  para rotear (ver mass_das.agendador)
 """
 import os
 from google.adk.agents import Agent
 from .sub_agents import (
-    analista_agent,
-    arquiteto_agent,
-    especialista_prompts_agent,
-    definidor_ferramentas_agent,
-    compilador_agent,
-    otimizador_agent,
-    gerador_codigo_agent
+    analista,
+    arquiteto,
+    especialista_prompts,
+    definidor_ferramentas,
+    compilador,
+    otimizador,
+    gerador_codigo,
 )
+from .logs import configurar_logging
+from .callbacks import callbacks_rastreamento
+from .agendador import criar_pipeline
+from .roteador import modelo_do_agente
 from .tools import (
     consultar_documentacao_adk,
     buscar_arquiteturas_de_referencia,
@@ -24,11 +33,14 @@ from .tools import (
     gerar_codigo_agentes
 )
 
-# Agente principal conforme padrão ADK
-root_agent = Agent(
-    model=os.getenv("ROOT_AGENT_MODEL", "gemini-2.5-pro-preview-06-05"),
-    name="mass_das_system",
-    instruction="""
+# Ponto de entrada do ADK (adk run/web): o handler de log do pacote é instalado
+# aqui, e não nos módulos de biblioteca
+configurar_logging()
+
+# Modo de execução: "llm" (coordenador) ou "pipeline" (etapas agendadas)
+MODO_EXECUCAO = os.getenv("MASS_DAS_MODO", "llm").lower()
+
+COORDENADOR_PROMPT = """
 # MASS-DAS v1.1.0 - Meta-Agent System for Solution Architecture Design + Code Generation
 
 Você é o coordenador principal do MASS-DAS, um sistema avançado que não apenas projeta 
@@ -77,22 +89,42 @@ Não apenas entregar um documento de arquitetura, mas um **PROJETO PYTHON FUNCIO
 que o usuário pode executar imediatamente com `adk run projeto_name`.
 
 Execute sempre o fluxo completo: Design → Documentação → **Código Real**.
-""",
-    sub_agents=[
-        analista_agent,
-        arquiteto_agent,
-        especialista_prompts_agent,
-        definidor_ferramentas_agent,
-        compilador_agent,
-        otimizador_agent,
-        gerador_codigo_agent
-    ],
-    tools=[
-        consultar_documentacao_adk,
-        buscar_arquiteturas_de_referencia,
-        salvar_markdown,
-        validar_qualidade_resposta_url,
-        consultar_samples_adk_github,
-        gerar_codigo_agentes
-    ],
-) 
\ No newline at end of file
+"""
+
+
+def criar_coordenador() -> Agent:
+    """Agente coordenador conforme padrão ADK, com instâncias novas dos sub-agentes"""
+    return Agent(
+        model=modelo_do_agente("mass_das_system"),
+        name="mass_das_system",
+        instruction=COORDENADOR_PROMPT,
+        sub_agents=[
+            analista.criar_agente(),
+            arquiteto.criar_agente(),
+            especialista_prompts.criar_agente(),
+            definidor_ferramentas.criar_agente(),
+            compilador.criar_agente(),
+            otimizador.criar_agente(),
+            gerador_codigo.criar_agente()
+        ],
+        tools=[
+            consultar_documentacao_adk,
+            buscar_arquiteturas_de_referencia,
+            salvar_markdown,
+            validar_qualidade_resposta_url,
+            consultar_samples_adk_github,
+            gerar_codigo_agentes
+        ],
+        **callbacks_rastreamento(),
+    )
+
+
+# Só o modo escolhido é montado: o pipeline (mesmas etapas em ondas paralelas,
+# sem roteamento pelo LLM) vem de mass_das.agendador
+_FABRICAS_MODO = {"llm": criar_coordenador, "pipeline": criar_pipeline}
+
+if MODO_EXECUCAO not in _FABRICAS_MODO:
+    raise ValueError(f"MASS_DAS_MODO inválido: {MODO_EXECUCAO} (opções: llm, pipeline)")
+
+# Agente principal carregado pelo ADK
+root_agent = _FABRICAS_MODO[MODO_EXECUCAO]()
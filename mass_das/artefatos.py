@@ -0,0 +1,357 @@
+"""
+Armazém de artefatos endereçado por conteúdo para os projetos gerados.
+
+Cada arquivo gerado vira um blob imutável em `<raiz>/objetos/<aa>/<sha256>`,
+interno ao armazém; o projeto em `output/<nome_projeto>` recebe uma cópia
+privada e editável de cada arquivo (um reflink copy-on-write do blob, quando
+o sistema de arquivos suporta, ou os próprios bytes) e um manifesto
+`.mass_das_artefatos.json` com o hash de cada arquivo. Com reflinks, arquivos
+idênticos entre projetos (README, Dockerfile, .env.example...) compartilham
+os blocos em disco até serem editados.
+
+O coletor de lixo (opcional, MASS_DAS_ARTEFATOS_GC) só remove blobs que
+nenhum projeto referencia mais; os projetos do usuário nunca são apagados.
+
+Estatísticas e coleta manual:
+    python -m mass_das.artefatos
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+from .escrita import FSYNC_PADRAO, escrever_atomico, bloqueio_arquivo
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem reflink
+    fcntl = None
+
+
+logger = logging.getLogger(__name__)
+
+DIRETORIO_ARTEFATOS = Path(os.getenv("MASS_DAS_ARTEFATOS_DIR", "output/.artefatos"))
+# Coleta dos blobs sem referência a cada projeto gravado (manual: python -m mass_das.artefatos)
+COLETA_AUTOMATICA = os.getenv("MASS_DAS_ARTEFATOS_GC", "false").lower() == "true"
+USAR_REFLINK = os.getenv("MASS_DAS_ARTEFATOS_REFLINK", "true").lower() == "true"
+# ioctl FICLONE do Linux (linux/fs.h): clona os blocos de outro arquivo
+_FICLONE = 0x40049409
+# Threads de escrita por projeto. Sem fsync as escritas são curtas demais para
+# compensar o pool; com fsync, as esperas pelo disco se sobrepõem
+THREADS_ESCRITA = int(os.getenv("MASS_DAS_SAIDA_THREADS", "8" if FSYNC_PADRAO else "1"))
+
+NOME_MANIFESTO = ".mass_das_artefatos.json"
+VERSAO_MANIFESTO = 1
+
+
+def ler_manifesto_projeto(projeto: Path) -> Optional[Dict[str, Any]]:
+    """Manifesto de um projeto gerado, ou None se não houver (ou for de outra versão)"""
+    caminho = Path(projeto) / NOME_MANIFESTO
+    try:
+        dados = json.loads(caminho.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return None
+    return dados if dados.get("versao") == VERSAO_MANIFESTO else None
+
+
+class ArmazemArtefatos:
+    """Blobs deduplicados por SHA-256, índice de projetos e coleta dos blobs sem referência"""
+
+    def __init__(self, raiz: Path = DIRETORIO_ARTEFATOS, coleta_automatica: bool = COLETA_AUTOMATICA,
+                 usar_reflink: bool = USAR_REFLINK, threads: int = THREADS_ESCRITA):
+        self.raiz = Path(raiz)
+        self.coleta_automatica = coleta_automatica
+        self.usar_reflink = usar_reflink and fcntl is not None
+        self.threads = threads
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._prefixos_criados: Set[Path] = set()
+        self._objetos = self.raiz / "objetos"
+        self._indice = self.raiz / "projetos.json"
+
+    def caminho_blob(self, hash_conteudo: str) -> Path:
+        return self._objetos / hash_conteudo[:2] / hash_conteudo
+
+    def planejar(self, projeto: Path, entradas: Dict[str, str]) -> Dict[str, List[str]]:
+        """
+        Decide o que regenerar comparando os hashes de entrada com o manifesto.
+
+        Sem efeitos colaterais (pode rodar fora do bloqueio do armazém): lê o
+        manifesto e compara o SHA-256 de cada arquivo do projeto com o gravado.
+
+        Args:
+            projeto: Diretório do projeto
+            entradas: Hash das entradas de cada arquivo, por caminho relativo
+
+        Returns:
+            dict: "gerar" (novos, ausentes ou com entradas alteradas),
+            "inalterados" (mesmas entradas, arquivo intacto) e
+            "modificados" (editados fora do MASS-DAS - nunca sobrescritos)
+        """
+        projeto = Path(projeto)
+        anteriores = (ler_manifesto_projeto(projeto) or {}).get("arquivos", {})
+        plano: Dict[str, List[str]] = {"gerar": [], "inalterados": [], "modificados": []}
+        for relativo, hash_entrada in entradas.items():
+            registro = anteriores.get(relativo)
+            estado = "ausente" if registro is None else self._estado_arquivo(projeto / relativo, registro)
+            if estado == "modificado":
+                plano["modificados"].append(relativo)
+            elif estado == "intacto" and registro.get("entrada") == hash_entrada:
+                plano["inalterados"].append(relativo)
+            else:
+                plano["gerar"].append(relativo)
+        return plano
+
+    def gravar_projeto(self, projeto: Path, arquivos: Dict[str, str],
+                       entradas: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Materializa um projeto a partir de {caminho relativo: conteúdo}.
+
+        Só blobs ainda inexistentes são escritos; os arquivos do projeto são
+        cópias privadas deles (reflink ou escrita dos bytes), criadas em
+        paralelo (as chamadas de sistema liberam o GIL). Arquivos de uma
+        geração anterior que não fazem mais parte do projeto são removidos.
+
+        Com `entradas` (ver `planejar`), caminhos presentes nelas mas ausentes
+        de `arquivos` são mantidos como estão, com o registro anterior.
+
+        Returns:
+            dict: Contagem de arquivos, blobs novos e bytes efetivamente escritos
+        """
+        projeto = Path(projeto)
+        estatisticas = {"arquivos": len(arquivos), "blobs_novos": 0, "bytes_novos": 0, "reutilizados": 0}
+
+        with bloqueio_arquivo(self._indice):
+            anterior = ler_manifesto_projeto(projeto)
+            registros: Dict[str, Dict[str, Any]] = {}
+            tarefas = []
+            for relativo, conteudo in arquivos.items():
+                dados = conteudo.encode("utf-8")
+                hash_conteudo = hashlib.sha256(dados).hexdigest()
+                registros[relativo] = {"sha256": hash_conteudo, "tamanho": len(dados)}
+                if entradas is not None:
+                    registros[relativo]["entrada"] = entradas[relativo]
+                tarefas.append((self.caminho_blob(hash_conteudo), dados, projeto / relativo))
+
+            # Diretórios criados uma vez por lote, não a cada arquivo
+            for diretorio in {destino.parent for _, _, destino in tarefas} | {
+                blob.parent for blob, _, _ in tarefas
+            }:
+                if diretorio not in self._prefixos_criados:
+                    diretorio.mkdir(parents=True, exist_ok=True)
+                    if diretorio.parent == self._objetos:
+                        self._prefixos_criados.add(diretorio)
+
+            def gravar(tarefa) -> bool:
+                blob, dados, destino = tarefa
+                novo = self._gravar_blob(blob, dados)
+                self._materializar(blob, dados, destino)
+                return novo
+
+            if self.threads > 1 and len(tarefas) > 1:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(self.threads, thread_name_prefix="mass_das_artefatos")
+                novos = list(self._executor.map(gravar, tarefas))
+            else:
+                novos = [gravar(tarefa) for tarefa in tarefas]
+            for novo, (_, dados, _) in zip(novos, tarefas):
+                if novo:
+                    estatisticas["blobs_novos"] += 1
+                    estatisticas["bytes_novos"] += len(dados)
+                else:
+                    estatisticas["reutilizados"] += 1
+
+            if anterior is not None:
+                for relativo in (entradas or {}).keys() - registros.keys():
+                    if relativo in anterior["arquivos"]:
+                        registros[relativo] = anterior["arquivos"][relativo]
+                        self._desvincular(projeto / relativo, registros[relativo]["sha256"])
+                obsoletos = {rel: reg for rel, reg in anterior["arquivos"].items() if rel not in registros}
+                self._remover_arquivos(projeto, obsoletos)
+
+            agora = time.time()
+            escrever_atomico(projeto / NOME_MANIFESTO, [json.dumps(
+                {"versao": VERSAO_MANIFESTO, "atualizado": agora, "arquivos": registros},
+                ensure_ascii=False, separators=(",", ":"),
+            )])
+            indice = self._ler_indice()
+            indice[str(projeto.resolve())] = agora
+            self._gravar_indice(indice)
+
+            if self.coleta_automatica:
+                estatisticas["coleta"] = self._coletar(indice)
+
+        logger.debug(
+            "Projeto %s: %d arquivos, %d blobs novos (%d bytes), %d reutilizados",
+            projeto, estatisticas["arquivos"], estatisticas["blobs_novos"],
+            estatisticas["bytes_novos"], estatisticas["reutilizados"],
+        )
+        return estatisticas
+
+    def coletar_lixo(self) -> Dict[str, Any]:
+        """Remove os blobs que nenhum projeto referencia (projetos apagados ou regenerados)"""
+        with bloqueio_arquivo(self._indice):
+            return self._coletar(self._ler_indice())
+
+    def estatisticas(self) -> Dict[str, Any]:
+        indice = self._ler_indice()
+        logicos = 0
+        referenciados: Dict[str, int] = {}
+        for caminho in indice:
+            manifesto = ler_manifesto_projeto(Path(caminho))
+            for registro in (manifesto or {}).get("arquivos", {}).values():
+                logicos += registro["tamanho"]
+                referenciados[registro["sha256"]] = registro["tamanho"]
+        return {
+            "projetos": len(indice),
+            "blobs": len(referenciados),
+            "bytes_unicos": sum(referenciados.values()),
+            "bytes_logicos": logicos,
+        }
+
+    # --- blobs e materialização ---
+
+    def _gravar_blob(self, blob: Path, dados: bytes) -> bool:
+        if os.path.exists(blob):
+            return False
+        try:
+            escrever_atomico(blob, [dados], encoding=None, criar_diretorio=False)
+        except FileNotFoundError:
+            # Armazém apagado durante a vida do processo
+            self._prefixos_criados.clear()
+            escrever_atomico(blob, [dados], encoding=None)
+        os.chmod(blob, 0o444)
+        return True
+
+    def _materializar(self, blob: Path, dados: bytes, destino: Path):
+        """Cópia privada e gravável do blob no projeto (o blob nunca é exposto)"""
+        if self.usar_reflink:
+            temporario = destino.with_name(f".{destino.name}.{os.getpid()}.tmp")
+            try:
+                with open(blob, "rb") as origem, open(temporario, "wb") as copia:
+                    fcntl.ioctl(copia.fileno(), _FICLONE, origem.fileno())
+                os.replace(temporario, destino)
+                return
+            except OSError as e:
+                # Outro dispositivo, FS sem reflink (ext4, tmpfs...): gravar os bytes daqui em diante
+                logger.info("Reflink indisponível em %s (%s); gravando cópias", destino.parent, e)
+                self.usar_reflink = False
+                try:
+                    os.unlink(temporario)
+                except FileNotFoundError:
+                    pass
+        escrever_atomico(destino, [dados], encoding=None, criar_diretorio=False)
+
+    def _desvincular(self, caminho: Path, hash_conteudo: str):
+        """Troca por uma cópia privada um arquivo ainda ligado ao blob (projetos de versões com hardlinks)"""
+        blob = self.caminho_blob(hash_conteudo)
+        try:
+            if not os.path.samefile(caminho, blob):
+                return
+        except FileNotFoundError:
+            return
+        self._materializar(blob, blob.read_bytes(), caminho)
+
+    @staticmethod
+    def _estado_arquivo(caminho: Path, registro: Dict[str, Any]) -> str:
+        """
+        "intacto", "modificado" ou "ausente" em relação ao conteúdo gerado.
+
+        Só lê o arquivo: o SHA-256 do conteúdo é comparado ao do manifesto (um
+        tamanho diferente já basta para "modificado").
+        """
+        try:
+            with open(caminho, "rb") as arquivo:
+                if os.fstat(arquivo.fileno()).st_size != registro["tamanho"]:
+                    return "modificado"
+                hash_conteudo = hashlib.file_digest(arquivo, "sha256").hexdigest()
+        except FileNotFoundError:
+            return "ausente"
+        return "intacto" if hash_conteudo == registro["sha256"] else "modificado"
+
+    def _remover_arquivos(self, projeto: Path, registros: Dict[str, Dict[str, Any]]):
+        """Remove arquivos do manifesto que ainda têm o conteúdo gerado (edições são preservadas)"""
+        for relativo, registro in registros.items():
+            caminho = projeto / relativo
+            estado = self._estado_arquivo(caminho, registro)
+            if estado == "ausente":
+                continue
+            if estado == "modificado":
+                logger.warning("Arquivo editado preservado: %s", caminho)
+                continue
+            caminho.unlink(missing_ok=True)
+            # Remove diretórios que ficaram vazios, até a raiz do projeto
+            pai = caminho.parent
+            while pai != projeto:
+                try:
+                    pai.rmdir()
+                except OSError:
+                    break
+                pai = pai.parent
+
+    # --- índice de projetos e coleta ---
+
+    def _ler_indice(self) -> Dict[str, float]:
+        try:
+            return json.loads(self._indice.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _gravar_indice(self, indice: Dict[str, float]):
+        # Sem indentação: o encoder em C é bem mais rápido
+        escrever_atomico(self._indice, [json.dumps(indice, ensure_ascii=False, separators=(",", ":"))])
+
+    def _coletar(self, indice: Dict[str, float]) -> Dict[str, Any]:
+        referenciados: Dict[str, int] = {}
+        esquecidos = 0
+        for caminho in list(indice):
+            manifesto = ler_manifesto_projeto(Path(caminho))
+            if manifesto is None:
+                del indice[caminho]  # projeto apagado manualmente
+                esquecidos += 1
+                continue
+            for registro in manifesto["arquivos"].values():
+                referenciados[registro["sha256"]] = registro["tamanho"]
+
+        blobs_removidos = self._remover_blobs_orfaos(set(referenciados))
+        self._gravar_indice(indice)
+        return {
+            "projetos_esquecidos": esquecidos,
+            "blobs_removidos": blobs_removidos,
+            "bytes_unicos": sum(referenciados.values()),
+        }
+
+    def _remover_blobs_orfaos(self, referenciados: Set[str]) -> int:
+        removidos = 0
+        if not self._objetos.is_dir():
+            return removidos
+        for prefixo in os.scandir(self._objetos):
+            if not prefixo.is_dir():
+                continue
+            for blob in os.scandir(prefixo.path):
+                if blob.name not in referenciados and not blob.name.startswith("."):
+                    os.unlink(blob.path)
+                    removidos += 1
+        return removidos
+
+
+_armazem: Optional[ArmazemArtefatos] = None
+
+
+def obter_armazem_artefatos() -> ArmazemArtefatos:
+    """Retorna o armazém de artefatos compartilhado do processo"""
+    global _armazem
+    if _armazem is None:
+        _armazem = ArmazemArtefatos()
+    return _armazem
+
+
+if __name__ == "__main__":
+    from .logs import configurar_logging
+
+    configurar_logging()
+    armazem = obter_armazem_artefatos()
+    print(f"🧹 Coleta: {armazem.coletar_lixo()}")
+    print(f"📦 Armazém: {armazem.estatisticas()}")
@@ -0,0 +1,290 @@
+"""
+Base de conhecimento de arquiteturas de referência do MASS-DAS.
+
+As arquiteturas são carregadas de um diretório de arquivos JSON/YAML
+(`MASS_DAS_ARQUITETURAS_DIR`) ou, na ausência dele, da base padrão embutida.
+Cada arquitetura vira um vetor TF-IDF de n-gramas com hashing; a busca é
+uma única multiplicação matriz-vetor seguida de seleção do top-k.
+
+A recarga é incremental: apenas arquivos novos ou modificados são lidos e
+vetorizados novamente. Cada arquivo guarda o seu bloco de linhas já
+ponderado e normalizado com o IDF de referência; uma mudança pondera só os
+blocos novos. Como o IDF muda com o tamanho da base, os blocos antigos ficam
+com um IDF levemente defasado (a consulta usa o mesmo IDF de referência,
+então os scores seguem comparáveis entre si): quando a deriva relativa do
+IDF passa de LIMITE_DERIVA_IDF, todos os blocos são reponderados. A matriz
+de busca continua sendo a concatenação dos blocos (uma cópia, sem
+recalcular pesos nem normas).
+"""
+import os
+import json
+import time
+import zlib
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from .ranking import tokenizar
+
+
+logger = logging.getLogger(__name__)
+
+
+# Diretório com arquivos de arquiteturas de referência (configurável via ambiente)
+DIRETORIO_ARQUITETURAS = os.getenv("MASS_DAS_ARQUITETURAS_DIR", "")
+
+# Dimensão do espaço de hashing das features
+DIMENSAO_HASH = int(os.getenv("MASS_DAS_ARQUITETURAS_DIMENSAO", "4096"))
+
+# Intervalo mínimo entre verificações de mudança nos arquivos (segundos)
+INTERVALO_RECARGA = 2.0
+
+# Deriva relativa máxima do IDF (nos termos presentes) antes de reponderar todos os blocos
+LIMITE_DERIVA_IDF = 0.1
+
+# Palavras muito frequentes que não discriminam arquiteturas
+STOPWORDS = frozenset({
+    "a", "o", "e", "de", "da", "do", "das", "dos", "em", "no", "na", "nos", "nas",
+    "um", "uma", "para", "por", "com", "que", "se", "ao", "os", "as",
+    "the", "of", "and", "to", "in", "for", "on", "with", "an", "is",
+})
+
+ARQUITETURAS_PADRAO = [
+    {
+        "nome": "Sistema de Análise de Dados",
+        "padrão": "Sequential + Coordinator",
+        "agentes": ["Coletor", "Analisador", "Visualizador"],
+        "tools": ["fetch_data", "process_data", "generate_chart"],
+        "caso_uso": "análise de dados business intelligence"
+    },
+    {
+        "nome": "Chatbot Multimodal",
+        "padrão": "LlmAgent com delegação",
+        "agentes": ["Router", "TextProcessor", "ImageProcessor"],
+        "tools": ["process_text", "process_image", "generate_response"],
+        "caso_uso": "atendimento ao cliente multimodal"
+    },
+    {
+        "nome": "Sistema de Geração de Conteúdo",
+        "padrão": "Coordinator + Parallel",
+        "agentes": ["Pesquisador", "Escritor", "Revisor", "Editor"],
+        "tools": ["research_topic", "generate_content", "review_content"],
+        "caso_uso": "criação automática de documentos"
+    },
+    {
+        "nome": "Pipeline de Processamento",
+        "padrão": "Sequential",
+        "agentes": ["Validator", "Processor", "Enricher", "Saver"],
+        "tools": ["validate_input", "process_data", "enrich_data", "save_output"],
+        "caso_uso": "processamento de dados em pipeline"
+    }
+]
+
+ARQUITETURA_GENERICA = {
+    "nome": "Arquitetura Genérica Multi-Agente",
+    "padrão": "Sequential com Coordinator",
+    "agentes": ["Analisador", "Processador", "Gerador"],
+    "tools": ["analyze_input", "process_data", "generate_output"],
+    "caso_uso": "solução genérica multi-agente"
+}
+
+
+def vetorizar(texto: str, dimensao: int = DIMENSAO_HASH) -> np.ndarray:
+    """Contagens de palavras e trigramas de caracteres, com hashing, em um vetor denso"""
+    vetor = np.zeros(dimensao, dtype=np.float32)
+    for palavra in tokenizar(texto):
+        if palavra in STOPWORDS:
+            continue
+        vetor[zlib.crc32(palavra.encode()) % dimensao] += 1.0
+        marcada = f"#{palavra}#"
+        for i in range(len(marcada) - 2):
+            vetor[zlib.crc32(b"3:" + marcada[i:i + 3].encode()) % dimensao] += 0.5
+    return vetor
+
+
+def texto_arquitetura(arquitetura: Dict) -> str:
+    """Texto indexado de uma arquitetura (todos os campos descritivos)"""
+    partes = []
+    for chave in ("nome", "padrão", "padrao", "caso_uso", "descricao"):
+        valor = arquitetura.get(chave)
+        if valor:
+            partes.append(str(valor))
+    for chave in ("agentes", "tools"):
+        partes.extend(str(item).replace("_", " ") for item in arquitetura.get(chave, []))
+    return " ".join(partes)
+
+
+@dataclass
+class _ArquivoIndexado:
+    assinatura: Tuple[float, int]
+    arquiteturas: List[Dict]
+    contagens: np.ndarray  # uma linha por arquitetura
+    # Linhas ponderadas pelo IDF de referência e normalizadas (None = a calcular)
+    bloco: Optional[np.ndarray] = None
+
+
+class BaseArquiteturas:
+    """Base de arquiteturas com busca por similaridade de cosseno sobre TF-IDF"""
+
+    def __init__(self, diretorio: Optional[Path] = None, dimensao: int = DIMENSAO_HASH):
+        self.diretorio = Path(diretorio) if diretorio else None
+        self.dimensao = dimensao
+        self._arquivos: Dict[str, _ArquivoIndexado] = {}
+        self._df = np.zeros(dimensao, dtype=np.float32)
+        self._matriz: Optional[np.ndarray] = None
+        self._idf: Optional[np.ndarray] = None
+        self._arquiteturas: List[Dict] = []
+        self._ultima_verificacao = 0.0
+        self.recarregar(forcar=True)
+
+    def __len__(self) -> int:
+        return len(self._arquiteturas)
+
+    def recarregar(self, forcar: bool = False) -> Dict[str, int]:
+        """
+        Sincroniza a base com o diretório, revetorizando apenas arquivos alterados.
+
+        Returns:
+            dict: Quantidade de arquivos adicionados, atualizados e removidos
+        """
+        agora = time.monotonic()
+        if not forcar and agora - self._ultima_verificacao < INTERVALO_RECARGA:
+            return {"adicionados": 0, "atualizados": 0, "removidos": 0}
+        self._ultima_verificacao = agora
+
+        atuais = self._listar_fontes()
+        mudancas = {"adicionados": 0, "atualizados": 0, "removidos": 0}
+
+        for nome in list(self._arquivos):
+            if nome not in atuais:
+                self._remover(nome)
+                mudancas["removidos"] += 1
+
+        for nome, assinatura in atuais.items():
+            existente = self._arquivos.get(nome)
+            if existente is not None and existente.assinatura == assinatura:
+                continue
+            arquiteturas = self._ler_fonte(nome)
+            if arquiteturas is None:
+                # Leitura falhou (ex: arquivo em meio a uma gravação): mantém as
+                # entradas e a assinatura anteriores e tenta de novo na próxima recarga
+                continue
+            if existente is not None:
+                self._remover(nome)
+                mudancas["atualizados"] += 1
+            else:
+                mudancas["adicionados"] += 1
+            contagens = (
+                np.vstack([vetorizar(texto_arquitetura(a), self.dimensao) for a in arquiteturas])
+                if arquiteturas else np.zeros((0, self.dimensao), dtype=np.float32)
+            )
+            self._df += (contagens > 0).sum(axis=0)
+            self._arquivos[nome] = _ArquivoIndexado(assinatura, arquiteturas, contagens)
+
+        if forcar or any(mudancas.values()):
+            self._recompor()
+        return mudancas
+
+    def buscar(self, descricao: str, top_k: int = 5, score_minimo: float = 0.05) -> List[Dict]:
+        """
+        Retorna as arquiteturas mais similares à descrição, com `score` de 0 a 1.
+        """
+        self.recarregar()
+        if self._matriz is None or not len(self._arquiteturas):
+            return []
+
+        consulta = vetorizar(descricao, self.dimensao) * self._idf
+        norma = np.linalg.norm(consulta)
+        if norma == 0:
+            return []
+        scores = self._matriz @ (consulta / norma)
+
+        k = min(top_k, len(scores))
+        melhores = np.argpartition(-scores, k - 1)[:k]
+        melhores = melhores[np.argsort(-scores[melhores])]
+        return [
+            dict(self._arquiteturas[i], score=round(float(scores[i]), 4))
+            for i in melhores
+            if scores[i] >= score_minimo
+        ]
+
+    def _listar_fontes(self) -> Dict[str, Tuple[float, int]]:
+        if self.diretorio is None:
+            return {"<padrão>": (0.0, 0)}
+        fontes = {}
+        if self.diretorio.is_dir():
+            for caminho in sorted(self.diretorio.rglob("*")):
+                if caminho.suffix.lower() in (".json", ".yaml", ".yml") and caminho.is_file():
+                    estado = caminho.stat()
+                    fontes[str(caminho)] = (estado.st_mtime, estado.st_size)
+        return fontes
+
+    def _ler_fonte(self, nome: str) -> Optional[List[Dict]]:
+        """Arquiteturas do arquivo, ou None se ele não pôde ser lido"""
+        if nome == "<padrão>":
+            return list(ARQUITETURAS_PADRAO)
+        caminho = Path(nome)
+        try:
+            texto = caminho.read_text(encoding="utf-8")
+            if caminho.suffix.lower() == ".json":
+                dados = json.loads(texto)
+            else:
+                try:
+                    import yaml
+                except ImportError:
+                    logger.warning("PyYAML não instalado - ignorando %s", caminho.name)
+                    return []
+                dados = yaml.safe_load(texto)
+        except Exception as e:
+            logger.error("Erro ao ler arquitetura %s: %s", caminho.name, e)
+            return None
+        if isinstance(dados, dict):
+            dados = [dados]
+        return [a for a in (dados or []) if isinstance(a, dict) and a.get("nome")]
+
+    def _remover(self, nome: str):
+        arquivo = self._arquivos.pop(nome)
+        self._df -= (arquivo.contagens > 0).sum(axis=0)
+
+    def _recompor(self):
+        arquivos = list(self._arquivos.values())
+        self._arquiteturas = [a for arquivo in arquivos for a in arquivo.arquiteturas]
+        if not self._arquiteturas:
+            self._matriz = None
+            return
+
+        total = len(self._arquiteturas)
+        idf = (np.log((1 + total) / (1 + self._df)) + 1).astype(np.float32)
+        if self._idf is None or self._deriva_idf(idf) > LIMITE_DERIVA_IDF:
+            logger.debug("Reponderando %d arquivos de arquiteturas com o novo IDF", len(arquivos))
+            self._idf = idf
+            for arquivo in arquivos:
+                arquivo.bloco = None
+        for arquivo in arquivos:
+            if arquivo.bloco is None:
+                arquivo.bloco = self._ponderar(arquivo.contagens)
+        self._matriz = np.vstack([arquivo.bloco for arquivo in arquivos])
+
+    def _deriva_idf(self, idf: np.ndarray) -> float:
+        """Maior variação relativa do IDF entre os termos presentes na base"""
+        presentes = self._df > 0
+        if not presentes.any():
+            return 0.0
+        return float(np.max(np.abs(idf[presentes] - self._idf[presentes]) / self._idf[presentes]))
+
+    def _ponderar(self, contagens: np.ndarray) -> np.ndarray:
+        matriz = contagens * self._idf
+        normas = np.linalg.norm(matriz, axis=1, keepdims=True)
+        normas[normas == 0] = 1.0
+        return matriz / normas
+
+_base: Optional[BaseArquiteturas] = None
+
+
+def obter_base_arquiteturas() -> BaseArquiteturas:
+    """Retorna a base de arquiteturas compartilhada do processo"""
+    global _base
+    if _base is None:
+        _base = BaseArquiteturas(Path(DIRETORIO_ARQUITETURAS) if DIRETORIO_ARQUITETURAS else None)
+    return _base
@@ -0,0 +1,244 @@
+"""
+Cache persistente em disco do MASS-DAS.
+
+Armazena valores binários com metadados em um banco SQLite (modo WAL), o que
+permite que vários processos de trabalho compartilhem o mesmo cache com
+segurança. Entradas expiram por TTL e o tamanho total é limitado por
+despejo LRU. Contadores de uso ficam persistidos junto com as entradas.
+
+Leituras não abrem transação de escrita: o horário de acesso (para o LRU) e
+os contadores ficam em memória e são gravados junto com a próxima escrita,
+a cada `_MAX_PENDENTES` registros ou na saída do processo.
+"""
+import os
+import json
+import time
+import atexit
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Any
+
+
+# Diretório base dos caches em disco (configurável via ambiente)
+DIRETORIO_CACHE_PADRAO = Path(os.getenv("MASS_DAS_CACHE_DIR", ".mass_das_cache"))
+
+# Acessos e incrementos de contador acumulados em memória antes de uma escrita
+_MAX_PENDENTES = 64
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS entradas (
+    chave TEXT PRIMARY KEY,
+    valor BLOB NOT NULL,
+    meta TEXT NOT NULL,
+    criado REAL NOT NULL,
+    acessado REAL NOT NULL,
+    tamanho INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entradas_acessado ON entradas(acessado);
+CREATE TABLE IF NOT EXISTS contadores (
+    nome TEXT PRIMARY KEY,
+    valor INTEGER NOT NULL
+);
+"""
+
+
+@dataclass
+class EntradaCache:
+    """Entrada lida do cache"""
+    valor: bytes
+    meta: Dict[str, Any] = field(default_factory=dict)
+    criado: float = 0.0
+    fresca: bool = False
+
+
+class CacheDisco:
+    """Cache chave/valor em SQLite com TTL e despejo LRU por tamanho"""
+
+    def __init__(self, caminho: Path, ttl_segundos: float = 3600, tamanho_maximo_bytes: int = 50 * 1024 * 1024):
+        self.caminho = Path(caminho)
+        self.ttl_segundos = ttl_segundos
+        self.tamanho_maximo_bytes = tamanho_maximo_bytes
+        self._local = threading.local()
+        self._pendentes_lock = threading.Lock()
+        self._acessos: Dict[str, float] = {}
+        self._contadores: Dict[str, int] = {}
+        self._num_pendentes = 0
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        self._conexao().executescript(_ESQUEMA)
+        atexit.register(self.descarregar)
+
+    def _conexao(self) -> sqlite3.Connection:
+        # Uma conexão por thread: sqlite3 não compartilha conexões entre threads
+        conexao = getattr(self._local, "conexao", None)
+        if conexao is None:
+            conexao = sqlite3.connect(self.caminho, timeout=30, isolation_level=None)
+            conexao.execute("PRAGMA journal_mode=WAL")
+            conexao.execute("PRAGMA synchronous=NORMAL")
+            self._local.conexao = conexao
+        return conexao
+
+    def obter(self, chave: str, contar: bool = True) -> Optional[EntradaCache]:
+        """
+        Lê uma entrada, marcando o acesso para o LRU. Retorna None se ausente.
+
+        Só um SELECT: o acesso e o hit são acumulados em memória.
+        """
+        linha = self._conexao().execute(
+            "SELECT valor, meta, criado FROM entradas WHERE chave = ?", (chave,)
+        ).fetchone()
+        if linha is None:
+            return None
+
+        agora = time.time()
+        entrada = EntradaCache(
+            valor=linha[0],
+            meta=json.loads(linha[1]),
+            criado=linha[2],
+            fresca=(agora - linha[2]) < self.ttl_segundos,
+        )
+        with self._pendentes_lock:
+            self._acessos[chave] = agora
+            if contar and entrada.fresca:
+                self._contadores["hits"] = self._contadores.get("hits", 0) + 1
+            self._num_pendentes += 1
+            cheio = self._num_pendentes >= _MAX_PENDENTES
+        if cheio:
+            self.descarregar()
+        return entrada
+
+    def gravar(self, chave: str, valor: bytes, meta: Optional[Dict[str, Any]] = None):
+        """
+        Grava (ou substitui) uma entrada e aplica o limite de tamanho.
+
+        O despejo nunca remove a entrada recém-gravada; um valor maior que o
+        limite do cache inteiro não é gravado.
+        """
+        if len(valor) > self.tamanho_maximo_bytes:
+            return
+        agora = time.time()
+        with self._transacao() as c:
+            self._aplicar_pendentes(c)
+            c.execute(
+                "INSERT OR REPLACE INTO entradas (chave, valor, meta, criado, acessado, tamanho) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (chave, valor, json.dumps(meta or {}), agora, agora, len(valor)),
+            )
+            self._despejar(c, preservar=chave)
+
+    def renovar(self, chave: str, meta: Optional[Dict[str, Any]] = None):
+        """Reinicia o TTL de uma entrada ainda válida (ex: após HTTP 304)"""
+        agora = time.time()
+        with self._transacao() as c:
+            self._aplicar_pendentes(c)
+            if meta is None:
+                c.execute(
+                    "UPDATE entradas SET criado = ?, acessado = ? WHERE chave = ?",
+                    (agora, agora, chave),
+                )
+            else:
+                c.execute(
+                    "UPDATE entradas SET criado = ?, acessado = ?, meta = ? WHERE chave = ?",
+                    (agora, agora, json.dumps(meta), chave),
+                )
+
+    def registrar(self, contador: str, quantidade: int = 1):
+        """Incrementa um contador persistido (gravado junto com a próxima escrita)"""
+        with self._pendentes_lock:
+            self._contadores[contador] = self._contadores.get(contador, 0) + quantidade
+            self._num_pendentes += 1
+            cheio = self._num_pendentes >= _MAX_PENDENTES
+        if cheio:
+            self.descarregar()
+
+    def descarregar(self):
+        """Grava no banco os acessos e contadores acumulados em memória"""
+        with self._pendentes_lock:
+            if not self._num_pendentes:
+                return
+        with self._transacao() as c:
+            self._aplicar_pendentes(c)
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """Retorna contadores, número de entradas e ocupação do cache"""
+        self.descarregar()
+        conexao = self._conexao()
+        contadores = dict(conexao.execute("SELECT nome, valor FROM contadores").fetchall())
+        entradas, tamanho = conexao.execute(
+            "SELECT COUNT(*), COALESCE(SUM(tamanho), 0) FROM entradas"
+        ).fetchone()
+        return {
+            "contadores": contadores,
+            "entradas": entradas,
+            "tamanho_bytes": tamanho,
+            "tamanho_maximo_bytes": self.tamanho_maximo_bytes,
+        }
+
+    def limpar(self):
+        """Remove todas as entradas e zera os contadores"""
+        with self._pendentes_lock:
+            self._acessos, self._contadores, self._num_pendentes = {}, {}, 0
+        with self._transacao() as c:
+            c.execute("DELETE FROM entradas")
+            c.execute("DELETE FROM contadores")
+
+    def _transacao(self):
+        return _Transacao(self._conexao())
+
+    def _aplicar_pendentes(self, conexao: sqlite3.Connection):
+        with self._pendentes_lock:
+            acessos, self._acessos = self._acessos, {}
+            contadores, self._contadores = self._contadores, {}
+            self._num_pendentes = 0
+        if acessos:
+            conexao.executemany(
+                "UPDATE entradas SET acessado = MAX(acessado, ?) WHERE chave = ?",
+                [(quando, chave) for chave, quando in acessos.items()],
+            )
+        for nome, quantidade in contadores.items():
+            self._incrementar(conexao, nome, quantidade)
+
+    @staticmethod
+    def _incrementar(conexao: sqlite3.Connection, contador: str, quantidade: int = 1):
+        conexao.execute(
+            "INSERT INTO contadores (nome, valor) VALUES (?, ?) "
+            "ON CONFLICT(nome) DO UPDATE SET valor = valor + excluded.valor",
+            (contador, quantidade),
+        )
+
+    def _despejar(self, conexao: sqlite3.Connection, preservar: str):
+        total = conexao.execute("SELECT COALESCE(SUM(tamanho), 0) FROM entradas").fetchone()[0]
+        excesso = total - self.tamanho_maximo_bytes
+        if excesso <= 0:
+            return
+
+        # Remover as entradas menos recentemente acessadas até caber no limite
+        removidas = []
+        for chave, tamanho in conexao.execute(
+            "SELECT chave, tamanho FROM entradas WHERE chave != ? ORDER BY acessado ASC", (preservar,)
+        ):
+            removidas.append((chave,))
+            excesso -= tamanho
+            if excesso <= 0:
+                break
+        conexao.executemany("DELETE FROM entradas WHERE chave = ?", removidas)
+        self._incrementar(conexao, "despejos", len(removidas))
+
+
+class _Transacao:
+    """Transação de escrita (BEGIN IMMEDIATE) segura entre processos"""
+
+    def __init__(self, conexao: sqlite3.Connection):
+        self.conexao = conexao
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conexao.execute("BEGIN IMMEDIATE")
+        return self.conexao
+
+    def __exit__(self, tipo, valor, traceback):
+        if tipo is None:
+            self.conexao.execute("COMMIT")
+        else:
+            self.conexao.execute("ROLLBACK")
+        return False
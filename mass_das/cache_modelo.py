@@ -0,0 +1,193 @@
+"""
+Cache em disco das respostas do modelo.
+
+Opcional, na frente de todas as chamadas ao LLM dos agentes (callbacks de
+modelo registrados por `callbacks_rastreamento`). A chave é o SHA-256 do
+modelo da política do agente (não o escolhido pelo roteador na chamada, que
+varia com a latência e o orçamento), da configuração da requisição (instrução
+de sistema, esquema das ferramentas, parâmetros de geração) e dos conteúdos
+enviados, sem os trechos voláteis das respostas de ferramentas. As respostas
+ficam no cache SQLite compartilhado entre processos (ver mass_das.cache),
+com limite de tamanho e despejo LRU; o SQLite é acessado numa thread de
+trabalho, fora do event loop.
+
+Modos (MASS_DAS_CACHE_MODELO):
+- "off":    desligado (padrão)
+- "on":     responde do cache quando possível e grava as respostas novas
+- "replay": só responde do cache; uma requisição ausente interrompe a execução
+
+Estatísticas / limpeza:
+    python -m mass_das.cache_modelo [limpar]
+"""
+import os
+import re
+import sys
+import json
+import asyncio
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from .cache import CacheDisco, DIRETORIO_CACHE_PADRAO
+
+
+logger = logging.getLogger(__name__)
+
+MODO_CACHE_MODELO = os.getenv("MASS_DAS_CACHE_MODELO", "off").lower()
+CACHE_MODELO_ARQUIVO = Path(os.getenv(
+    "MASS_DAS_CACHE_MODELO_ARQUIVO", str(DIRETORIO_CACHE_PADRAO / "respostas_modelo.sqlite3")
+))
+CACHE_MODELO_MAX_BYTES = int(float(os.getenv("MASS_DAS_CACHE_MODELO_MAX_MB", "200")) * 1024 * 1024)
+# Validade das respostas em segundos (0 = não expiram)
+CACHE_MODELO_TTL_SEGUNDOS = float(os.getenv("MASS_DAS_CACHE_MODELO_TTL", "0"))
+
+MODOS_CACHE_MODELO = ("off", "on", "replay")
+
+# Campos da configuração que não mudam a resposta do modelo
+_CONFIG_IGNORADA = {"http_options", "labels"}
+
+# Campos das respostas de ferramentas que variam entre execuções com as mesmas
+# entradas (ex: se o crawl dos samples parou pelo orçamento de latência)
+_RESPOSTA_CAMPOS_VOLATEIS = {"busca_completa"}
+# Trechos de texto voláteis: o resumo do plano de regeneração de
+# gerar_codigo_agentes (saida.descrever_plano) depende do que já estava em disco
+_RESPOSTA_TEXTOS_VOLATEIS = [
+    (re.compile(r"\d+ arquivo\(s\) gerado\(s\); \d+ inalterado\(s\)(?:; preservados por edição manual: [^)]*)?"),
+     "<plano de regeneração>"),
+]
+
+
+class RespostaAusenteNoCache(RuntimeError):
+    """Requisição sem resposta gravada no modo replay"""
+
+
+def _sem_volateis(valor: Any) -> Any:
+    """Resposta de ferramenta sem os campos e trechos que mudam a cada execução"""
+    if isinstance(valor, dict):
+        return {chave: _sem_volateis(item) for chave, item in valor.items() if chave not in _RESPOSTA_CAMPOS_VOLATEIS}
+    if isinstance(valor, list):
+        return [_sem_volateis(item) for item in valor]
+    if isinstance(valor, str):
+        for padrao, substituto in _RESPOSTA_TEXTOS_VOLATEIS:
+            valor = padrao.sub(substituto, valor)
+    return valor
+
+
+def _normalizar(conteudos: Any) -> Any:
+    """
+    Remove os ids das chamadas/respostas de função (gerados a cada execução)
+    e os trechos voláteis das respostas de ferramentas
+    """
+    for conteudo in conteudos:
+        for parte in conteudo.get("parts", []):
+            for campo in ("function_call", "function_response"):
+                if campo in parte:
+                    parte[campo].pop("id", None)
+            if "response" in parte.get("function_response", {}):
+                parte["function_response"]["response"] = _sem_volateis(parte["function_response"]["response"])
+    return conteudos
+
+
+def chave_requisicao(llm_request: LlmRequest, modelo: Optional[str] = None) -> str:
+    """
+    SHA-256 do modelo, da configuração (instrução, ferramentas) e dos conteúdos.
+
+    `modelo` substitui o da requisição (o cache usa o modelo da política do agente).
+    """
+    config = llm_request.config.model_dump(mode="json", exclude_none=True) if llm_request.config else {}
+    canonica = {
+        "modelo": modelo or llm_request.model or "",
+        "config": {campo: valor for campo, valor in config.items() if campo not in _CONFIG_IGNORADA},
+        "conteudos": _normalizar([
+            conteudo.model_dump(mode="json", exclude_none=True) for conteudo in llm_request.contents or []
+        ]),
+    }
+    serializada = json.dumps(canonica, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(serializada.encode("utf-8")).hexdigest()
+
+
+class CacheModelo:
+    """Consulta e grava respostas do modelo a partir dos callbacks do ADK"""
+
+    def __init__(self, disco: CacheDisco, modo: str = MODO_CACHE_MODELO):
+        if modo not in MODOS_CACHE_MODELO:
+            raise ValueError(f"MASS_DAS_CACHE_MODELO inválido: {modo} (opções: {', '.join(MODOS_CACHE_MODELO)})")
+        self.disco = disco
+        self.modo = modo
+        # Chave da requisição em curso por (invocação, agente), gravada no after_model
+        self._pendentes: Dict[Tuple[str, str], str] = {}
+        self._lock = threading.Lock()
+
+    async def consultar(self, callback_context: CallbackContext, llm_request: LlmRequest,
+                        modelo: Optional[str] = None) -> Optional[LlmResponse]:
+        """
+        Resposta gravada para a requisição, ou None (em replay, ausência é erro).
+
+        `modelo` é o da política do agente; sem ele vale o da requisição.
+        """
+        if self.modo == "off":
+            return None
+        chave = chave_requisicao(llm_request, modelo)
+        entrada = await asyncio.to_thread(self.disco.obter, chave)
+        if entrada is not None and entrada.fresca:
+            logger.debug("Cache do modelo: acerto para %s (%s)", callback_context.agent_name, chave[:12])
+            return LlmResponse.model_validate_json(entrada.valor)
+
+        await asyncio.to_thread(self.disco.registrar, "misses")
+        if self.modo == "replay":
+            raise RespostaAusenteNoCache(
+                f"Resposta do modelo ausente no cache (replay): agente {callback_context.agent_name}, "
+                f"chave {chave[:12]}"
+            )
+        with self._lock:
+            self._pendentes[(callback_context.invocation_id, callback_context.agent_name)] = chave
+        return None
+
+    async def gravar(self, callback_context: CallbackContext, llm_response: LlmResponse) -> None:
+        """Grava a resposta completa (sem erro) da requisição pendente do agente"""
+        if self.modo != "on" or llm_response.partial:
+            return
+        with self._lock:
+            chave = self._pendentes.pop((callback_context.invocation_id, callback_context.agent_name), None)
+        if chave is None or llm_response.error_code:
+            return
+        await asyncio.to_thread(
+            self.disco.gravar, chave, llm_response.model_dump_json(exclude_none=True).encode("utf-8"),
+            {"agente": callback_context.agent_name},
+        )
+
+    def estatisticas(self) -> Dict[str, Any]:
+        return {"modo": self.modo, **self.disco.estatisticas()}
+
+
+_cache_modelo: Optional[CacheModelo] = None
+
+
+def obter_cache_modelo() -> CacheModelo:
+    """Retorna o cache de respostas do modelo compartilhado do processo"""
+    global _cache_modelo
+    if _cache_modelo is None:
+        _cache_modelo = CacheModelo(CacheDisco(
+            CACHE_MODELO_ARQUIVO,
+            ttl_segundos=CACHE_MODELO_TTL_SEGUNDOS or float("inf"),
+            tamanho_maximo_bytes=CACHE_MODELO_MAX_BYTES,
+        ))
+    return _cache_modelo
+
+
+if __name__ == "__main__":
+    from .logs import configurar_logging
+
+    configurar_logging()
+    cache_modelo = obter_cache_modelo()
+    if len(sys.argv) > 1 and sys.argv[1] == "limpar":
+        cache_modelo.disco.limpar()
+        print(f"🧹 Cache do modelo limpo: {CACHE_MODELO_ARQUIVO}")
+    resumo = cache_modelo.estatisticas()
+    print(f"📦 {CACHE_MODELO_ARQUIVO} (modo {resumo['modo']}): {resumo['entradas']} respostas, "
+          f"{resumo['tamanho_bytes'] / 1024:.1f} KB de {resumo['tamanho_maximo_bytes'] / 1024 / 1024:.0f} MB")
+    for contador, valor in sorted(resumo["contadores"].items()):
+        print(f"  {contador}: {valor}")
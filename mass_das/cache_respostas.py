@@ -0,0 +1,189 @@
+"""
+Cache de respostas da consulta à documentação do ADK.
+
+Perguntas equivalentes ("Which agent for routing?" / "which  agents routing")
+são normalizadas para a mesma chave, combinada com a versão da documentação.
+A ordem e a repetição dos termos são mantidas ("agent to tool" e "tool to
+agent" são perguntas diferentes); perguntas sem nenhum termo relevante não
+são cacheadas.
+As respostas ficam em um LRU em memória (acerto em microssegundos) apoiado
+pelo cache em disco compartilhado entre processos (SQLite/WAL, com TTL e
+limite de tamanho).
+
+Pré-aquecimento:
+    python -m mass_das.cache_respostas [arquivo_de_perguntas.txt]
+"""
+import os
+import sys
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Any
+from .cache import CacheDisco, DIRETORIO_CACHE_PADRAO
+from .ranking import tokenizar
+
+
+CACHE_RESPOSTAS_HABILITADO = os.getenv("MASS_DAS_CACHE_RESPOSTAS", "true").lower() == "true"
+CACHE_RESPOSTAS_TTL_SEGUNDOS = float(os.getenv("MASS_DAS_CACHE_RESPOSTAS_TTL", "86400"))
+CACHE_RESPOSTAS_MAX_BYTES = int(float(os.getenv("MASS_DAS_CACHE_RESPOSTAS_MAX_MB", "20")) * 1024 * 1024)
+
+# Entradas mantidas no LRU em memória de cada processo
+CAPACIDADE_MEMORIA = 512
+
+# Palavras que não mudam o sentido da pergunta (PT/EN), inclusive interrogativas;
+# já no formato de tokenizar ("quais" -> "quai", "does" -> "doe")
+STOPWORDS_PERGUNTA = frozenset({
+    "a", "o", "e", "de", "da", "do", "das", "dos", "em", "no", "na", "nos", "nas",
+    "um", "uma", "para", "por", "com", "que", "se", "ao", "os", "as", "eu", "meu",
+    "qual", "quai", "como", "quando", "onde", "devo", "posso", "usar", "utilizar",
+    "the", "of", "and", "to", "in", "for", "on", "with", "an", "is", "are", "it",
+    "which", "what", "how", "when", "where", "should", "can", "do", "doe", "i", "my", "use",
+})
+
+# Perguntas frequentes usadas no pré-aquecimento padrão
+PERGUNTAS_AQUECIMENTO = [
+    "Qual agente usar para roteamento?",
+    "Como criar um agente com Agent?",
+    "Como definir ferramentas (tools) no ADK?",
+    "Quando usar SequentialAgent, ParallelAgent ou Coordinator em um workflow?",
+    "Which agent for routing?",
+    "How to define a tool with ToolContext?",
+    "Workflow agents: sequential vs parallel",
+]
+
+
+def normalizar_pergunta(pergunta: str) -> str:
+    """Forma canônica da pergunta: termos em minúsculas, na ordem, sem pontuação nem stopwords"""
+    return " ".join(termo for termo in tokenizar(pergunta) if termo not in STOPWORDS_PERGUNTA)
+
+
+def chave_resposta(pergunta: str, versao_docs: str) -> Optional[str]:
+    """Chave da pergunta na versão da documentação; None se só houver stopwords"""
+    normalizada = normalizar_pergunta(pergunta)
+    if not normalizada:
+        return None
+    return hashlib.sha256(f"{versao_docs}\x00{normalizada}".encode()).hexdigest()
+
+
+class CacheRespostas:
+    """LRU em memória na frente do cache em disco compartilhado"""
+
+    def __init__(
+        self,
+        disco: Optional[CacheDisco],
+        capacidade_memoria: int = CAPACIDADE_MEMORIA,
+        ttl_segundos: float = CACHE_RESPOSTAS_TTL_SEGUNDOS,
+    ):
+        self.disco = disco
+        self.capacidade_memoria = capacidade_memoria
+        self.ttl_segundos = ttl_segundos
+        # chave -> (resposta, expira_em)
+        self._memoria: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._metricas = {"hits_memoria": 0, "hits_disco": 0, "misses": 0}
+
+    def obter(self, pergunta: str, versao_docs: str) -> Optional[str]:
+        """Resposta em cache para a pergunta (normalizada) ou None"""
+        chave = chave_resposta(pergunta, versao_docs)
+        if chave is None:
+            return None
+        agora = time.monotonic()
+        with self._lock:
+            item = self._memoria.get(chave)
+            if item is not None:
+                if item[1] > agora:
+                    self._memoria.move_to_end(chave)
+                    self._metricas["hits_memoria"] += 1
+                    return item[0]
+                del self._memoria[chave]
+
+        if self.disco is not None:
+            entrada = self.disco.obter(chave)
+            if entrada is not None and entrada.fresca:
+                resposta = entrada.valor.decode("utf-8")
+                restante = self.ttl_segundos - (time.time() - entrada.criado)
+                self._lembrar(chave, resposta, agora + restante)
+                self._metricas["hits_disco"] += 1
+                return resposta
+
+        self._metricas["misses"] += 1
+        if self.disco is not None:
+            self.disco.registrar("misses")
+        return None
+
+    def gravar(self, pergunta: str, versao_docs: str, resposta: str):
+        chave = chave_resposta(pergunta, versao_docs)
+        if chave is None:
+            return
+        self._lembrar(chave, resposta, time.monotonic() + self.ttl_segundos)
+        if self.disco is not None:
+            self.disco.gravar(chave, resposta.encode("utf-8"), {
+                "pergunta": normalizar_pergunta(pergunta),
+                "versao_docs": versao_docs,
+            })
+
+    def _lembrar(self, chave: str, resposta: str, expira_em: float):
+        with self._lock:
+            self._memoria[chave] = (resposta, expira_em)
+            self._memoria.move_to_end(chave)
+            while len(self._memoria) > self.capacidade_memoria:
+                self._memoria.popitem(last=False)
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """Taxa de acerto do processo e contadores persistidos do cache em disco"""
+        consultas = sum(self._metricas.values())
+        acertos = self._metricas["hits_memoria"] + self._metricas["hits_disco"]
+        estatisticas = {
+            **self._metricas,
+            "taxa_acerto": round(acertos / consultas, 4) if consultas else 0.0,
+            "entradas_memoria": len(self._memoria),
+        }
+        if self.disco is not None:
+            estatisticas["disco"] = self.disco.estatisticas()
+        return estatisticas
+
+
+_cache_respostas: Optional[CacheRespostas] = None
+
+
+def obter_cache_respostas() -> CacheRespostas:
+    """Retorna o cache de respostas compartilhado do processo"""
+    global _cache_respostas
+    if _cache_respostas is None:
+        disco = None
+        if CACHE_RESPOSTAS_HABILITADO:
+            disco = CacheDisco(
+                DIRETORIO_CACHE_PADRAO / "respostas_documentacao.sqlite3",
+                ttl_segundos=CACHE_RESPOSTAS_TTL_SEGUNDOS,
+                tamanho_maximo_bytes=CACHE_RESPOSTAS_MAX_BYTES,
+            )
+        _cache_respostas = CacheRespostas(disco)
+    return _cache_respostas
+
+
+def aquecer(perguntas: Iterable[str]) -> Dict[str, Any]:
+    """Responde e grava no cache as perguntas informadas"""
+    # Import tardio: tools importa este módulo na consulta à documentação
+    from .tools import _responder_documentacao, versao_documentacao
+
+    cache = obter_cache_respostas()
+    versao = versao_documentacao()
+    novas = 0
+    for pergunta in perguntas:
+        if cache.obter(pergunta, versao) is None:
+            cache.gravar(pergunta, versao, _responder_documentacao(pergunta))
+            novas += 1
+    return {"novas": novas, **cache.estatisticas()}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        linhas = Path(sys.argv[1]).read_text(encoding="utf-8").splitlines()
+        perguntas_aquecimento = [linha.strip() for linha in linhas if linha.strip()]
+    else:
+        perguntas_aquecimento = PERGUNTAS_AQUECIMENTO
+    resumo = aquecer(perguntas_aquecimento)
+    print(f"✅ Cache aquecido: {resumo['novas']} novas respostas "
+          f"({resumo['disco']['entradas'] if 'disco' in resumo else 0} entradas em disco)")
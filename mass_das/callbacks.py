@@ -0,0 +1,125 @@
+"""
+Callbacks de agente e de modelo do MASS-DAS.
+
+Registrados em todos os agentes do sistema via `callbacks_rastreamento()`,
+abrem e fecham os spans de cada invocação de agente e de cada chamada ao
+modelo (ver mass_das.tracing), escolhem o modelo de cada chamada (ver
+mass_das.roteador) e, com MASS_DAS_CACHE_MODELO ligado, consultam e gravam o
+cache de respostas do modelo (ver mass_das.cache_modelo).
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from .tracing import Span, iniciar_span, finalizar_span, _sessao_de
+from .cache_modelo import MODO_CACHE_MODELO, obter_cache_modelo
+from .roteador import obter_roteador
+
+
+# Spans abertos por (invocação, agente, tipo): o "depois" pode rodar em outro contexto
+_abertos: Dict[Tuple[str, str, str], Span] = {}
+
+
+def _chave(callback_context: CallbackContext, tipo: str) -> Tuple[str, str, str]:
+    return (callback_context.invocation_id, callback_context.agent_name, tipo)
+
+
+def antes_do_agente(callback_context: CallbackContext) -> None:
+    _abertos[_chave(callback_context, "agente")] = iniciar_span(
+        callback_context.agent_name, "agente", sessao=_sessao_de(callback_context),
+    )
+    return None
+
+
+def depois_do_agente(callback_context: CallbackContext) -> None:
+    span = _abertos.pop(_chave(callback_context, "agente"), None)
+    if span is not None:
+        finalizar_span(span)
+    return None
+
+
+def antes_do_modelo(callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+    _abertos[_chave(callback_context, "modelo")] = iniciar_span(
+        f"{callback_context.agent_name}.modelo", "modelo",
+        sessao=_sessao_de(callback_context),
+        modelo=llm_request.model or "",
+        conteudos=len(llm_request.contents or []),
+    )
+    return None
+
+
+def depois_do_modelo(callback_context: CallbackContext, llm_response: LlmResponse) -> Optional[LlmResponse]:
+    span = _abertos.pop(_chave(callback_context, "modelo"), None)
+    if span is None:
+        return None
+    atributos: Dict[str, Any] = {}
+    uso = llm_response.usage_metadata
+    if uso is not None:
+        atributos["tokens_entrada"] = uso.prompt_token_count or 0
+        atributos["tokens_saida"] = uso.candidates_token_count or 0
+    status = f"erro: {llm_response.error_code}" if llm_response.error_code else "ok"
+    finalizar_span(span, status=status, **atributos)
+    return None
+
+
+async def consultar_cache_modelo(callback_context: CallbackContext,
+                                 llm_request: LlmRequest) -> Optional[LlmResponse]:
+    """
+    Responde do cache quando possível. Num acerto o ADK não chama o modelo nem
+    os after_model_callback, então o span da chamada é fechado aqui.
+
+    A chave usa o modelo da política do agente: uma resposta gravada continua
+    válida quando o roteador rebaixa o nível da chamada.
+    """
+    roteador = obter_roteador()
+    resposta = await obter_cache_modelo().consultar(
+        callback_context, llm_request, roteador.modelo_do_agente(callback_context.agent_name),
+    )
+    if resposta is not None:
+        roteador.descartar(callback_context)
+        span = _abertos.pop(_chave(callback_context, "modelo"), None)
+        if span is not None:
+            finalizar_span(span, cache="acerto")
+    return resposta
+
+
+async def gravar_cache_modelo(callback_context: CallbackContext,
+                              llm_response: LlmResponse) -> Optional[LlmResponse]:
+    await obter_cache_modelo().gravar(callback_context, llm_response)
+    return None
+
+
+async def rotear_modelo(callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+    roteador = obter_roteador()
+    await roteador.semear()
+    roteador.antes_do_modelo(callback_context, llm_request)
+    return None
+
+
+def medir_roteamento(callback_context: CallbackContext, llm_response: LlmResponse) -> Optional[LlmResponse]:
+    obter_roteador().depois_do_modelo(callback_context, llm_response)
+    return None
+
+
+def callbacks_rastreamento(**adicionais: List[Callable]) -> Dict[str, Any]:
+    """
+    Argumentos de callback para o construtor de um Agent/LlmAgent.
+
+    `adicionais` (ex: before_model_callback=[f]) entram depois do callback de
+    rastreamento do mesmo tipo, na ordem dada; o ADK para no primeiro que
+    devolver um valor diferente de None. O roteador escolhe o modelo antes de
+    tudo (o span registra o modelo roteado) e a consulta ao cache do modelo vem
+    por último, para que a chave reflita a requisição já ajustada.
+    """
+    callbacks: Dict[str, List[Callable]] = {
+        "before_agent_callback": [antes_do_agente],
+        "after_agent_callback": [depois_do_agente],
+        "before_model_callback": [rotear_modelo, antes_do_modelo],
+        "after_model_callback": [depois_do_modelo, medir_roteamento],
+    }
+    for tipo, extras in adicionais.items():
+        callbacks[tipo].extend(extras)
+    if MODO_CACHE_MODELO != "off":
+        obter_cache_modelo()  # valida o modo já na criação dos agentes
+        callbacks["before_model_callback"].append(consultar_cache_modelo)
+        callbacks["after_model_callback"].append(gravar_cache_modelo)
+    return {tipo: lista[0] if len(lista) == 1 else lista for tipo, lista in callbacks.items()}
@@ -0,0 +1,277 @@
+"""
+Corpus offline da documentação do ADK (adk-docs).
+
+A ingestão lê uma cópia local do adk-docs, seja o código-fonte em Markdown
+(`docs/`) ou o site gerado em HTML. Cada página é quebrada em passagens por
+seção e o resultado é gravado em um arquivo de corpus com o hash de cada
+página. Na atualização, apenas as páginas novas ou alteradas são lidas e
+quebradas novamente. A consulta usa um índice BM25 sobre as passagens e
+devolve as top-k passagens mais relevantes, com título e URL de origem.
+
+Uso:
+    python -m mass_das.documentacao <copia_local_adk_docs> [corpus.json]
+"""
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from bs4 import BeautifulSoup
+from .cache import DIRETORIO_CACHE_PADRAO
+from .ranking import IndiceBM25, tokenizar
+
+
+VERSAO_CORPUS = 1
+
+# Arquivo de corpus usado pela ferramenta (configurável via ambiente)
+CAMINHO_CORPUS = Path(os.getenv("ADK_DOCS_CORPUS", str(DIRETORIO_CACHE_PADRAO / "adk_docs_corpus.json")))
+URL_BASE_DOCS = os.getenv("ADK_DOCS_URL", "https://google.github.io/adk-docs/")
+TOP_K_PASSAGENS = int(os.getenv("ADK_DOCS_TOP_K", "3"))
+
+# Tamanho alvo (em caracteres) de cada passagem
+TAMANHO_PASSAGEM = 1200
+
+PESOS_CAMPOS_DOCS = {"titulo": 2.0, "texto": 1.0}
+
+EXTENSOES_PAGINAS = (".md", ".html")
+
+_PADRAO_TITULO_MD = re.compile(r"^(#{1,4})\s+(.+?)\s*#*\s*$")
+_BLOCOS_HTML = ["h1", "h2", "h3", "h4", "p", "li", "pre", "td"]
+
+
+def _secoes_markdown(texto: str) -> Tuple[str, List[Tuple[str, List[str]]]]:
+    """Título da página e lista de (título da seção, parágrafos)"""
+    titulo_pagina = ""
+    secoes: List[Tuple[str, List[str]]] = [("", [])]
+    paragrafo: List[str] = []
+    em_codigo = False
+
+    def fechar_paragrafo():
+        if paragrafo:
+            secoes[-1][1].append("\n".join(paragrafo).strip())
+            paragrafo.clear()
+
+    for linha in texto.splitlines():
+        if linha.lstrip().startswith(("```", "~~~")):
+            em_codigo = not em_codigo
+            paragrafo.append(linha)
+            continue
+        titulo = None if em_codigo else _PADRAO_TITULO_MD.match(linha)
+        if titulo:
+            fechar_paragrafo()
+            if len(titulo.group(1)) == 1 and not titulo_pagina:
+                titulo_pagina = titulo.group(2)
+            secoes.append((titulo.group(2), []))
+        elif not linha.strip() and not em_codigo:
+            fechar_paragrafo()
+        else:
+            paragrafo.append(linha)
+    fechar_paragrafo()
+    return titulo_pagina, secoes
+
+
+def _secoes_html(texto: str) -> Tuple[str, List[Tuple[str, List[str]]]]:
+    """Título da página e lista de (título da seção, parágrafos) de uma página HTML"""
+    soup = BeautifulSoup(texto, "html.parser")
+    for elemento in soup(["script", "style", "nav", "header", "footer", "aside"]):
+        elemento.decompose()
+    raiz = soup.find("article") or soup.find("main") or soup.body or soup
+
+    titulo_pagina = ""
+    secoes: List[Tuple[str, List[str]]] = [("", [])]
+    for bloco in raiz.find_all(_BLOCOS_HTML):
+        # Blocos aninhados (ex: <p> dentro de <li>) já entram no texto do bloco externo
+        if bloco.find_parent(_BLOCOS_HTML[4:]):
+            continue
+        conteudo = bloco.get_text("\n" if bloco.name == "pre" else " ", strip=bloco.name != "pre")
+        conteudo = conteudo.replace("¶", "").strip()
+        if not conteudo:
+            continue
+        if bloco.name in ("h1", "h2", "h3", "h4"):
+            if bloco.name == "h1" and not titulo_pagina:
+                titulo_pagina = conteudo
+            secoes.append((conteudo, []))
+        else:
+            secoes[-1][1].append(conteudo)
+
+    if not titulo_pagina and soup.title:
+        titulo_pagina = soup.title.get_text(strip=True)
+    return titulo_pagina, secoes
+
+
+def quebrar_pagina(caminho_relativo: str, texto: str) -> Dict:
+    """
+    Quebra uma página em passagens de até ~TAMANHO_PASSAGEM caracteres por seção.
+
+    Returns:
+        dict: Título da página e lista de passagens {"titulo", "texto"}
+    """
+    if caminho_relativo.endswith(".html"):
+        titulo_pagina, secoes = _secoes_html(texto)
+    else:
+        titulo_pagina, secoes = _secoes_markdown(texto)
+    titulo_pagina = titulo_pagina or Path(caminho_relativo).stem.replace("-", " ").title()
+
+    passagens = []
+    for titulo_secao, paragrafos in secoes:
+        titulo = titulo_pagina if not titulo_secao or titulo_secao == titulo_pagina else f"{titulo_pagina} › {titulo_secao}"
+        atual = ""
+        for paragrafo in paragrafos:
+            # Parágrafos maiores que uma passagem são divididos em pedaços fixos
+            for inicio in range(0, len(paragrafo), TAMANHO_PASSAGEM):
+                pedaco = paragrafo[inicio:inicio + TAMANHO_PASSAGEM]
+                if atual and len(atual) + len(pedaco) > TAMANHO_PASSAGEM:
+                    passagens.append({"titulo": titulo, "texto": atual})
+                    atual = ""
+                atual = f"{atual}\n\n{pedaco}" if atual else pedaco
+        if atual:
+            passagens.append({"titulo": titulo, "texto": atual})
+    return {"titulo": titulo_pagina, "passagens": passagens}
+
+
+def url_da_pagina(caminho_relativo: str) -> str:
+    """URL publicada de uma página do adk-docs a partir do caminho do arquivo"""
+    caminho = re.sub(r"(^|/)index\.(md|html)$", r"\1", caminho_relativo)
+    caminho = re.sub(r"\.(md|html)$", "/", caminho)
+    return URL_BASE_DOCS.rstrip("/") + "/" + caminho
+
+
+def _listar_paginas(origem: Path) -> Dict[str, Path]:
+    # No repositório fonte as páginas ficam em docs/; no site gerado, na raiz
+    raiz = origem / "docs" if (origem / "docs").is_dir() else origem
+    return {
+        caminho.relative_to(raiz).as_posix(): caminho
+        for caminho in sorted(raiz.rglob("*"))
+        if caminho.suffix in EXTENSOES_PAGINAS and caminho.is_file()
+    }
+
+
+def _hash_corpus(paginas: Dict[str, Dict]) -> str:
+    resumo = hashlib.sha256()
+    for nome in sorted(paginas):
+        resumo.update(f"{nome}\x00{paginas[nome]['hash']}\n".encode())
+    return resumo.hexdigest()[:16]
+
+
+def ingerir_documentacao(origem: Path, destino: Path = CAMINHO_CORPUS) -> Dict:
+    """
+    Cria ou atualiza o corpus a partir de uma cópia local do adk-docs.
+
+    Páginas com hash igual ao do corpus existente não são processadas de novo.
+
+    Returns:
+        dict: Contagem de páginas novas, alteradas, removidas e inalteradas
+    """
+    destino = Path(destino)
+    anteriores: Dict[str, Dict] = {}
+    if destino.is_file():
+        dados = json.loads(destino.read_bytes())
+        if dados.get("versao") == VERSAO_CORPUS:
+            anteriores = dados["paginas"]
+
+    paginas = {}
+    resumo = {"novas": 0, "alteradas": 0, "removidas": 0, "inalteradas": 0}
+    for nome, caminho in _listar_paginas(Path(origem)).items():
+        conteudo = caminho.read_bytes()
+        hash_pagina = hashlib.sha256(conteudo).hexdigest()
+        anterior = anteriores.get(nome)
+        if anterior is not None and anterior["hash"] == hash_pagina:
+            paginas[nome] = anterior
+            resumo["inalteradas"] += 1
+            continue
+        resumo["alteradas" if anterior is not None else "novas"] += 1
+        paginas[nome] = {"hash": hash_pagina, **quebrar_pagina(nome, conteudo.decode("utf-8", errors="replace"))}
+    resumo["removidas"] = len(set(anteriores) - set(paginas))
+
+    corpus = {
+        "versao": VERSAO_CORPUS,
+        "origem": str(origem),
+        "gerado_em": time.time(),
+        "hash_corpus": _hash_corpus(paginas),
+        "paginas": paginas,
+    }
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    temporario = destino.with_suffix(destino.suffix + ".tmp")
+    temporario.write_text(json.dumps(corpus, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(temporario, destino)
+
+    resumo["passagens"] = sum(len(p["passagens"]) for p in paginas.values())
+    resumo["hash_corpus"] = corpus["hash_corpus"]
+    return resumo
+
+
+class CorpusDocumentacao:
+    """Corpus de passagens carregado sob demanda e recarregado quando o arquivo muda"""
+
+    def __init__(self, caminho: Path):
+        self.caminho = Path(caminho)
+        self._assinatura: Optional[Tuple[float, int]] = None
+        self._indice: Optional[IndiceBM25] = None
+        self._hash_corpus = ""
+
+    def _carregar(self) -> Optional[IndiceBM25]:
+        """Índice do corpus, relido se o arquivo mudou; None se o arquivo não existe mais"""
+        try:
+            estado = self.caminho.stat()
+        except FileNotFoundError:
+            self._indice, self._hash_corpus, self._assinatura = None, "", None
+            return None
+        assinatura = (estado.st_mtime, estado.st_size)
+        if self._indice is None or assinatura != self._assinatura:
+            dados = json.loads(self.caminho.read_bytes())
+            if dados.get("versao") != VERSAO_CORPUS:
+                raise ValueError(f"Versão de corpus não suportada: {dados.get('versao')}")
+            indice = IndiceBM25(PESOS_CAMPOS_DOCS)
+            for nome, pagina in dados["paginas"].items():
+                url = url_da_pagina(nome)
+                for passagem in pagina["passagens"]:
+                    indice.adicionar({**passagem, "url": url}, passagem)
+            self._indice = indice
+            self._hash_corpus = dados["hash_corpus"]
+            self._assinatura = assinatura
+        return self._indice
+
+    def versao(self) -> Optional[str]:
+        """Hash do conteúdo do corpus (muda a cada atualização com páginas alteradas); None sem corpus"""
+        if self._carregar() is None:
+            return None
+        return self._hash_corpus
+
+    def buscar(self, pergunta: str, top_k: int = TOP_K_PASSAGENS) -> List[Dict]:
+        """Top-k passagens mais relevantes para a pergunta, com `score`"""
+        indice = self._carregar()
+        if indice is None:
+            return []
+        termos = {termo: 1.0 for termo in tokenizar(pergunta)}
+        return [
+            dict(indice.documentos[indice_doc], score=round(score, 4))
+            for indice_doc, score in indice.buscar(termos, top_k)
+            if score > 0
+        ]
+
+
+_corpus: Optional[CorpusDocumentacao] = None
+
+
+def obter_corpus_documentacao() -> Optional[CorpusDocumentacao]:
+    """Retorna o corpus configurado em ADK_DOCS_CORPUS, se já tiver sido ingerido"""
+    global _corpus
+    if _corpus is None and CAMINHO_CORPUS.is_file():
+        _corpus = CorpusDocumentacao(CAMINHO_CORPUS)
+    return _corpus
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    destino_corpus = Path(sys.argv[2]) if len(sys.argv) > 2 else CAMINHO_CORPUS
+    resumo_ingestao = ingerir_documentacao(Path(sys.argv[1]), destino_corpus)
+    print(
+        f"✅ Corpus atualizado: {resumo_ingestao['novas']} novas, {resumo_ingestao['alteradas']} alteradas, "
+        f"{resumo_ingestao['removidas']} removidas, {resumo_ingestao['inalteradas']} inalteradas "
+        f"({resumo_ingestao['passagens']} passagens, versão {resumo_ingestao['hash_corpus']})"
+    )
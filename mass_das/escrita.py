@@ -0,0 +1,121 @@
+"""
+Escrita atômica de arquivos do MASS-DAS.
+
+O conteúdo é escrito em partes num arquivo temporário no mesmo diretório do
+destino e só então renomeado sobre ele (`os.replace`). Leitores nunca veem
+um arquivo pela metade e escritas concorrentes do mesmo caminho não se
+misturam: vence a última a ser renomeada. O `fsync` é opcional.
+"""
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows: apenas o lock entre threads do processo
+    fcntl = None
+
+
+# Forçar fsync do arquivo e do diretório a cada escrita (durabilidade x latência)
+FSYNC_PADRAO = os.getenv("MASS_DAS_FSYNC", "false").lower() == "true"
+
+# Buffer de escrita: muitas partes pequenas viram poucas chamadas de sistema
+_TAMANHO_BUFFER = 256 * 1024
+
+# umask do processo, lida uma única vez (os.umask não é seguro entre threads)
+_MASCARA = os.umask(0)
+os.umask(_MASCARA)
+
+_locks_processo: Dict[str, threading.Lock] = {}
+_lock_registro = threading.Lock()
+
+
+def escrever_atomico(
+    destino: Path,
+    partes: Iterable[Union[str, bytes]],
+    fsync: bool = FSYNC_PADRAO,
+    encoding: Optional[str] = "utf-8",
+    criar_diretorio: bool = True,
+) -> int:
+    """
+    Escreve as partes em um temporário e o renomeia atomicamente para o destino.
+
+    Args:
+        destino: Caminho final do arquivo
+        partes: Trechos de texto (ou bytes, com encoding=None) escritos em sequência
+        fsync: Sincronizar arquivo e diretório com o disco antes de retornar
+        encoding: Codificação dos trechos de texto; None para escrita binária
+        criar_diretorio: Criar o diretório do destino (desligue em lotes que já o criaram)
+
+    Returns:
+        int: Quantidade de caracteres (ou bytes) escritos
+    """
+    destino = Path(destino)
+    if criar_diretorio:
+        destino.parent.mkdir(parents=True, exist_ok=True)
+    descritor, temporario = tempfile.mkstemp(dir=destino.parent, prefix=f".{destino.name}.", suffix=".tmp")
+    total = 0
+    try:
+        modo = "wb" if encoding is None else "w"
+        with os.fdopen(descritor, modo, encoding=encoding, newline="" if encoding else None,
+                       buffering=_TAMANHO_BUFFER) as arquivo:
+            for parte in partes:
+                total += len(parte)
+                arquivo.write(parte)
+            if fsync:
+                arquivo.flush()
+                os.fsync(arquivo.fileno())
+        # mkstemp cria com 0600; manter as permissões usuais de um arquivo novo
+        os.chmod(temporario, 0o666 & ~_MASCARA)
+        os.replace(temporario, destino)
+    except BaseException:
+        try:
+            os.unlink(temporario)
+        except FileNotFoundError:
+            pass
+        raise
+
+    if fsync:
+        _sincronizar_diretorio(destino.parent)
+    return total
+
+
+def _sincronizar_diretorio(diretorio: Path):
+    # Persiste a entrada do diretório criada pelo rename (sem efeito no Windows)
+    try:
+        descritor = os.open(diretorio, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(descritor)
+    except OSError:
+        pass
+    finally:
+        os.close(descritor)
+
+
+@contextmanager
+def bloqueio_arquivo(caminho: Path) -> Iterator[None]:
+    """
+    Lock exclusivo associado a um arquivo, entre threads e entre processos.
+
+    O flock é feito num arquivo auxiliar `<caminho>.lock`, que nunca é
+    renomeado (o arquivo protegido pode ser substituído por escrever_atomico).
+    """
+    caminho = Path(caminho)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    with _lock_registro:
+        lock = _locks_processo.setdefault(str(caminho.absolute()), threading.Lock())
+    with lock:
+        if fcntl is None:
+            yield
+            return
+        with open(caminho.with_name(f"{caminho.name}.lock"), "a") as arquivo_lock:
+            fcntl.flock(arquivo_lock.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(arquivo_lock.fileno(), fcntl.LOCK_UN)
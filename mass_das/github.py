@@ -0,0 +1,268 @@
+"""
+Cliente HTTP assíncrono para a API do GitHub usado pelas ferramentas do MASS-DAS.
+
+Mantém um pool de conexões keep-alive compartilhado (requests.Session) e
+limita o número de requisições simultâneas em voo. As chamadas bloqueantes
+são executadas em threads de trabalho, de modo que o crawl do repositório
+adk-samples roda de forma concorrente sem travar o event loop.
+
+As respostas podem ser guardadas em um cache persistente em disco com
+revalidação condicional (ETag/Last-Modified): respostas 304 do GitHub não
+contam contra o rate limit. As requisições de rede passam por um agendador
+compartilhado que respeita os limites informados pelo GitHub.
+"""
+import os
+import json
+import codecs
+import asyncio
+import weakref
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Any, Union
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from .cache import CacheDisco, EntradaCache, DIRETORIO_CACHE_PADRAO
+from .rate_limit import AgendadorRequisicoes
+
+
+# Endereços do repositório de samples (configuráveis para apontar a um servidor local)
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+GITHUB_RAW_URL = os.getenv("GITHUB_RAW_URL", "https://raw.githubusercontent.com").rstrip("/")
+REPOSITORIO_SAMPLES = os.getenv("ADK_SAMPLES_REPO", "google/adk-samples")
+REF_SAMPLES = os.getenv("ADK_SAMPLES_REF", "main")
+
+# Modo de crawl: "arvore" (Git Trees API, uma chamada) ou "contents" (uma chamada por diretório)
+MODO_CRAWL = os.getenv("GITHUB_MODO_CRAWL", "arvore")
+
+# Orçamento de bytes lidos por README (os samples usam só os primeiros 500 caracteres)
+README_LIMITE_BYTES = int(os.getenv("GITHUB_README_LIMITE_BYTES", "2048"))
+
+# Número máximo de requisições simultâneas ao GitHub (configurável via ambiente)
+MAX_EM_VOO_PADRAO = int(os.getenv("GITHUB_MAX_EM_VOO", "8"))
+
+# Cache HTTP em disco (configurável via ambiente)
+CACHE_HABILITADO = os.getenv("GITHUB_CACHE", "true").lower() == "true"
+CACHE_TTL_SEGUNDOS = float(os.getenv("GITHUB_CACHE_TTL", "3600"))
+CACHE_MAX_BYTES = int(float(os.getenv("GITHUB_CACHE_MAX_MB", "50")) * 1024 * 1024)
+
+
+@dataclass
+class RespostaLida:
+    """
+    Resposta com o corpo já lido: servida do cache ou cortada no orçamento
+    de bytes. Expõe a parte da interface de requests.Response usada pelas
+    ferramentas e pelo agendador.
+    """
+    status_code: int
+    url: str
+    content: bytes
+    headers: CaseInsensitiveDict = field(default_factory=CaseInsensitiveDict)
+    # Corpo cortado no orçamento (pode terminar no meio de um caractere)
+    truncada: bool = False
+
+    @property
+    def text(self) -> str:
+        if self.truncada:
+            return decodificar_utf8_parcial(self.content)
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+# Resposta devolvida por ClienteGitHub.get
+RespostaGitHub = Union[requests.Response, RespostaLida]
+
+
+class ClienteGitHub:
+    """Cliente com pool de conexões compartilhado e fan-out limitado"""
+
+    def __init__(
+        self,
+        max_em_voo: int = MAX_EM_VOO_PADRAO,
+        timeout: float = 10,
+        cache: Optional[CacheDisco] = None,
+        agendador: Optional[AgendadorRequisicoes] = None,
+    ):
+        self.max_em_voo = max(1, max_em_voo)
+        self.timeout = timeout
+        self.cache = cache
+        self.agendador = agendador or AgendadorRequisicoes()
+
+        # Sessão única: reaproveita conexões TCP/TLS entre todas as chamadas
+        self._sessao = requests.Session()
+        adaptador = HTTPAdapter(pool_connections=4, pool_maxsize=self.max_em_voo)
+        self._sessao.mount("https://", adaptador)
+        self._sessao.mount("http://", adaptador)
+
+        # asyncio.Semaphore é ligado ao event loop em que é usado pela primeira vez
+        self._semaforos: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _semaforo(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaforo = self._semaforos.get(loop)
+        if semaforo is None:
+            semaforo = asyncio.Semaphore(self.max_em_voo)
+            self._semaforos[loop] = semaforo
+        return semaforo
+
+    async def get(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        timeout: Optional[float] = None,
+        limite_bytes: Optional[int] = None,
+    ) -> RespostaGitHub:
+        """
+        Executa um GET sem bloquear o event loop.
+        
+        Responde do cache quando a entrada está fresca e passa as requisições
+        de rede pelo agendador de rate limit. O limite de requisições em voo
+        vale só durante a chamada de rede: esperas do agendador (balde vazio,
+        Retry-After, backoff) não ocupam vagas. Com `limite_bytes`, o corpo é
+        lido em streaming (com cabeçalho Range) e a leitura para ao atingir o
+        orçamento; a resposta (RespostaLida, com status 200 ou 206) traz só os
+        bytes lidos.
+
+        A chave do cache inclui a impressão da credencial: respostas obtidas
+        com um token não são servidas a outro (nem a chamadas anônimas).
+        """
+        credencial = AgendadorRequisicoes.impressao_credencial(headers)
+        intervalo = "" if limite_bytes is None else f" bytes=0-{limite_bytes - 1}"
+        chave = f"GET {url}{intervalo} {credencial}"
+        entrada = None
+        if self.cache is not None:
+            entrada = await asyncio.to_thread(self.cache.obter, chave)
+            if entrada is not None and entrada.fresca:
+                return _resposta_do_cache(url, entrada)
+
+        # Entrada expirada: revalidar com requisição condicional
+        headers_requisicao = dict(headers)
+        if entrada is not None:
+            if entrada.meta.get("etag"):
+                headers_requisicao["If-None-Match"] = entrada.meta["etag"]
+            if entrada.meta.get("last_modified"):
+                headers_requisicao["If-Modified-Since"] = entrada.meta["last_modified"]
+
+        async def requisitar() -> RespostaGitHub:
+            async with self._semaforo():
+                return await asyncio.to_thread(
+                    self._get_rede, url, headers_requisicao, timeout or self.timeout, limite_bytes
+                )
+
+        resposta = await self.agendador.executar(AgendadorRequisicoes.chave_credencial(url, headers), requisitar)
+
+        if self.cache is None:
+            return resposta
+        return await asyncio.to_thread(self._registrar_no_cache, chave, url, entrada, resposta)
+
+    def _get_rede(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        timeout: float,
+        limite_bytes: Optional[int],
+    ) -> RespostaGitHub:
+        if limite_bytes is None:
+            return self._sessao.get(url, headers=headers, timeout=timeout)
+
+        # Pedir só o trecho necessário; servidores sem suporte a Range são cortados na leitura
+        headers = dict(headers, Range=f"bytes=0-{limite_bytes - 1}")
+        resposta = self._sessao.get(url, headers=headers, timeout=timeout, stream=True)
+        try:
+            blocos = []
+            lidos = 0
+            for bloco in resposta.iter_content(chunk_size=min(16384, limite_bytes)):
+                blocos.append(bloco)
+                lidos += len(bloco)
+                if lidos >= limite_bytes:
+                    break
+        finally:
+            # Descarta o restante do corpo sem baixá-lo
+            resposta.close()
+        return RespostaLida(
+            status_code=resposta.status_code,
+            url=resposta.url,
+            content=b"".join(blocos)[:limite_bytes],
+            headers=resposta.headers,
+            truncada=True,
+        )
+
+    def _registrar_no_cache(
+        self,
+        chave: str,
+        url: str,
+        entrada: Optional[EntradaCache],
+        resposta: RespostaGitHub,
+    ) -> RespostaGitHub:
+        if resposta.status_code == 304 and entrada is not None:
+            self.cache.renovar(chave)
+            self.cache.registrar("revalidacoes")
+            return _resposta_do_cache(url, entrada)
+
+        self.cache.registrar("misses")
+        if resposta.status_code in (200, 206):
+            self.cache.gravar(chave, resposta.content, {
+                "etag": resposta.headers.get("ETag"),
+                "last_modified": resposta.headers.get("Last-Modified"),
+                "content_type": resposta.headers.get("Content-Type"),
+            })
+        return resposta
+
+    def fechar(self):
+        """Fecha as conexões do pool"""
+        self._sessao.close()
+
+
+def decodificar_utf8_parcial(dados: bytes) -> str:
+    """
+    Decodifica bytes UTF-8 possivelmente truncados no meio de um caractere.
+    
+    Usa um decodificador incremental sem finalizar: uma sequência multibyte
+    incompleta no fim do buffer é descartada em vez de virar lixo.
+    """
+    decodificador = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    return decodificador.decode(dados, final=False)
+
+
+def _resposta_do_cache(url: str, entrada: EntradaCache) -> RespostaLida:
+    """Reconstrói uma resposta HTTP 200 a partir de uma entrada do cache"""
+    headers = CaseInsensitiveDict({"X-MASS-DAS-Cache": "hit"})
+    if entrada.meta.get("content_type"):
+        headers["Content-Type"] = entrada.meta["content_type"]
+    # O valor pode ser um trecho lido com orçamento de bytes; a decodificação
+    # parcial não altera corpos completos
+    return RespostaLida(status_code=200, url=url, content=entrada.valor, headers=headers, truncada=True)
+
+
+_cliente: Optional[ClienteGitHub] = None
+
+
+def obter_cliente_github() -> ClienteGitHub:
+    """Retorna o cliente GitHub compartilhado do processo"""
+    global _cliente
+    if _cliente is None:
+        cache = None
+        if CACHE_HABILITADO:
+            cache = CacheDisco(
+                DIRETORIO_CACHE_PADRAO / "github.sqlite3",
+                ttl_segundos=CACHE_TTL_SEGUNDOS,
+                tamanho_maximo_bytes=CACHE_MAX_BYTES,
+            )
+        _cliente = ClienteGitHub(cache=cache)
+    return _cliente
+
+
+def estatisticas_cache_github() -> Dict[str, Any]:
+    """Retorna contadores de hit, miss e revalidação do cache HTTP do GitHub"""
+    cliente = obter_cliente_github()
+    if cliente.cache is None:
+        return {"habilitado": False}
+    return {"habilitado": True, **cliente.cache.estatisticas()}
+
+
+def estatisticas_agendador_github() -> Dict[str, Any]:
+    """Retorna profundidade de fila, tempos de espera e rate limits do agendador"""
+    return obter_cliente_github().agendador.estatisticas()
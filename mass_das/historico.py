@@ -0,0 +1,184 @@
+"""
+Manifesto e histórico de versões dos documentos salvos pelo MASS-DAS.
+
+Um manifesto JSON no diretório de saída guarda o hash SHA-256 de cada
+documento. Ao salvar, um conteúdo com hash igual ao registrado não é
+reescrito. Quando o conteúdo muda, a versão anterior é preservada como um
+delta reverso (novo -> antigo, por linhas, comprimido com zlib): o arquivo
+atual fica completo e versões antigas são reconstruídas aplicando os deltas
+do mais novo para o mais antigo.
+
+Uso (ex: em CI):
+    python -m mass_das.historico hashes [diretorio]            # sha256 e nome de cada documento
+    python -m mass_das.historico mudou <nome> <sha256> [dir]   # código de saída 1 se mudou
+    python -m mass_das.historico versao <nome> <n> [dir]       # conteúdo de n versões atrás
+"""
+import os
+import sys
+import json
+import time
+import zlib
+import difflib
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+from .escrita import escrever_atomico, bloqueio_arquivo
+
+
+logger = logging.getLogger(__name__)
+
+NOME_MANIFESTO = ".mass_das_manifest.json"
+DIRETORIO_HISTORICO = ".historico"
+VERSAO_MANIFESTO = 1
+
+# Versões anteriores mantidas por documento
+MAX_VERSOES = int(os.getenv("MASS_DAS_HISTORICO_MAX", "20"))
+
+
+def ler_manifesto(diretorio: Path) -> Dict:
+    caminho = Path(diretorio) / NOME_MANIFESTO
+    if caminho.is_file():
+        dados = json.loads(caminho.read_text(encoding="utf-8"))
+        if dados.get("versao") == VERSAO_MANIFESTO:
+            return dados
+    return {"versao": VERSAO_MANIFESTO, "documentos": {}}
+
+
+def _gravar_manifesto(diretorio: Path, manifesto: Dict):
+    escrever_atomico(diretorio / NOME_MANIFESTO, [json.dumps(manifesto, ensure_ascii=False, indent=1)])
+
+
+def hash_partes(partes: Sequence[str]) -> str:
+    resumo = hashlib.sha256()
+    for parte in partes:
+        resumo.update(parte.encode("utf-8"))
+    return resumo.hexdigest()
+
+
+def criar_delta(novo: str, antigo: str) -> bytes:
+    """Delta reverso por linhas que reconstrói `antigo` a partir de `novo`"""
+    linhas_novo = novo.splitlines(keepends=True)
+    linhas_antigo = antigo.splitlines(keepends=True)
+    operacoes: List = []
+    comparador = difflib.SequenceMatcher(None, linhas_novo, linhas_antigo, autojunk=False)
+    for tag, i1, i2, j1, j2 in comparador.get_opcodes():
+        if tag == "equal":
+            operacoes.append([i1, i2])
+        elif j2 > j1:
+            operacoes.append(linhas_antigo[j1:j2])
+    return zlib.compress(json.dumps(operacoes, ensure_ascii=False).encode("utf-8"), 9)
+
+
+def aplicar_delta(novo: str, delta: bytes) -> str:
+    linhas_novo = novo.splitlines(keepends=True)
+    partes = []
+    for operacao in json.loads(zlib.decompress(delta)):
+        if len(operacao) == 2 and all(isinstance(x, int) for x in operacao):
+            partes.extend(linhas_novo[operacao[0]:operacao[1]])
+        else:
+            partes.extend(operacao)
+    return "".join(partes)
+
+
+def salvar_versionado(caminho: Path, partes: Sequence[str]) -> Tuple[bool, str]:
+    """
+    Salva o documento atomicamente, a menos que o conteúdo seja idêntico ao registrado.
+
+    A versão anterior (se o arquivo em disco ainda corresponde ao manifesto)
+    é guardada como delta reverso antes de ser substituída.
+
+    Returns:
+        tuple: (arquivo foi escrito, sha256 do conteúdo)
+    """
+    caminho = Path(caminho)
+    diretorio = caminho.parent
+    nome = caminho.name
+    hash_novo = hash_partes(partes)
+
+    with bloqueio_arquivo(diretorio / NOME_MANIFESTO):
+        manifesto = ler_manifesto(diretorio)
+        registro = manifesto["documentos"].get(nome)
+        if registro is not None and registro["sha256"] == hash_novo and caminho.is_file():
+            return False, hash_novo
+
+        versoes = list(registro.get("versoes", [])) if registro else []
+        if registro is not None and caminho.is_file():
+            # Bytes crus: escrever_atomico não traduz quebras de linha, e read_text
+            # converteria \r\n em \n, mudando o hash de documentos com \r\n
+            bruto = caminho.read_bytes()
+            antigo = bruto.decode("utf-8")
+            if hashlib.sha256(bruto).hexdigest() == registro["sha256"]:
+                relativo = f"{DIRETORIO_HISTORICO}/{nome}/{int(time.time() * 1000)}-{registro['sha256'][:12]}.delta"
+                escrever_atomico(diretorio / relativo, [criar_delta("".join(partes), antigo)], encoding=None)
+                versoes.insert(0, {
+                    "sha256": registro["sha256"],
+                    "salvo_em": registro["atualizado"],
+                    "delta": relativo,
+                })
+            else:
+                # Arquivo alterado fora do MASS-DAS: a cadeia de deltas não o reconstrói mais
+                logger.warning("%s foi modificado externamente - histórico anterior descartado", nome)
+                versoes, descartadas = [], versoes
+                _remover_deltas(diretorio, descartadas)
+
+        _remover_deltas(diretorio, versoes[MAX_VERSOES:])
+        versoes = versoes[:MAX_VERSOES]
+
+        escrever_atomico(caminho, partes)
+        manifesto["documentos"][nome] = {
+            "sha256": hash_novo,
+            "tamanho": sum(len(parte.encode("utf-8")) for parte in partes),
+            "atualizado": time.time(),
+            "versoes": versoes,
+        }
+        _gravar_manifesto(diretorio, manifesto)
+    return True, hash_novo
+
+
+def _remover_deltas(diretorio: Path, versoes: List[Dict]):
+    for versao in versoes:
+        try:
+            (diretorio / versao["delta"]).unlink()
+        except FileNotFoundError:
+            pass
+
+
+def reconstruir_versao(caminho: Path, passos: int) -> str:
+    """Conteúdo do documento `passos` versões atrás (0 = atual)"""
+    caminho = Path(caminho)
+    registro = ler_manifesto(caminho.parent)["documentos"][caminho.name]
+    if passos > len(registro["versoes"]):
+        raise ValueError(f"{caminho.name} tem apenas {len(registro['versoes'])} versões anteriores")
+    conteudo = caminho.read_bytes().decode("utf-8")
+    for versao in registro["versoes"][:passos]:
+        conteudo = aplicar_delta(conteudo, (caminho.parent / versao["delta"]).read_bytes())
+    return conteudo
+
+
+def documento_mudou(diretorio: Path, nome: str, hash_conhecido: str) -> bool:
+    """Compara o hash registrado no manifesto (sem ler o documento)"""
+    registro = ler_manifesto(Path(diretorio))["documentos"].get(nome)
+    return registro is None or registro["sha256"] != hash_conhecido
+
+
+if __name__ == "__main__":
+    from .logs import configurar_logging
+
+    configurar_logging()
+    argumentos = sys.argv[1:]
+    if not argumentos or argumentos[0] not in ("hashes", "mudou", "versao"):
+        print(__doc__)
+        sys.exit(2)
+
+    comando = argumentos[0]
+    if comando == "hashes":
+        diretorio_saida = Path(argumentos[1]) if len(argumentos) > 1 else Path("output")
+        for nome_documento, dados in sorted(ler_manifesto(diretorio_saida)["documentos"].items()):
+            print(f"{dados['sha256']}  {nome_documento}")
+    elif comando == "mudou":
+        diretorio_saida = Path(argumentos[3]) if len(argumentos) > 3 else Path("output")
+        sys.exit(1 if documento_mudou(diretorio_saida, argumentos[1], argumentos[2]) else 0)
+    else:
+        diretorio_saida = Path(argumentos[3]) if len(argumentos) > 3 else Path("output")
+        sys.stdout.write(reconstruir_versao(diretorio_saida / argumentos[1], int(argumentos[2])))
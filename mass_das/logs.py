@@ -0,0 +1,103 @@
+"""
+Configuração de logging do MASS-DAS.
+
+Cada módulo usa `logging.getLogger(__name__)` com formatação preguiçosa
+(`logger.debug("... %s", valor)`): com o nível DEBUG desligado, uma chamada
+custa apenas a verificação de nível. O nível e o formato (texto ou JSON,
+uma linha por registro) são definidos por ambiente.
+
+Microbenchmark (print x logger desligado):
+    python -m mass_das.logs
+"""
+import os
+import json
+import logging
+from typing import Dict, Optional
+
+
+NIVEL_LOG = os.getenv("MASS_DAS_LOG_LEVEL", "INFO").upper()
+LOG_JSON = os.getenv("MASS_DAS_LOG_JSON", "false").lower() == "true"
+
+LOGGER_RAIZ = "mass_das"
+
+
+class FormatadorJSON(logging.Formatter):
+    """Formata cada registro como um objeto JSON em uma linha"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        dados = {
+            "ts": round(record.created, 6),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "mensagem": record.getMessage(),
+        }
+        if record.exc_info:
+            dados["excecao"] = self.formatException(record.exc_info)
+        return json.dumps(dados, ensure_ascii=False)
+
+
+def configurar_logging(nivel: Optional[str] = None, formato_json: Optional[bool] = None) -> logging.Logger:
+    """
+    Configura o logger raiz do pacote (idempotente).
+
+    Args:
+        nivel: Nível de log (padrão: MASS_DAS_LOG_LEVEL)
+        formato_json: Emitir JSON em vez de texto (padrão: MASS_DAS_LOG_JSON)
+    """
+    logger = logging.getLogger(LOGGER_RAIZ)
+    logger.setLevel(nivel or NIVEL_LOG)
+
+    handler = next((h for h in logger.handlers if getattr(h, "_mass_das", False)), None)
+    if handler is None:
+        handler = logging.StreamHandler()
+        handler._mass_das = True
+        logger.addHandler(handler)
+        # Evita registros duplicados quando a aplicação também configura o logger raiz
+        logger.propagate = False
+
+    usar_json = LOG_JSON if formato_json is None else formato_json
+    handler.setFormatter(
+        FormatadorJSON() if usar_json
+        else logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+    return logger
+
+
+def benchmark(chamadas: int = 200000) -> Dict[str, float]:
+    """Custo por chamada de um print formatado x logger.debug com DEBUG desligado"""
+    import time
+    import contextlib
+
+    logger = logging.getLogger(f"{LOGGER_RAIZ}.benchmark")
+    nivel_anterior = logger.level
+    logger.setLevel(logging.INFO)
+    sample = {"nome": "customer-service", "linguagem": "python"}
+
+    inicio = time.perf_counter()
+    with open(os.devnull, "w", encoding="utf-8") as destino, contextlib.redirect_stdout(destino):
+        for _ in range(chamadas):
+            print(f"📄 [DEBUG] Analisando sample: {sample['nome']} ({sample['linguagem']})")
+    com_print = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for _ in range(chamadas):
+        logger.debug("Analisando sample: %s (%s)", sample["nome"], sample["linguagem"])
+    com_logger = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for _ in range(chamadas):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Analisando sample: %s (%s)", sample["nome"], sample["linguagem"])
+    com_guarda = time.perf_counter() - inicio
+
+    logger.setLevel(nivel_anterior)
+    return {
+        "chamadas": chamadas,
+        "print_ns": round(com_print / chamadas * 1e9, 1),
+        "logger_debug_desligado_ns": round(com_logger / chamadas * 1e9, 1),
+        "is_enabled_for_ns": round(com_guarda / chamadas * 1e9, 1),
+    }
+
+
+if __name__ == "__main__":
+    print(benchmark())
@@ -0,0 +1,132 @@
+"""
+Projeção do estado da sessão por agente.
+
+No modo pipeline cada agente recebe apenas as chaves do session.state que o
+seu contrato declara (`prompts.CONTRATOS_ESTADO`), anexadas à instrução por
+um InstructionProvider, e roda com `include_contents="none"`: sem o histórico
+da conversa, que repetiria as saídas de todas as etapas anteriores. A
+mensagem que abre o turno (a saída do agente anterior, já presente no estado
+projetado quando é lida) é trocada por um pedido curto.
+
+Opcionalmente o estado projetado é limitado a um orçamento de tokens por
+agente; as chaves que não cabem na sua parte do orçamento são truncadas
+(início e fim preservados), e a sobra das chaves menores é redistribuída.
+"""
+import os
+import json
+import logging
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+from .prompts import CONTRATOS_ESTADO
+
+
+logger = logging.getLogger(__name__)
+
+PROJECAO_ESTADO = os.getenv("MASS_DAS_PROJECAO_ESTADO", "true").lower() == "true"
+# Orçamento padrão de tokens do estado projetado (0 = sem limite)
+ORCAMENTO_PADRAO = int(os.getenv("MASS_DAS_ORCAMENTO_TOKENS", "0"))
+# Orçamentos por agente: "compilador_documentacao=12000,otimizador_arquitetura=6000"
+ORCAMENTOS_AGENTES = os.getenv("MASS_DAS_ORCAMENTO_TOKENS_AGENTES", "")
+
+# Estimativa de caracteres por token (texto em português/JSON)
+CARACTERES_POR_TOKEN = 4
+
+# Mensagem de usuário enviada no lugar da que abriu o turno
+MENSAGEM_TURNO = "Execute a sua tarefa com base no estado da sessão."
+
+
+def _ler_orcamentos(especificacao: str) -> Dict[str, int]:
+    orcamentos = {}
+    for item in filter(None, (parte.strip() for parte in especificacao.split(","))):
+        agente, _, valor = item.partition("=")
+        try:
+            orcamentos[agente.strip()] = int(valor)
+        except ValueError:
+            logger.warning("Orçamento de tokens inválido ignorado: %s", item)
+    return orcamentos
+
+
+_ORCAMENTOS = _ler_orcamentos(ORCAMENTOS_AGENTES)
+
+
+def orcamento_agente(nome_agente: str) -> int:
+    """Orçamento de tokens do estado projetado para o agente (0 = sem limite)"""
+    return _ORCAMENTOS.get(nome_agente, ORCAMENTO_PADRAO)
+
+
+def estimar_tokens(texto: str) -> int:
+    return len(texto) // CARACTERES_POR_TOKEN
+
+
+def _marcador(omitidos: int) -> str:
+    return f"\n[... {omitidos} caracteres omitidos ...]\n"
+
+
+def truncar(texto: str, max_tokens: int) -> str:
+    """
+    Mantém o início (2/3) e o fim (1/3) do texto dentro de `max_tokens`,
+    contando o marcador de omissão. Se nem o marcador cabe, devolve "".
+    """
+    limite = max(max_tokens, 0) * CARACTERES_POR_TOKEN
+    if len(texto) <= limite:
+        return texto
+    # O maior número de omitidos possível dá o maior marcador
+    disponivel = limite - len(_marcador(len(texto)))
+    if disponivel < 0:
+        return ""
+    inicio = disponivel * 2 // 3
+    fim = disponivel - inicio
+    omitidos = len(texto) - inicio - fim
+    return f"{texto[:inicio]}{_marcador(omitidos)}{texto[len(texto) - fim:]}"
+
+
+def _como_texto(valor: Any) -> str:
+    if isinstance(valor, str):
+        return valor
+    return json.dumps(valor, ensure_ascii=False, indent=2)
+
+
+def projetar_estado(estado: Mapping[str, Any], chaves: Sequence[str], orcamento: int = 0) -> str:
+    """
+    Seções Markdown com as chaves pedidas do estado, dentro do orçamento.
+
+    O orçamento é dividido igualmente entre as chaves; o que as chaves menores
+    não usam é repassado às maiores, que são truncadas se ainda excederem.
+    """
+    valores = {chave: _como_texto(estado[chave]) for chave in chaves if estado.get(chave) not in (None, "")}
+    if orcamento > 0 and valores:
+        restante = orcamento
+        pendentes = sorted(valores, key=lambda chave: len(valores[chave]))
+        while pendentes:
+            parte = restante // len(pendentes)
+            chave = pendentes.pop(0)
+            valores[chave] = truncar(valores[chave], parte)
+            restante -= estimar_tokens(valores[chave])
+    return "\n\n".join(f"## {chave}\n{valores[chave]}" for chave in chaves if valores.get(chave))
+
+
+def instrucao_projetada(prompt: str, nome_agente: str) -> Callable[[ReadonlyContext], str]:
+    """InstructionProvider: prompt do agente seguido apenas das chaves que ele lê"""
+    chaves, _ = CONTRATOS_ESTADO[nome_agente]
+    orcamento = orcamento_agente(nome_agente)
+
+    def instrucao(contexto: ReadonlyContext) -> str:
+        estado = projetar_estado(contexto.state, chaves, orcamento)
+        logger.debug("Estado projetado para %s: ~%d tokens", nome_agente, estimar_tokens(estado))
+        return f"{prompt}\n\n# Estado da Sessão\n{estado or '(vazio)'}"
+
+    return instrucao
+
+
+def substituir_abertura_do_turno(callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+    """
+    before_model_callback dos agentes projetados: com include_contents="none"
+    o primeiro conteúdo é a mensagem que abriu o turno (usuário ou agente
+    anterior); as chamadas de ferramenta do próprio turno são mantidas.
+    """
+    if llm_request.contents:
+        llm_request.contents[0] = types.Content(role="user", parts=[types.Part(text=MENSAGEM_TURNO)])
+    return None
@@ -122,4 +122,23 @@ Analise o `documento_rascunho_md`. Sua tarefa é fornecer de 1 a 3 sugestões de
 # Regras
 - Foque apenas em melhorias.
 - Justifique cada sugestão com base nos princípios de otimização de Topologia, Prompt ou Interação.
-- Se a arquitetura parecer sólida, retorne uma lista vazia.""" 
\ No newline at end of file
+- Se a arquitetura parecer sólida, retorne uma lista vazia.""" 
+
+# Contratos de estado: chaves do session.state que cada agente lê e a chave que
+# escreve (o output_key; o publicador_documento, sem LLM, grava o caminho do
+# documento salvo). O agendador (mass_das.agendador) monta o DAG de execução a
+# partir deles; chaves que nenhum agente escreve são entradas externas (ex:
+# `initial_query`).
+CONTRATOS_ESTADO = {
+    "analista_requisitos": (("initial_query",), "requisitos_estruturados"),
+    "arquiteto_coordenador": (("requisitos_estruturados",), "plano_de_arquitetura"),
+    "especialista_prompts": (("plano_de_arquitetura",), "prompts_gerados"),
+    "definidor_ferramentas": (("plano_de_arquitetura", "prompts_gerados"), "ferramentas_definidas"),
+    "compilador_documentacao": (
+        ("initial_query", "requisitos_estruturados", "plano_de_arquitetura", "prompts_gerados", "ferramentas_definidas"),
+        "documento_rascunho_md",
+    ),
+    "otimizador_arquitetura": (("documento_rascunho_md",), "sugestoes_otimizacao"),
+    "gerador_codigo": (("plano_de_arquitetura", "prompts_gerados", "ferramentas_definidas"), "codigo_gerado"),
+    "publicador_documento": (("documento_rascunho_md", "sugestoes_otimizacao"), "documento_final"),
+}
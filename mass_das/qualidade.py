@@ -0,0 +1,202 @@
+"""
+Métricas de qualidade das respostas de documentação do MASS-DAS.
+
+Os conjuntos de indicadores são montados uma única vez no carregamento do
+módulo e cada resposta é convertida para minúsculas e quebrada em palavras
+uma única vez. `validar_qualidade_respostas_lote` avalia sequências de pares
+(pergunta, resposta) e devolve um array NumPy por métrica. Não é uma
+avaliação colunar: as contagens continuam sendo feitas par a par em Python;
+só a combinação das métricas é vetorizada. Fazer as buscas de substring com
+`np.strings.find` sobre o array de respostas mediu o dobro do tempo do laço
+(0,38 s x 0,19 s para 20.000 respostas, NumPy 2.4).
+
+Benchmark (implementação original x chamadas individuais x lote):
+    python -m mass_das.qualidade
+"""
+import logging
+from typing import Dict, Iterable, List, Tuple
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+
+# Palavras técnicas que indicam relevância para o ADK
+PALAVRAS_RELEVANTES = frozenset(['adk', 'agent', 'tool', 'workflow', 'gemini', 'model', 'instruction'])
+
+# Elementos estruturais esperados (busca por substring, sem diferenciar maiúsculas)
+ELEMENTOS_ESPERADOS = ('baseado', 'documentação', 'oficial', 'exemplo', 'adk')
+
+# Indicadores de informação específica (busca por substring, diferenciando maiúsculas)
+INDICADORES_ESPECIFICOS = ('Agent(', 'model=', 'instruction=', 'tools=', 'adk run', 'async def')
+
+METRICAS_QUALIDADE = ('relevancia', 'completude', 'especificidade', 'score')
+
+
+def _contagens(pergunta: str, resposta: str) -> Tuple[int, int, int, int]:
+    """Interseção com a pergunta, palavras técnicas, elementos e indicadores encontrados"""
+    # Os 11 testes de substring (`in`, busca em C) custam ~3 µs numa resposta
+    # de 550 caracteres; uma regex única com as mesmas alternativas mede 66 µs
+    # (ou 97 µs com lookahead para achar sobreposições). O custo está em
+    # lower()/split(), feitos uma vez.
+    resposta_lower = resposta.lower()
+    palavras_resposta = set(resposta_lower.split())
+    return (
+        len(palavras_resposta.intersection(pergunta.lower().split())),
+        len(palavras_resposta & PALAVRAS_RELEVANTES),
+        sum(1 for elem in ELEMENTOS_ESPERADOS if elem in resposta_lower),
+        sum(1 for ind in INDICADORES_ESPECIFICOS if ind in resposta),
+    )
+
+
+def validar_qualidade_resposta_url(pergunta: str, resposta: str) -> Dict[str, float]:
+    """
+    Valida a qualidade da resposta obtida via URL Context.
+
+    Args:
+        pergunta: Pergunta original feita
+        resposta: Resposta obtida via URL Context
+
+    Returns:
+        dict: Métricas de qualidade da resposta
+    """
+    try:
+        intersecao, tecnicas, elementos, especificidade = _contagens(pergunta, resposta)
+
+        metricas = {
+            # 1. Relevância - palavras da pergunta e palavras técnicas presentes na resposta
+            'relevancia': min(10.0, (intersecao * 2) + tecnicas),
+            # 2. Completude - elementos estruturais esperados
+            'completude': (elementos / len(ELEMENTOS_ESPERADOS)) * 10,
+            # 3. Especificidade - informações específicas (código, parâmetros)
+            'especificidade': min(10.0, especificidade * 2),
+        }
+
+        # Score final (média ponderada)
+        metricas['score'] = (
+            metricas['relevancia'] * 0.4 +
+            metricas['completude'] * 0.3 +
+            metricas['especificidade'] * 0.3
+        )
+
+        return metricas
+
+    except Exception as e:
+        logger.error("Erro na validação de qualidade: %s", e)
+        return {'relevancia': 0.0, 'completude': 0.0, 'especificidade': 0.0, 'score': 0.0}
+
+
+def validar_qualidade_respostas_lote(pares: Iterable[Tuple[str, str]]) -> Dict[str, np.ndarray]:
+    """
+    Avalia vários pares (pergunta, resposta) de uma vez.
+
+    Os valores são os mesmos de `validar_qualidade_resposta_url` para cada par;
+    respostas ausentes (None) recebem métricas zeradas.
+
+    Args:
+        pares: Sequência de (pergunta, resposta)
+
+    Returns:
+        dict: Um array float64 por métrica, na ordem dos pares
+    """
+    contagens = np.array(
+        [_contagens(pergunta or "", resposta or "") for pergunta, resposta in pares],
+        dtype=np.float64,
+    ).reshape(-1, 4)
+    intersecao, tecnicas, elementos, especificidade = contagens.T
+
+    relevancia = np.minimum(10.0, intersecao * 2 + tecnicas)
+    completude = (elementos / len(ELEMENTOS_ESPERADOS)) * 10
+    especificidade = np.minimum(10.0, especificidade * 2)
+    return {
+        'relevancia': relevancia,
+        'completude': completude,
+        'especificidade': especificidade,
+        'score': relevancia * 0.4 + completude * 0.3 + especificidade * 0.3,
+    }
+
+
+def _validar_qualidade_original(pergunta: str, resposta: str) -> Dict[str, float]:
+    """Cópia fixa da implementação anterior, referência ("antes") do benchmark"""
+    try:
+        metricas = {
+            'relevancia': 0.0,
+            'completude': 0.0,
+            'especificidade': 0.0,
+            'score': 0.0
+        }
+
+        palavras_pergunta = set(pergunta.lower().split())
+        palavras_resposta = set(resposta.lower().split())
+        palavras_relevantes = ['adk', 'agent', 'tool', 'workflow', 'gemini', 'model', 'instruction']
+
+        intersecao = palavras_pergunta.intersection(palavras_resposta)
+        palavras_tecnicas = palavras_resposta.intersection(set(palavras_relevantes))
+
+        metricas['relevancia'] = min(10.0, (len(intersecao) * 2) + len(palavras_tecnicas))
+
+        elementos_esperados = ['baseado', 'documentação', 'oficial', 'exemplo', 'adk']
+        elementos_encontrados = sum(1 for elem in elementos_esperados if elem.lower() in resposta.lower())
+        metricas['completude'] = (elementos_encontrados / len(elementos_esperados)) * 10
+
+        indicadores_especificos = ['Agent(', 'model=', 'instruction=', 'tools=', 'adk run', 'async def']
+        especificidade = sum(1 for ind in indicadores_especificos if ind in resposta)
+        metricas['especificidade'] = min(10.0, especificidade * 2)
+
+        metricas['score'] = (
+            metricas['relevancia'] * 0.4 +
+            metricas['completude'] * 0.3 +
+            metricas['especificidade'] * 0.3
+        )
+
+        return metricas
+
+    except Exception as e:
+        logger.error("Erro na validação de qualidade: %s", e)
+        return {'relevancia': 0.0, 'completude': 0.0, 'especificidade': 0.0, 'score': 0.0}
+
+
+def benchmark(quantidade: int = 20000) -> Dict[str, float]:
+    """Mede pares/segundo da implementação original, das chamadas individuais e do lote"""
+    import random
+    import time
+
+    gerador = random.Random(42)
+    trechos = [
+        "Baseado na documentação oficial do ADK:", "- Use a classe `Agent` do ADK",
+        "Exemplo: Agent(model=\"gemini\", name=\"x\", instruction=\"...\")",
+        "async def my_tool(param: str, tool_context: ToolContext) -> str",
+        "SequentialAgent executa sub-agentes em ordem.", "Consulte a documentação para detalhes.",
+    ]
+    pares: List[Tuple[str, str]] = [
+        (
+            f"como usar {gerador.choice(['agent', 'tool', 'workflow', 'model'])} no adk?",
+            "\n".join(gerador.choices(trechos, k=12)),
+        )
+        for _ in range(quantidade)
+    ]
+
+    inicio = time.perf_counter()
+    for pergunta, resposta in pares:
+        _validar_qualidade_original(pergunta, resposta)
+    original = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for pergunta, resposta in pares:
+        validar_qualidade_resposta_url(pergunta, resposta)
+    individual = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    validar_qualidade_respostas_lote(pares)
+    lote = time.perf_counter() - inicio
+
+    return {
+        "pares": quantidade,
+        "original_pares_por_s": round(quantidade / original),
+        "individual_pares_por_s": round(quantidade / individual),
+        "lote_pares_por_s": round(quantidade / lote),
+    }
+
+
+if __name__ == "__main__":
+    print(benchmark())
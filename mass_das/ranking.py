@@ -0,0 +1,407 @@
+"""
+Motor de ranking por índice invertido (BM25F) do MASS-DAS.
+
+Os documentos são tokenizados uma única vez na ingestão; cada consulta
+percorre apenas as listas de postings dos seus termos. Com top-k, a busca
+usa MaxScore: os termos são processados do maior para o menor limite de
+contribuição e, quando nem a soma dos limites restantes alcança o k-ésimo
+score, documentos novos deixam de ser admitidos e os termos restantes só
+atualizam os candidatos que ainda podem entrar no top-k. Campos recebem
+pesos (boosts) e termos da consulta podem ter pesos próprios, o que permite
+expressar bônus por tipo de busca.
+
+Benchmark de escala (consulta top-5, o caminho de consultar_samples_adk_github):
+    python -m mass_das.ranking
+
+Medido no corpus sintético do benchmark: 0,06 ms com 20 samples, 0,8 ms com
+2.000 e cerca de 10 ms com 20.000. A meta de menos de 1 ms por consulta vale
+até alguns milhares de samples (o repositório adk-samples tem dezenas) e não
+é atingida com 20.000.
+"""
+import re
+import math
+import heapq
+from collections import Counter
+from typing import Callable, Dict, FrozenSet, List, Optional, Set, Tuple, Iterable
+
+
+_PADRAO_TOKEN = re.compile(r"\w+(?:-\w+)*")
+
+
+def tokenizar(texto: str) -> List[str]:
+    """
+    Quebra um texto em termos normalizados.
+
+    Termos compostos com hífen ("multi-agent") geram o termo composto e suas
+    partes; plurais simples são reduzidos ("agents" -> "agent").
+    """
+    termos = []
+    for token in _PADRAO_TOKEN.findall(texto.lower()):
+        if "-" in token:
+            termos.append(token)
+            termos.extend(_normalizar(parte) for parte in token.split("-") if parte)
+        else:
+            termos.append(_normalizar(token))
+    return termos
+
+
+def _normalizar(termo: str) -> str:
+    if len(termo) > 3 and termo.endswith("s") and not termo.endswith("ss"):
+        return termo[:-1]
+    return termo
+
+
+class IndiceBM25:
+    """Índice invertido com pontuação BM25F sobre múltiplos campos"""
+
+    def __init__(self, pesos_campos: Dict[str, float], k1: float = 1.2, b: float = 0.75):
+        self.pesos_campos = pesos_campos
+        self.k1 = k1
+        self.b = b
+        self.documentos: List[object] = []
+        # termo -> lista de (índice do documento, {campo: frequência})
+        self._postings: Dict[str, List[Tuple[int, Dict[str, int]]]] = {}
+        self._comprimentos: List[Dict[str, int]] = []
+        self._soma_comprimentos: Dict[str, int] = {campo: 0 for campo in pesos_campos}
+        self._termos_por_campo: List[Dict[str, frozenset]] = []
+        # Por documento: termo -> {campo: frequência} (as mesmas entradas das postings)
+        self._frequencias: List[Dict[str, Dict[str, int]]] = []
+        # Documentos que têm o termo em cada campo, por (campo, termo); invalidado a cada ingestão
+        self._documentos_no_campo: Dict[Tuple[str, str], FrozenSet[int]] = {}
+        # Cache de (idf, [(documento, tf BM25F saturado)], {documento: tf}, maior tf) por termo;
+        # invalidado a cada ingestão
+        self._compilados: Dict[str, Tuple[float, List[Tuple[int, float]], Dict[int, float], float]] = {}
+
+    def __len__(self) -> int:
+        return len(self.documentos)
+
+    def adicionar(self, documento: object, campos: Dict[str, str]) -> int:
+        """Ingere um documento (tokenização feita uma única vez aqui)"""
+        indice_doc = len(self.documentos)
+        self.documentos.append(documento)
+        self._compilados.clear()
+        self._documentos_no_campo.clear()
+
+        frequencias: Dict[str, Dict[str, int]] = {}
+        comprimentos = {}
+        termos_campo = {}
+        for campo in self.pesos_campos:
+            termos = tokenizar(campos.get(campo, "") or "")
+            comprimentos[campo] = len(termos)
+            self._soma_comprimentos[campo] += len(termos)
+            contagem = Counter(termos)
+            termos_campo[campo] = frozenset(contagem)
+            for termo, frequencia in contagem.items():
+                frequencias.setdefault(termo, {})[campo] = frequencia
+
+        for termo, por_campo in frequencias.items():
+            self._postings.setdefault(termo, []).append((indice_doc, por_campo))
+        self._comprimentos.append(comprimentos)
+        self._termos_por_campo.append(termos_campo)
+        self._frequencias.append(frequencias)
+        return indice_doc
+
+    def contem_todos(self, indice_doc: int, campo: str, termos: Iterable[str]) -> bool:
+        """Verifica se todos os termos aparecem no campo do documento"""
+        presentes = self._termos_por_campo[indice_doc][campo]
+        return all(termo in presentes for termo in termos)
+
+    def documentos_com_todos(self, campo: str, termos: Iterable[str]) -> Set[int]:
+        """Documentos cujo campo contém todos os termos (interseção das postings)"""
+        conjuntos = []
+        for termo in set(termos):
+            conjunto = self._documentos_no_campo.get((campo, termo))
+            if conjunto is None:
+                conjunto = frozenset(
+                    indice_doc for indice_doc, por_campo in self._postings.get(termo, ()) if campo in por_campo
+                )
+                self._documentos_no_campo[(campo, termo)] = conjunto
+            conjuntos.append(conjunto)
+        if not conjuntos:
+            return set()
+        conjuntos.sort(key=len)
+        return set(conjuntos[0]).intersection(*conjuntos[1:])
+
+    def _compilar(self, termo: str) -> Optional[Tuple[float, List[Tuple[int, float]], Dict[int, float], float]]:
+        """Pré-calcula idf, a contribuição saturada de cada posting do termo e a maior delas"""
+        compilado = self._compilados.get(termo)
+        if compilado is not None:
+            return compilado
+        postings = self._postings.get(termo)
+        if not postings:
+            return None
+
+        medias = self._medias_comprimentos()
+        idf = self._idf(len(postings))
+        contribuicoes = [
+            (indice_doc, self._tf_saturado(indice_doc, por_campo, medias))
+            for indice_doc, por_campo in postings
+        ]
+        compilado = (idf, contribuicoes, dict(contribuicoes), max(tf for _, tf in contribuicoes))
+        self._compilados[termo] = compilado
+        return compilado
+
+    def _medias_comprimentos(self) -> Dict[str, float]:
+        total_docs = len(self.documentos)
+        return {campo: (soma / total_docs) or 1.0 for campo, soma in self._soma_comprimentos.items()}
+
+    def _idf(self, df: int) -> float:
+        return math.log(1 + (len(self.documentos) - df + 0.5) / (df + 0.5))
+
+    def _tf_saturado(self, indice_doc: int, por_campo: Dict[str, int], medias: Dict[str, float]) -> float:
+        """Frequência combinada ponderada por campo (BM25F), saturada por k1"""
+        comprimentos = self._comprimentos[indice_doc]
+        tf = 0.0
+        for campo, frequencia in por_campo.items():
+            normalizacao = (1 - self.b) + self.b * comprimentos[campo] / medias[campo]
+            tf += self.pesos_campos[campo] * frequencia / normalizacao
+        return tf * (self.k1 + 1) / (tf + self.k1)
+
+    def pontuar_documento(self, indice_doc: int, termos_consulta: Dict[str, float]) -> float:
+        """
+        Score BM25F de um único documento com as estatísticas atuais do corpus.
+
+        Custa O(termos da consulta), sem percorrer as postings: serve para
+        pontuar cada documento na ingestão, em vez de repontuar o índice todo.
+        """
+        frequencias = self._frequencias[indice_doc]
+        medias = None
+        score = 0.0
+        for termo, peso_termo in termos_consulta.items():
+            por_campo = frequencias.get(termo)
+            if por_campo is None:
+                continue
+            medias = medias or self._medias_comprimentos()
+            score += peso_termo * self._idf(len(self._postings[termo])) * self._tf_saturado(indice_doc, por_campo, medias)
+        return score
+
+    def pontuar(self, termos_consulta: Dict[str, float]) -> Dict[int, float]:
+        """Calcula o score BM25F de cada documento que contém algum termo da consulta"""
+        scores: Dict[int, float] = {}
+        for termo, peso_termo in termos_consulta.items():
+            compilado = self._compilar(termo)
+            if compilado is None:
+                continue
+            idf, contribuicoes, _, _ = compilado
+            fator = peso_termo * idf
+            obter = scores.get
+            for indice_doc, contribuicao in contribuicoes:
+                scores[indice_doc] = obter(indice_doc, 0.0) + fator * contribuicao
+        return scores
+
+    def buscar(
+        self,
+        termos_consulta: Dict[str, float],
+        top_k: Optional[int] = None,
+        multiplicador: Optional[Callable[[int], float]] = None,
+        multiplicador_maximo: float = 1.0,
+    ) -> List[Tuple[int, float]]:
+        """
+        Retorna (índice do documento, score) dos melhores documentos.
+
+        `multiplicador` ajusta o score final de cada documento (>= 1, no
+        máximo `multiplicador_maximo`, usado nos limites do MaxScore).
+        """
+        if top_k is None or top_k <= 0 or any(peso < 0 for peso in termos_consulta.values()):
+            scores = self.pontuar(termos_consulta)
+            if multiplicador is not None:
+                scores = {indice_doc: score * multiplicador(indice_doc) for indice_doc, score in scores.items()}
+            if top_k is None:
+                return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+            return heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+        return self._buscar_max_score(termos_consulta, top_k, multiplicador, multiplicador_maximo)
+
+    def _buscar_max_score(
+        self,
+        termos_consulta: Dict[str, float],
+        top_k: int,
+        multiplicador: Optional[Callable[[int], float]],
+        multiplicador_maximo: float,
+    ) -> List[Tuple[int, float]]:
+        """
+        Top-k por MaxScore, termo a termo.
+
+        Os scores parciais são limites inferiores (contribuições não negativas,
+        multiplicador >= 1); o corte é o k-ésimo maior entre eles. Um documento
+        ainda não visto soma no máximo os limites dos termos restantes; um
+        candidato cujo parcial mais esses limites fica abaixo do corte é
+        descartado. O corte só é calculado quando os termos já processados
+        somam mais que os restantes (antes disso, nenhum documento pode ser podado).
+        """
+        listas = []
+        for termo, peso_termo in termos_consulta.items():
+            compilado = self._compilar(termo)
+            if compilado is None or peso_termo == 0:
+                continue
+            idf, contribuicoes, por_doc, maior = compilado
+            fator = peso_termo * idf
+            listas.append((fator * maior, fator, contribuicoes, por_doc))
+        listas.sort(key=lambda lista: lista[0], reverse=True)
+        multiplicar = multiplicador or (lambda indice_doc: 1.0)
+
+        # Soma dos limites dos termos seguintes a cada termo (somada de trás
+        # para frente: subtrair acumularia erro de arredondamento abaixo de zero)
+        restantes = [0.0] * len(listas)
+        for posicao in range(len(listas) - 2, -1, -1):
+            restantes[posicao] = restantes[posicao + 1] + listas[posicao + 1][0]
+
+        scores: Dict[int, float] = {}
+        processado = 0.0
+        for (limite, fator, contribuicoes, por_doc), restante in zip(listas, restantes):
+            corte = 0.0
+            if limite + restante < processado and len(scores) >= top_k:
+                corte = heapq.nlargest(top_k, scores.values())[-1]
+            processado += limite
+
+            if (limite + restante) * multiplicador_maximo >= corte:
+                obter = scores.get
+                for indice_doc, contribuicao in contribuicoes:
+                    scores[indice_doc] = obter(indice_doc, 0.0) + fator * contribuicao
+                continue
+
+            # Documentos novos já não alcançam o top-k: só os candidatos são atualizados
+            obter = por_doc.get
+            for indice_doc, score in list(scores.items()):
+                score += fator * obter(indice_doc, 0.0)
+                if (score + restante) * multiplicar(indice_doc) < corte:
+                    del scores[indice_doc]
+                else:
+                    scores[indice_doc] = score
+
+        return heapq.nlargest(
+            top_k,
+            ((indice_doc, score * multiplicar(indice_doc)) for indice_doc, score in scores.items()),
+            key=lambda item: item[1],
+        )
+
+
+# Pesos dos campos dos samples (equivalentes aos pesos de nome/README/tecnologias)
+PESOS_CAMPOS_SAMPLES = {"nome": 5.0, "readme": 3.0, "tecnologias": 2.0}
+
+# Multiplicador quando todos os termos da consulta aparecem no nome do sample
+BOOST_NOME_COMPLETO = 2.0
+
+# Termos adicionados à consulta conforme o tipo de busca, com seus pesos
+BONUS_TIPO_BUSCA = {
+    "arquitetura": {"multi-agent": 0.8, "workflow": 0.8, "coordinator": 0.8, "sequential": 0.8},
+}
+
+
+class IndiceSamples:
+    """Índice BM25F dos samples do adk-samples, construído uma vez na ingestão"""
+
+    def __init__(self, samples: Iterable[Dict] = ()):
+        self._indice = IndiceBM25(PESOS_CAMPOS_SAMPLES)
+        for sample in samples:
+            self.adicionar(sample)
+
+    def __len__(self) -> int:
+        return len(self._indice)
+
+    def adicionar(self, sample: Dict) -> int:
+        return self._indice.adicionar(sample, {
+            "nome": sample.get("nome", "") or "",
+            "readme": sample.get("readme_conteudo", "") or "",
+            "tecnologias": " ".join(sample.get("tecnologias", [])),
+        })
+
+    @staticmethod
+    def _consulta(query: str, tipo_busca: str) -> Tuple[List[str], Dict[str, float]]:
+        """Termos da query e pesos dos termos da consulta (com o bônus do tipo de busca)"""
+        termos_query = tokenizar(query)
+        termos_consulta = {termo: 1.0 for termo in termos_query}
+        for termo, peso in BONUS_TIPO_BUSCA.get(tipo_busca, {}).items():
+            termos_consulta[termo] = termos_consulta.get(termo, 0.0) + peso
+        return termos_query, termos_consulta
+
+    def _boost_nome(self, termos_query: List[str]) -> Callable[[int], float]:
+        """Multiplicador do sample: BOOST_NOME_COMPLETO se o nome contém todos os termos da query"""
+        nome_completo = self._indice.documentos_com_todos("nome", termos_query)
+        return lambda indice_doc: BOOST_NOME_COMPLETO if indice_doc in nome_completo else 1.0
+
+    def pontuar(self, query: str, tipo_busca: str) -> Dict[int, float]:
+        """Score de cada sample (por posição de ingestão) que casa com a consulta"""
+        termos_query, termos_consulta = self._consulta(query, tipo_busca)
+        boost = self._boost_nome(termos_query)
+        return {
+            indice_doc: score * boost(indice_doc)
+            for indice_doc, score in self._indice.pontuar(termos_consulta).items()
+        }
+
+    def pontuar_sample(self, indice_doc: int, query: str, tipo_busca: str) -> float:
+        """Score de um sample com o corpus ingerido até agora (sem repontuar os demais)"""
+        termos_query, termos_consulta = self._consulta(query, tipo_busca)
+        score = self._indice.pontuar_documento(indice_doc, termos_consulta)
+        if termos_query and self._indice.contem_todos(indice_doc, "nome", termos_query):
+            score *= BOOST_NOME_COMPLETO
+        return score
+
+    def ranquear(self, query: str, tipo_busca: str, top_k: Optional[int] = None) -> List[Dict]:
+        """
+        Ranqueia os samples para a consulta.
+
+        Returns:
+            list[dict]: Cópias dos samples com `relevance_score`, apenas scores > 0
+        """
+        termos_query, termos_consulta = self._consulta(query, tipo_busca)
+        melhores = self._indice.buscar(
+            termos_consulta, top_k, self._boost_nome(termos_query), BOOST_NOME_COMPLETO,
+        )
+
+        return [
+            dict(self._indice.documentos[indice_doc], relevance_score=round(score, 4))
+            for indice_doc, score in melhores
+            if score > 0
+        ]
+
+
+def benchmark(tamanhos: Iterable[int] = (20, 200, 2000, 20000), consultas: int = 200) -> List[Dict]:
+    """Mede ingestão e consulta top-k para corpora sintéticos de tamanhos crescentes"""
+    import random
+    import time
+
+    vocabulario = [
+        "agent", "multi-agent", "workflow", "customer", "service", "data", "science",
+        "sequential", "coordinator", "parallel", "search", "rag", "travel", "finance",
+        "marketing", "bug", "assistant", "llm", "gemini", "tool", "memory", "evaluation",
+    ] + [f"termo{i}" for i in range(2000)]
+    gerador = random.Random(42)
+    resultados = []
+
+    for tamanho in tamanhos:
+        samples = [
+            {
+                "nome": "-".join(gerador.sample(vocabulario[:22], 2)) + f"-{i}",
+                "readme_conteudo": " ".join(gerador.choices(vocabulario, k=80)),
+                "tecnologias": ["Python", "Markdown", "TOML"],
+            }
+            for i in range(tamanho)
+        ]
+
+        inicio = time.perf_counter()
+        indice = IndiceSamples(samples)
+        ingestao = time.perf_counter() - inicio
+
+        # Caminho da ferramenta (top-5, com MaxScore) e ranking completo
+        inicio = time.perf_counter()
+        for _ in range(consultas):
+            indice.ranquear("customer service agent", "arquitetura", top_k=5)
+        consulta = (time.perf_counter() - inicio) / consultas
+
+        inicio = time.perf_counter()
+        for _ in range(consultas):
+            indice.ranquear("customer service agent", "arquitetura")
+        completa = (time.perf_counter() - inicio) / consultas
+
+        resultados.append({
+            "samples": tamanho,
+            "ingestao_ms": round(ingestao * 1000, 2),
+            "consulta_top5_ms": round(consulta * 1000, 4),
+            "consulta_completa_ms": round(completa * 1000, 4),
+        })
+    return resultados
+
+
+if __name__ == "__main__":
+    for linha in benchmark():
+        print(linha)
@@ -0,0 +1,243 @@
+"""
+Agendador de requisições ciente de rate limit para o GitHub.
+
+Mantém um balde de tokens por credencial (e por host), alimentado pelos
+cabeçalhos `X-RateLimit-Limit/Remaining/Reset` das respostas: o ritmo de
+envio é ajustado para distribuir as requisições restantes até o reset da
+janela. Respostas 403/429 de rate limit (primário ou secundário) não são
+repassadas como erro; a requisição volta para a fila e é repetida após
+`Retry-After`, o reset da janela ou um backoff exponencial com jitter.
+"""
+import os
+import time
+import random
+import asyncio
+import hashlib
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Deque, Dict, Optional, Any
+from urllib.parse import urlsplit
+import requests
+
+
+MAX_TENTATIVAS_PADRAO = int(os.getenv("GITHUB_MAX_TENTATIVAS", "5"))
+ESPERA_MAXIMA_PADRAO = float(os.getenv("GITHUB_ESPERA_MAXIMA", "120"))
+
+# Rajada máxima de requisições enviadas sem espaçamento
+RAJADA_MAXIMA = 10
+
+# Requisições mantidas em reserva na janela para nunca zerar a cota
+MARGEM_SEGURANCA = 1
+
+
+@dataclass
+class BaldeTokens:
+    """Balde de tokens de uma credencial, ajustado pelos cabeçalhos de rate limit"""
+    capacidade: float = RAJADA_MAXIMA
+    tokens: float = RAJADA_MAXIMA
+    # Tokens por segundo; infinito até a primeira resposta informar os limites
+    taxa: float = float("inf")
+    atualizado: float = field(default_factory=time.monotonic)
+    bloqueado_ate: float = 0.0
+    restantes: Optional[int] = None
+
+    def _reabastecer(self, agora: float):
+        if self.taxa == float("inf"):
+            self.tokens = self.capacidade
+        else:
+            self.tokens = min(self.capacidade, self.tokens + (agora - self.atualizado) * self.taxa)
+        self.atualizado = agora
+
+    def tempo_ate_token(self, agora: float) -> float:
+        """Segundos até haver um token disponível (0 se já houver)"""
+        if self.bloqueado_ate > agora:
+            return self.bloqueado_ate - agora
+        if self.taxa <= 0:
+            # Cota zerada e bloqueio vencido: a janela reiniciou, limites
+            # desconhecidos até a próxima resposta
+            self.taxa = float("inf")
+            self.restantes = None
+        self._reabastecer(agora)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.taxa
+
+    def consumir(self):
+        self.tokens -= 1
+        if self.restantes is not None:
+            self.restantes -= 1
+
+    def atualizar(self, restantes: int, reset_epoch: float, agora: float):
+        """Ajusta capacidade e ritmo para distribuir as requisições restantes até o reset"""
+        self._reabastecer(agora)
+        janela = max(1.0, reset_epoch - time.time())
+        disponiveis = max(0, restantes - MARGEM_SEGURANCA)
+        self.restantes = restantes
+        if disponiveis == 0:
+            self.tokens = 0.0
+            self.taxa = 0.0
+            self.bloqueado_ate = max(self.bloqueado_ate, agora + janela)
+            return
+        self.taxa = disponiveis / janela
+        self.capacidade = float(min(RAJADA_MAXIMA, disponiveis))
+        self.tokens = min(self.tokens, self.capacidade)
+
+    def bloquear(self, segundos: float, agora: float):
+        self.bloqueado_ate = max(self.bloqueado_ate, agora + segundos)
+
+
+class AgendadorRequisicoes:
+    """Fila de requisições com balde de tokens por credencial e retentativa em rate limit"""
+
+    def __init__(
+        self,
+        max_tentativas: int = MAX_TENTATIVAS_PADRAO,
+        espera_maxima: float = ESPERA_MAXIMA_PADRAO,
+        backoff_base: float = 1.0,
+        backoff_maximo: float = 60.0,
+    ):
+        self.max_tentativas = max_tentativas
+        self.espera_maxima = espera_maxima
+        self.backoff_base = backoff_base
+        self.backoff_maximo = backoff_maximo
+        self._baldes: Dict[str, BaldeTokens] = {}
+        self._lock = threading.Lock()
+        self._esperas: Deque[float] = deque(maxlen=1000)
+        self._metricas = {
+            "fila_atual": 0,
+            "fila_maxima": 0,
+            "requisicoes": 0,
+            "esperas": 0,
+            "tempo_espera_total_s": 0.0,
+            "rate_limits": 0,
+            "retentativas": 0,
+        }
+
+    @staticmethod
+    def impressao_credencial(headers: Dict[str, str]) -> str:
+        """Hash curto do cabeçalho Authorization (nunca a credencial em si), ou 'anonimo'"""
+        autorizacao = headers.get("Authorization", "")
+        return hashlib.sha256(autorizacao.encode()).hexdigest()[:12] if autorizacao else "anonimo"
+
+    @staticmethod
+    def chave_credencial(url: str, headers: Dict[str, str]) -> str:
+        """Identifica o balde: host + impressão da credencial"""
+        return f"{urlsplit(url).netloc}|{AgendadorRequisicoes.impressao_credencial(headers)}"
+
+    def _balde(self, chave: str) -> BaldeTokens:
+        balde = self._baldes.get(chave)
+        if balde is None:
+            balde = self._baldes.setdefault(chave, BaldeTokens())
+        return balde
+
+    async def executar(
+        self,
+        chave: str,
+        requisicao: Callable[[], Awaitable[requests.Response]],
+    ) -> requests.Response:
+        """
+        Executa a requisição respeitando o balde da credencial.
+
+        Em rate limit, reenfileira com backoff até `max_tentativas` ou até a
+        espera acumulada ultrapassar `espera_maxima`; então devolve a última resposta.
+        """
+        espera_acumulada = 0.0
+        resposta = None
+        for tentativa in range(self.max_tentativas):
+            espera_acumulada += await self._adquirir(chave)
+            resposta = await requisicao()
+            self._metricas["requisicoes"] += 1
+            self._atualizar_limites(chave, resposta)
+
+            espera = self._espera_rate_limit(resposta, tentativa)
+            if espera is None:
+                return resposta
+
+            self._metricas["rate_limits"] += 1
+            if tentativa + 1 >= self.max_tentativas or espera_acumulada + espera > self.espera_maxima:
+                return resposta
+            self._metricas["retentativas"] += 1
+            with self._lock:
+                self._balde(chave).bloquear(espera, time.monotonic())
+        return resposta
+
+    async def _adquirir(self, chave: str) -> float:
+        inicio = time.monotonic()
+        self._metricas["fila_atual"] += 1
+        self._metricas["fila_maxima"] = max(self._metricas["fila_maxima"], self._metricas["fila_atual"])
+        try:
+            while True:
+                with self._lock:
+                    balde = self._balde(chave)
+                    espera = balde.tempo_ate_token(time.monotonic())
+                    if espera <= 0:
+                        balde.consumir()
+                        break
+                await asyncio.sleep(espera)
+        finally:
+            self._metricas["fila_atual"] -= 1
+
+        esperado = time.monotonic() - inicio
+        if esperado > 0.001:
+            self._metricas["esperas"] += 1
+            self._metricas["tempo_espera_total_s"] += esperado
+        self._esperas.append(esperado)
+        return esperado
+
+    def _atualizar_limites(self, chave: str, resposta: requests.Response):
+        restantes = resposta.headers.get("X-RateLimit-Remaining")
+        reset = resposta.headers.get("X-RateLimit-Reset")
+        if restantes is None or reset is None:
+            return
+        try:
+            with self._lock:
+                self._balde(chave).atualizar(int(restantes), float(reset), time.monotonic())
+        except ValueError:
+            pass
+
+    def _espera_rate_limit(self, resposta: requests.Response, tentativa: int) -> Optional[float]:
+        """Segundos a esperar se a resposta for um rate limit; None caso contrário"""
+        if resposta.status_code not in (403, 429):
+            return None
+
+        retry_after = resposta.headers.get("Retry-After")
+        restantes = resposta.headers.get("X-RateLimit-Remaining")
+        if resposta.status_code == 403 and retry_after is None and restantes != "0":
+            # 403 sem sinais de rate limit é erro de permissão: não repetir
+            if "rate limit" not in resposta.text.lower():
+                return None
+
+        jitter = random.uniform(0, self.backoff_base)
+        if retry_after is not None:
+            try:
+                return float(retry_after) + jitter
+            except ValueError:
+                pass
+        if restantes == "0" and resposta.headers.get("X-RateLimit-Reset"):
+            try:
+                return max(0.0, float(resposta.headers["X-RateLimit-Reset"]) - time.time()) + jitter
+            except ValueError:
+                pass
+        # Backoff exponencial com jitter completo
+        return random.uniform(0, min(self.backoff_maximo, self.backoff_base * 2 ** tentativa))
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """Profundidade de fila, tempos de espera e contagem de rate limits"""
+        esperas = sorted(self._esperas)
+        p95 = esperas[int(0.95 * (len(esperas) - 1))] if esperas else 0.0
+        with self._lock:
+            baldes = {
+                chave: {
+                    "restantes": balde.restantes,
+                    "taxa_por_s": None if balde.taxa == float("inf") else round(balde.taxa, 4),
+                }
+                for chave, balde in self._baldes.items()
+            }
+        return {
+            **self._metricas,
+            "tempo_espera_total_s": round(self._metricas["tempo_espera_total_s"], 3),
+            "espera_p95_s": round(p95, 3),
+            "espera_maxima_s": round(esperas[-1], 3) if esperas else 0.0,
+            "baldes": baldes,
+        }
@@ -0,0 +1,378 @@
+"""
+Roteador de modelos dos agentes do MASS-DAS.
+
+Cada agente recebe um nível de modelo ("pro", "flash") de uma política
+declarativa (POLITICA_PADRAO, sobrescrita por um arquivo JSON/YAML em
+MASS_DAS_POLITICA_MODELOS). A política padrão mantém todos os agentes no
+nível "pro", sem SLO: níveis mais baratos e SLOs valem só quando o arquivo
+de política os define. A cada chamada, no before_model_callback, o
+roteador confirma ou rebaixa o nível e grava o modelo em `llm_request.model`:
+
+- SLO: se o p95 móvel de latência do agente naquele nível (amostras dos
+  últimos MASS_DAS_ROTEADOR_JANELA_S segundos, incluindo os traces gravados)
+  passa do `slo_p95_ms` do agente, usa o próximo nível mais rápido (o nível
+  original volta quando as amostras lentas saem da janela);
+- orçamento: com MASS_DAS_ORCAMENTO_USD > 0, rebaixa quando o custo estimado
+  da chamada estouraria o orçamento da execução (invocação) e interrompe a
+  execução quando o orçamento já foi gasto.
+
+As janelas de latência são semeadas com o final do arquivo de traces na
+primeira chamada roteada (numa thread de trabalho, fora do event loop), não
+na importação, e só se algum agente tiver SLO. As variáveis antigas de modelo
+por agente (ANALISTA_MODEL, ..., ROOT_AGENT_MODEL) ainda fixam o modelo do
+agente, sem roteamento, e geram um aviso de obsolescência.
+
+As decisões e a latência resultante de cada chamada vão para o log.
+Política e latências por agente/modelo nos traces:
+    python -m mass_das.roteador [traces.jsonl]
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from .projecao import CARACTERES_POR_TOKEN
+from .tracing import ARQUIVO_TRACES, carregar_spans, _percentil
+
+
+logger = logging.getLogger(__name__)
+
+ARQUIVO_POLITICA = os.getenv("MASS_DAS_POLITICA_MODELOS", "")
+# Orçamento de custo por execução em USD (0 = sem limite)
+ORCAMENTO_USD = float(os.getenv("MASS_DAS_ORCAMENTO_USD", "0"))
+JANELA_SEGUNDOS = float(os.getenv("MASS_DAS_ROTEADOR_JANELA_S", "900"))
+# Amostras mínimas na janela antes de aplicar o SLO
+AMOSTRAS_MINIMAS = 5
+# Tokens de saída assumidos antes da primeira resposta medida do agente
+SAIDA_ESTIMADA_PADRAO = 1000
+# Bytes lidos do final do arquivo de traces para semear as janelas de latência
+TRACES_LEITURA_MAX_BYTES = 4 * 1024 * 1024
+
+# Variáveis de modelo por agente anteriores à política: ainda fixam o modelo
+VARIAVEIS_OBSOLETAS = {
+    "mass_das_system": "ROOT_AGENT_MODEL",
+    "analista_requisitos": "ANALISTA_MODEL",
+    "arquiteto_coordenador": "ARQUITETO_MODEL",
+    "especialista_prompts": "ESPECIALISTA_MODEL",
+    "definidor_ferramentas": "DEFINIDOR_MODEL",
+    "compilador_documentacao": "COMPILADOR_MODEL",
+    "otimizador_arquitetura": "OTIMIZADOR_MODEL",
+}
+
+# Níveis do mais capaz ao mais rápido; preços em USD por milhão de tokens
+POLITICA_PADRAO: Dict[str, Any] = {
+    "niveis": {
+        "pro": {
+            "modelo": os.getenv("MASS_DAS_MODELO_PRO", "gemini-2.5-pro-preview-06-05"),
+            "preco_entrada": 1.25,
+            "preco_saida": 10.0,
+        },
+        "flash": {
+            "modelo": os.getenv("MASS_DAS_MODELO_FLASH", "gemini-2.5-flash"),
+            "preco_entrada": 0.30,
+            "preco_saida": 2.50,
+        },
+    },
+    "padrao": {"nivel": "pro", "slo_p95_ms": 0},
+    # Todos no nível dos modelos originais e sem SLO: rebaixamentos só por
+    # arquivo de política (MASS_DAS_POLITICA_MODELOS) ou orçamento
+    "agentes": {
+        "mass_das_system": {"nivel": "pro"},
+        "analista_requisitos": {"nivel": "pro"},
+        "arquiteto_coordenador": {"nivel": "pro"},
+        "especialista_prompts": {"nivel": "pro"},
+        "definidor_ferramentas": {"nivel": "pro"},
+        "compilador_documentacao": {"nivel": "pro"},
+        "otimizador_arquitetura": {"nivel": "pro"},
+        "gerador_codigo": {"nivel": "pro"},
+    },
+}
+
+
+class OrcamentoExcedido(RuntimeError):
+    """Execução que já gastou o orçamento de custo dos modelos"""
+
+
+@dataclass
+class Decisao:
+    """Nível escolhido para uma chamada e por quê"""
+    agente: str
+    nivel: str
+    modelo: str
+    nivel_politica: str
+    motivo: str = "política"
+
+
+def carregar_politica(caminho: str = ARQUIVO_POLITICA) -> Dict[str, Any]:
+    """
+    Política padrão, com níveis/agentes sobrescritos pelo arquivo informado.
+
+    Um agente com "modelo" na política (ou numa variável de VARIAVEIS_OBSOLETAS,
+    que tem precedência) usa sempre esse modelo, sem SLO nem rebaixamento.
+    """
+    politica = json.loads(json.dumps(POLITICA_PADRAO))
+    if caminho:
+        arquivo = Path(caminho)
+        texto = arquivo.read_text(encoding="utf-8")
+        if arquivo.suffix.lower() == ".json":
+            dados = json.loads(texto)
+        else:
+            import yaml
+            dados = yaml.safe_load(texto)
+        for secao in ("niveis", "agentes"):
+            for nome, valores in (dados.get(secao) or {}).items():
+                politica[secao].setdefault(nome, {}).update(valores)
+        politica["padrao"].update(dados.get("padrao") or {})
+
+    for agente, variavel in VARIAVEIS_OBSOLETAS.items():
+        modelo = os.getenv(variavel)
+        if modelo:
+            logger.warning(
+                "%s está obsoleta: fixa %s em %s, sem roteamento; use MASS_DAS_POLITICA_MODELOS",
+                variavel, agente, modelo,
+            )
+            politica["agentes"].setdefault(agente, {})["modelo"] = modelo
+    return politica
+
+
+def _estimar_tokens_entrada(llm_request: LlmRequest) -> int:
+    caracteres = len(str(llm_request.config.system_instruction or "")) if llm_request.config else 0
+    for conteudo in llm_request.contents or []:
+        for parte in conteudo.parts or []:
+            caracteres += len(parte.text or "")
+    return caracteres // CARACTERES_POR_TOKEN
+
+
+class RoteadorModelos:
+    """Escolhe o modelo de cada chamada e mede latência e custo resultantes"""
+
+    def __init__(self, politica: Dict[str, Any], orcamento_usd: float = ORCAMENTO_USD,
+                 janela_segundos: float = JANELA_SEGUNDOS, arquivo_traces: Optional[Path] = None):
+        self.politica = politica
+        self.orcamento_usd = orcamento_usd
+        self.janela_segundos = janela_segundos
+        # Traces lidos só na primeira chamada roteada (ver _semear)
+        self._arquivo_traces = arquivo_traces
+        # Níveis na ordem da política: do mais capaz ao mais rápido
+        self.niveis: List[str] = list(politica["niveis"])
+        self._por_modelo = {dados["modelo"]: nivel for nivel, dados in politica["niveis"].items()}
+        self._latencias: Dict[Tuple[str, str], Deque[Tuple[float, float]]] = {}
+        self._saida_media: Dict[str, float] = {}
+        # Gasto por invocação (só as mais recentes ficam em memória)
+        self._gastos: "OrderedDict[str, float]" = OrderedDict()
+        self._em_curso: Dict[Tuple[str, str], Tuple[Decisao, float]] = {}
+        self._lock = threading.Lock()
+
+    def config_agente(self, agente: str) -> Dict[str, Any]:
+        return {**self.politica["padrao"], **self.politica["agentes"].get(agente, {})}
+
+    def modelo_do_agente(self, agente: str) -> str:
+        """Modelo fixado ou do nível da política (usado na criação do agente)"""
+        config = self.config_agente(agente)
+        return config.get("modelo") or self.politica["niveis"][config["nivel"]]["modelo"]
+
+    # -- latência -------------------------------------------------------------
+
+    def registrar_latencia(self, agente: str, nivel: str, latencia_ms: float, quando: Optional[float] = None):
+        with self._lock:
+            amostras = self._latencias.setdefault((agente, nivel), deque(maxlen=200))
+            amostras.append((quando or time.time(), latencia_ms))
+
+    def p95(self, agente: str, nivel: str) -> Optional[float]:
+        """p95 móvel da latência (ms) dentro da janela; None com poucas amostras"""
+        limite = time.time() - self.janela_segundos
+        with self._lock:
+            amostras = [ms for quando, ms in self._latencias.get((agente, nivel), ()) if quando >= limite]
+        if len(amostras) < AMOSTRAS_MINIMAS:
+            return None
+        return _percentil(amostras, 0.95)
+
+    def _semear(self):
+        """Semeia as janelas com o final do arquivo de traces, uma única vez"""
+        with self._lock:
+            arquivo, self._arquivo_traces = self._arquivo_traces, None
+        if arquivo is None:
+            return
+        if not any(self.config_agente(agente).get("slo_p95_ms") for agente in self.politica["agentes"]):
+            return
+        try:
+            # Arquivo sem escrita dentro da janela: nenhuma amostra serviria
+            if arquivo.stat().st_mtime < time.time() - self.janela_segundos:
+                return
+            self.carregar_traces(carregar_spans(arquivo, max_bytes=TRACES_LEITURA_MAX_BYTES))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning("Falha ao ler latências dos traces %s: %s", arquivo, e)
+
+    async def semear(self):
+        """Semeia as janelas (ver _semear) sem bloquear o event loop"""
+        if self._arquivo_traces is not None:
+            await asyncio.to_thread(self._semear)
+
+    def carregar_traces(self, spans: List[Dict]):
+        """Semeia as janelas de latência com as chamadas de modelo dos traces"""
+        limite = time.time() - self.janela_segundos
+        for span in spans:
+            nivel = self._por_modelo.get(span.get("atributos", {}).get("modelo", ""))
+            if span["tipo"] != "modelo" or nivel is None or not span.get("fim") or span["fim"] < limite:
+                continue
+            if span["atributos"].get("cache"):
+                continue
+            agente = span["nome"].rsplit(".modelo", 1)[0]
+            self.registrar_latencia(agente, nivel, (span["fim"] - span["inicio"]) * 1000, quando=span["fim"])
+
+    # -- custo ----------------------------------------------------------------
+
+    def custo(self, nivel: str, tokens_entrada: float, tokens_saida: float) -> float:
+        precos = self.politica["niveis"][nivel]
+        return (tokens_entrada * precos["preco_entrada"] + tokens_saida * precos["preco_saida"]) / 1_000_000
+
+    def gasto(self, invocacao: str) -> float:
+        with self._lock:
+            return self._gastos.get(invocacao, 0.0)
+
+    def _somar_gasto(self, invocacao: str, valor: float):
+        with self._lock:
+            self._gastos[invocacao] = self._gastos.get(invocacao, 0.0) + valor
+            self._gastos.move_to_end(invocacao)
+            while len(self._gastos) > 256:
+                self._gastos.popitem(last=False)
+
+    # -- decisão --------------------------------------------------------------
+
+    def escolher(self, agente: str, invocacao: str, tokens_entrada: int) -> Decisao:
+        if self._arquivo_traces is not None:
+            self._semear()
+        config = self.config_agente(agente)
+        nivel = config["nivel"]
+        if config.get("modelo"):
+            self._verificar_orcamento(agente, invocacao)
+            return Decisao(agente, nivel, config["modelo"], nivel, motivo="modelo fixado")
+        decisao = Decisao(agente, nivel, "", nivel)
+        indice = self.niveis.index(nivel)
+
+        slo = config.get("slo_p95_ms") or 0
+        while slo and indice + 1 < len(self.niveis):
+            p95 = self.p95(agente, self.niveis[indice])
+            if p95 is None or p95 <= slo:
+                break
+            decisao.motivo = f"p95 {p95:.0f} ms > SLO {slo} ms em {self.niveis[indice]}"
+            indice += 1
+
+        if self.orcamento_usd > 0:
+            gasto = self._verificar_orcamento(agente, invocacao)
+            saida = self._saida_media.get(agente, SAIDA_ESTIMADA_PADRAO)
+            while indice + 1 < len(self.niveis):
+                estimado = self.custo(self.niveis[indice], tokens_entrada, saida)
+                if gasto + estimado <= self.orcamento_usd:
+                    break
+                decisao.motivo = (f"orçamento: US$ {gasto:.4f} + {estimado:.4f} estimado > "
+                                  f"{self.orcamento_usd:.4f} em {self.niveis[indice]}")
+                indice += 1
+
+        decisao.nivel = self.niveis[indice]
+        decisao.modelo = self.politica["niveis"][decisao.nivel]["modelo"]
+        return decisao
+
+    def _verificar_orcamento(self, agente: str, invocacao: str) -> float:
+        """Gasto da execução; interrompe se o orçamento já foi gasto"""
+        gasto = self.gasto(invocacao)
+        if self.orcamento_usd > 0 and gasto >= self.orcamento_usd:
+            raise OrcamentoExcedido(
+                f"Orçamento de US$ {self.orcamento_usd:.4f} esgotado nesta execução "
+                f"(gasto US$ {gasto:.4f}, agente {agente})"
+            )
+        return gasto
+
+    def antes_do_modelo(self, callback_context: CallbackContext, llm_request: LlmRequest) -> None:
+        decisao = self.escolher(
+            callback_context.agent_name, callback_context.invocation_id, _estimar_tokens_entrada(llm_request),
+        )
+        llm_request.model = decisao.modelo
+        if decisao.nivel != decisao.nivel_politica:
+            logger.info("Roteador: %s -> %s (%s; política: %s)",
+                        decisao.agente, decisao.modelo, decisao.motivo, decisao.nivel_politica)
+        else:
+            logger.debug("Roteador: %s -> %s", decisao.agente, decisao.modelo)
+        with self._lock:
+            self._em_curso[(callback_context.invocation_id, callback_context.agent_name)] = (decisao, time.time())
+
+    def depois_do_modelo(self, callback_context: CallbackContext, llm_response: LlmResponse) -> None:
+        if llm_response.partial:
+            return
+        with self._lock:
+            item = self._em_curso.pop((callback_context.invocation_id, callback_context.agent_name), None)
+        if item is None:
+            return
+        decisao, inicio = item
+        latencia_ms = (time.time() - inicio) * 1000
+        if not llm_response.error_code:
+            self.registrar_latencia(decisao.agente, decisao.nivel, latencia_ms)
+
+        uso = llm_response.usage_metadata
+        tokens_entrada = (uso.prompt_token_count or 0) if uso else 0
+        tokens_saida = (uso.candidates_token_count or 0) if uso else 0
+        if uso:
+            anterior = self._saida_media.get(decisao.agente, tokens_saida)
+            self._saida_media[decisao.agente] = 0.8 * anterior + 0.2 * tokens_saida
+        custo = self.custo(decisao.nivel, tokens_entrada, tokens_saida)
+        self._somar_gasto(callback_context.invocation_id, custo)
+
+        referencia = self.p95(decisao.agente, decisao.nivel_politica)
+        efeito = f"; p95 em {decisao.nivel_politica}: {referencia:.0f} ms" if referencia is not None else ""
+        logger.log(
+            logging.INFO if decisao.nivel != decisao.nivel_politica else logging.DEBUG,
+            "Roteador: %s em %s levou %.0f ms%s; custo US$ %.5f (execução: US$ %.5f)",
+            decisao.agente, decisao.modelo, latencia_ms, efeito, custo, self.gasto(callback_context.invocation_id),
+        )
+
+    def descartar(self, callback_context: CallbackContext):
+        """Esquece a chamada em curso (resposta servida sem chamar o modelo)"""
+        with self._lock:
+            self._em_curso.pop((callback_context.invocation_id, callback_context.agent_name), None)
+
+
+_roteador: Optional[RoteadorModelos] = None
+_roteador_lock = threading.Lock()
+
+
+def obter_roteador() -> RoteadorModelos:
+    """Retorna o roteador compartilhado do processo (traces lidos na primeira chamada roteada)"""
+    global _roteador
+    with _roteador_lock:
+        if _roteador is None:
+            _roteador = RoteadorModelos(carregar_politica(), arquivo_traces=ARQUIVO_TRACES)
+    return _roteador
+
+
+def modelo_do_agente(agente: str) -> str:
+    """Modelo inicial do agente segundo a política de roteamento"""
+    return obter_roteador().modelo_do_agente(agente)
+
+
+if __name__ == "__main__":
+    from .logs import configurar_logging
+
+    configurar_logging()
+    arquivo_traces = Path(sys.argv[1]) if len(sys.argv) > 1 else ARQUIVO_TRACES
+    roteador = RoteadorModelos(carregar_politica(), janela_segundos=float("inf"))
+    if arquivo_traces.exists():
+        roteador.carregar_traces(carregar_spans(arquivo_traces))
+    print(f"{'Agente':<28} {'nível':<7} {'SLO p95 ms':>11}" + "".join(f" {'p95 ' + n:>12}" for n in roteador.niveis))
+    for agente in roteador.politica["agentes"]:
+        config = roteador.config_agente(agente)
+        p95s = [roteador.p95(agente, nivel) for nivel in roteador.niveis]
+        nivel = "fixo" if config.get("modelo") else config["nivel"]
+        print(f"{agente:<28} {nivel:<7} {config.get('slo_p95_ms') or '-':>11}"
+              + "".join(f" {p95:>12.0f}" if p95 is not None else f" {'-':>12}" for p95 in p95s))
+    if ORCAMENTO_USD:
+        print(f"\nOrçamento por execução: US$ {ORCAMENTO_USD:.4f}")
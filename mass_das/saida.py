@@ -0,0 +1,173 @@
+"""
+Backends de saída dos projetos gerados por `gerar_codigo_agentes`.
+
+Os geradores produzem {caminho relativo: conteúdo}; o backend decide o destino:
+
+- "disco":   output/<nome_projeto> via armazém de artefatos (blobs escritos em paralelo)
+- "memoria": dict {caminho: bytes}, sem nenhum acesso a disco
+- "tar":     stream .tar.gz em memória
+- "zip":     stream .zip em memória
+
+O backend padrão do agente vem de MASS_DAS_SAIDA; uma API pode chamar
+`tools.gerar_projeto(..., saida=SaidaMemoria())` e devolver o resultado
+diretamente, sem reler arquivos do disco. Na ferramenta do agente
+(`gerar_codigo_agentes`) os arquivos .tar.gz/.zip são salvos como artefatos
+da sessão; "memoria" não tem como ser entregue ao agente e é recusado lá.
+"""
+import io
+import os
+import time
+import tarfile
+import zipfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from .artefatos import ArmazemArtefatos, obter_armazem_artefatos
+
+
+BACKEND_SAIDA = os.getenv("MASS_DAS_SAIDA", "disco").lower()
+
+
+class SaidaProjeto(ABC):
+    """Destino de um projeto gerado"""
+
+    nome = ""
+
+    def planejar(self, nome_projeto: str, entradas: Dict[str, str]) -> Dict[str, List[str]]:
+        """
+        Quais arquivos precisam ser (re)gerados, dado o hash das entradas de cada um.
+
+        Backends sem estado anterior geram tudo; ver ArmazemArtefatos.planejar.
+        """
+        return {"gerar": list(entradas), "inalterados": [], "modificados": []}
+
+    @abstractmethod
+    def emitir(self, nome_projeto: str, arquivos: Dict[str, str], diretorios: Iterable[str] = (),
+               entradas: Optional[Dict[str, str]] = None) -> Any:
+        """
+        Emite os arquivos do projeto.
+
+        Args:
+            nome_projeto: Nome do projeto (raiz dos caminhos)
+            arquivos: Conteúdo por caminho relativo
+            diretorios: Diretórios vazios previstos pela estrutura do projeto
+            entradas: Hash das entradas de todos os arquivos do projeto (incluindo os não regerados)
+        """
+
+    def descrever(self, nome_projeto: str, resultado: Any) -> str:
+        """Resumo textual do resultado, devolvido pela ferramenta ao agente"""
+        return f"Projeto {nome_projeto} gerado ({self.nome}): {len(resultado)} bytes"
+
+
+class SaidaDisco(SaidaProjeto):
+    """Projeto em disco, com arquivos deduplicados pelo armazém de artefatos"""
+
+    nome = "disco"
+
+    def __init__(self, raiz: Path = Path("output"), armazem: Optional[ArmazemArtefatos] = None):
+        self.raiz = Path(raiz)
+        self.armazem = armazem
+
+    def planejar(self, nome_projeto: str, entradas: Dict[str, str]) -> Dict[str, List[str]]:
+        return (self.armazem or obter_armazem_artefatos()).planejar(self.raiz / nome_projeto, entradas)
+
+    def emitir(self, nome_projeto: str, arquivos: Dict[str, str], diretorios: Iterable[str] = (),
+               entradas: Optional[Dict[str, str]] = None) -> str:
+        projeto = self.raiz / nome_projeto
+        (self.armazem or obter_armazem_artefatos()).gravar_projeto(projeto, arquivos, entradas)
+        for diretorio in diretorios:
+            (projeto / diretorio).mkdir(parents=True, exist_ok=True)
+        return str(projeto.absolute())
+
+    def descrever(self, nome_projeto: str, resultado: str) -> str:
+        return resultado
+
+
+class SaidaMemoria(SaidaProjeto):
+    """Sistema de arquivos virtual: {"<projeto>/<caminho>": bytes}"""
+
+    nome = "memoria"
+
+    def emitir(self, nome_projeto: str, arquivos: Dict[str, str], diretorios: Iterable[str] = (),
+               entradas: Optional[Dict[str, str]] = None) -> Dict[str, bytes]:
+        return {f"{nome_projeto}/{relativo}": conteudo.encode("utf-8") for relativo, conteudo in arquivos.items()}
+
+    def descrever(self, nome_projeto: str, resultado: Dict[str, bytes]) -> str:
+        total = sum(len(dados) for dados in resultado.values())
+        return f"Projeto {nome_projeto} gerado em memória: {len(resultado)} arquivos ({total} bytes)"
+
+
+class SaidaArquivoCompactado(SaidaProjeto):
+    """Projeto num único arquivo compactado (bytes), salvo como artefato pela ferramenta do agente"""
+
+    extensao = ""
+    tipo_mime = ""
+
+    def nome_arquivo(self, nome_projeto: str) -> str:
+        return f"{nome_projeto}{self.extensao}"
+
+
+class SaidaTar(SaidaArquivoCompactado):
+    """Arquivo .tar.gz montado em memória"""
+
+    nome = "tar"
+    extensao = ".tar.gz"
+    tipo_mime = "application/gzip"
+
+    def emitir(self, nome_projeto: str, arquivos: Dict[str, str], diretorios: Iterable[str] = (),
+               entradas: Optional[Dict[str, str]] = None) -> bytes:
+        buffer = io.BytesIO()
+        agora = int(time.time())
+        with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+            for diretorio in diretorios:
+                info = tarfile.TarInfo(f"{nome_projeto}/{diretorio}")
+                info.type, info.mode, info.mtime = tarfile.DIRTYPE, 0o755, agora
+                tar.addfile(info)
+            for relativo, conteudo in arquivos.items():
+                dados = conteudo.encode("utf-8")
+                info = tarfile.TarInfo(f"{nome_projeto}/{relativo}")
+                info.size, info.mode, info.mtime = len(dados), 0o644, agora
+                tar.addfile(info, io.BytesIO(dados))
+        return buffer.getvalue()
+
+
+class SaidaZip(SaidaArquivoCompactado):
+    """Arquivo .zip montado em memória"""
+
+    nome = "zip"
+    extensao = ".zip"
+    tipo_mime = "application/zip"
+
+    def emitir(self, nome_projeto: str, arquivos: Dict[str, str], diretorios: Iterable[str] = (),
+               entradas: Optional[Dict[str, str]] = None) -> bytes:
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as arquivo_zip:
+            for diretorio in diretorios:
+                arquivo_zip.writestr(f"{nome_projeto}/{diretorio}/", b"")
+            for relativo, conteudo in arquivos.items():
+                arquivo_zip.writestr(f"{nome_projeto}/{relativo}", conteudo)
+        return buffer.getvalue()
+
+
+BACKENDS_SAIDA = {
+    "disco": SaidaDisco,
+    "memoria": SaidaMemoria,
+    "tar": SaidaTar,
+    "zip": SaidaZip,
+}
+
+
+def obter_saida_projeto(nome: Optional[str] = None) -> SaidaProjeto:
+    """Instancia o backend de saída pelo nome (padrão: MASS_DAS_SAIDA)"""
+    nome = (nome or BACKEND_SAIDA).lower()
+    if nome not in BACKENDS_SAIDA:
+        raise ValueError(f"Backend de saída desconhecido: {nome} (opções: {', '.join(BACKENDS_SAIDA)})")
+    return BACKENDS_SAIDA[nome]()
+
+
+def descrever_plano(plano: Dict[str, List[str]]) -> str:
+    """Resumo de uma regeneração: arquivos gerados, inalterados e preservados"""
+    partes = [f"{len(plano['gerar'])} arquivo(s) gerado(s)", f"{len(plano['inalterados'])} inalterado(s)"]
+    if plano["modificados"]:
+        partes.append(f"preservados por edição manual: {', '.join(plano['modificados'])}")
+    return "; ".join(partes)
@@ -0,0 +1,217 @@
+"""
+Snapshot offline do repositório adk-samples.
+
+Constrói, a partir de um clone local ou tarball do adk-samples, um índice
+compacto em disco com os mesmos dados que o crawl ao vivo produz (nomes,
+arquivos, README, tecnologias inferidas e padrões de arquitetura). A
+ferramenta `consultar_samples_adk_github` responde a partir desse índice
+sem acesso à rede; o índice só é lido do disco na primeira consulta.
+
+Uso:
+    python -m mass_das.snapshot_samples <clone_ou_tarball> [indice.json]
+"""
+import os
+import sys
+import json
+import tarfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from .ranking import IndiceSamples
+
+
+VERSAO_INDICE = 1
+
+# Diretórios de samples explorados (mesmos do crawl ao vivo)
+DIRETORIOS_AGENTS = ["python/agents", "java/agents"]
+
+# Caminho do índice usado pela ferramenta (configurável via ambiente)
+CAMINHO_SNAPSHOT = os.getenv("ADK_SAMPLES_SNAPSHOT", "")
+FALLBACK_AO_VIVO = os.getenv("ADK_SAMPLES_FALLBACK_AO_VIVO", "true").lower() == "true"
+
+
+class _FonteDiretorio:
+    """Lê a estrutura de um clone local"""
+
+    def __init__(self, raiz: Path):
+        self.raiz = raiz
+
+    def listar(self, caminho: str) -> List[Tuple[str, str]]:
+        diretorio = self.raiz / caminho
+        if not diretorio.is_dir():
+            return []
+        return sorted(
+            (entrada.name, "dir" if entrada.is_dir() else "file")
+            for entrada in os.scandir(diretorio)
+        )
+
+    def ler(self, caminho: str) -> bytes:
+        return (self.raiz / caminho).read_bytes()
+
+
+class _FonteTarball:
+    """Lê a estrutura de um tarball (ex: archive do GitHub com diretório raiz)"""
+
+    def __init__(self, arquivo: Path):
+        self._tar = tarfile.open(arquivo, "r:*")
+        self._membros = {}
+        self._filhos: Dict[str, Dict[str, str]] = {}
+
+        nomes = [m.name.strip("/") for m in self._tar.getmembers()]
+        prefixo = _prefixo_comum(nomes)
+
+        for membro in self._tar.getmembers():
+            caminho = membro.name.strip("/")[len(prefixo):]
+            if not caminho:
+                continue
+            self._membros[caminho] = membro
+            tipo = "dir" if membro.isdir() else "file"
+            pai, _, nome = caminho.rpartition("/")
+            self._filhos.setdefault(pai, {})[nome] = tipo
+            # Garantir que diretórios implícitos também apareçam na listagem
+            while pai:
+                avo, _, nome_pai = pai.rpartition("/")
+                self._filhos.setdefault(avo, {}).setdefault(nome_pai, "dir")
+                pai = avo
+
+    def listar(self, caminho: str) -> List[Tuple[str, str]]:
+        return sorted(self._filhos.get(caminho.strip("/"), {}).items())
+
+    def ler(self, caminho: str) -> bytes:
+        return self._tar.extractfile(self._membros[caminho]).read()
+
+
+def _prefixo_comum(nomes: List[str]) -> str:
+    """Detecta o diretório raiz único de um archive (ex: 'adk-samples-main/')"""
+    raizes = {nome.split("/", 1)[0] for nome in nomes if nome}
+    if len(raizes) == 1:
+        raiz = raizes.pop()
+        if raiz not in ("python", "java"):
+            return raiz + "/"
+    return ""
+
+
+def _abrir_fonte(origem: Path):
+    if origem.is_dir():
+        return _FonteDiretorio(origem)
+    if tarfile.is_tarfile(origem):
+        return _FonteTarball(origem)
+    raise ValueError(f"Origem inválida para snapshot (esperado diretório ou tarball): {origem}")
+
+
+def construir_snapshot(origem: Path, destino: Path) -> Dict:
+    """
+    Constrói o índice offline do adk-samples.
+
+    Args:
+        origem: Clone local ou tarball do repositório adk-samples
+        destino: Caminho do arquivo de índice a ser gerado
+
+    Returns:
+        dict: Resumo do índice gerado
+    """
+    # Import tardio: tools importa este módulo para consultar o snapshot
+    from .tools import inferir_tecnologias, extrair_padroes_arquitetura
+
+    fonte = _abrir_fonte(Path(origem))
+    samples = []
+
+    for diretorio in DIRETORIOS_AGENTS:
+        for nome, tipo in fonte.listar(diretorio):
+            if tipo != "dir":
+                continue
+
+            sample_path = f"{diretorio}/{nome}"
+            agent_info = {
+                "arquivos": [],
+                "readme_conteudo": "",
+                "estrutura": "",
+                "tecnologias": [],
+            }
+            for nome_arquivo, tipo_arquivo in fonte.listar(sample_path):
+                if tipo_arquivo == "file":
+                    agent_info["arquivos"].append(nome_arquivo)
+                    if nome_arquivo.lower().startswith("readme"):
+                        readme = fonte.ler(f"{sample_path}/{nome_arquivo}")
+                        agent_info["readme_conteudo"] = readme.decode("utf-8", errors="replace")[:500]
+                else:
+                    agent_info["estrutura"] += f"{nome_arquivo}/ "
+
+            agent_info["tecnologias"] = inferir_tecnologias(agent_info["arquivos"])
+            agent_info["nome"] = nome
+            agent_info["linguagem"] = diretorio.split("/")[0]
+            samples.append(agent_info)
+
+    indice = {
+        "versao": VERSAO_INDICE,
+        "origem": str(origem),
+        "gerado_em": time.time(),
+        "total_samples": len(samples),
+        "samples": samples,
+        "padroes": extrair_padroes_arquitetura(samples),
+    }
+
+    destino = Path(destino)
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    temporario = destino.with_suffix(destino.suffix + ".tmp")
+    temporario.write_text(json.dumps(indice, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(temporario, destino)
+
+    return {"caminho": str(destino.absolute()), "total_samples": len(samples)}
+
+
+class SnapshotSamples:
+    """Índice offline carregado sob demanda"""
+
+    def __init__(self, caminho: Path):
+        self.caminho = Path(caminho)
+        self._dados: Optional[Dict] = None
+        self._indice: Optional[IndiceSamples] = None
+
+    def _carregar(self) -> Dict:
+        if self._dados is None:
+            dados = json.loads(self.caminho.read_bytes())
+            if dados.get("versao") != VERSAO_INDICE:
+                raise ValueError(f"Versão de índice não suportada: {dados.get('versao')}")
+            dados["padroes_por_sample"] = {
+                f"{p['linguagem']}/{p['nome']}": p for p in dados["padroes"]
+            }
+            self._dados = dados
+        return self._dados
+
+    def samples(self) -> List[Dict]:
+        """Samples indexados (não devem ser modificados pelo chamador)"""
+        return self._carregar()["samples"]
+
+    def indice(self) -> IndiceSamples:
+        """Índice de ranking dos samples, construído uma única vez"""
+        if self._indice is None:
+            self._indice = IndiceSamples(self.samples())
+        return self._indice
+
+    def padroes_por_sample(self) -> Dict[str, Dict]:
+        """Padrões de arquitetura pré-calculados, indexados por 'linguagem/nome'"""
+        return self._carregar()["padroes_por_sample"]
+
+
+_snapshot: Optional[SnapshotSamples] = None
+
+
+def obter_snapshot_samples() -> Optional[SnapshotSamples]:
+    """Retorna o snapshot configurado em ADK_SAMPLES_SNAPSHOT (sem lê-lo ainda), se existir"""
+    global _snapshot
+    if _snapshot is None and CAMINHO_SNAPSHOT and Path(CAMINHO_SNAPSHOT).is_file():
+        _snapshot = SnapshotSamples(Path(CAMINHO_SNAPSHOT))
+    return _snapshot
+
+
+if __name__ == "__main__":
+    from .logs import configurar_logging
+
+    configurar_logging()
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    destino_indice = Path(sys.argv[2]) if len(sys.argv) > 2 else Path("adk_samples_snapshot.json")
+    resumo = construir_snapshot(Path(sys.argv[1]), destino_indice)
+    print(f"✅ Snapshot gerado: {resumo['caminho']} ({resumo['total_samples']} samples)")
@@ -1,20 +1,27 @@
 """
 Sub-agentes especializados do MASS-DAS v1.0.0
+
+Os agentes `*_agent` são criados no primeiro acesso (no modo LLM), não na
+importação: o pipeline monta as próprias instâncias e não paga pelas demais.
 """
-from .analista import root_agent as analista_agent
-from .arquiteto import root_agent as arquiteto_agent
-from .especialista_prompts import root_agent as especialista_prompts_agent
-from .definidor_ferramentas import root_agent as definidor_ferramentas_agent
-from .compilador import root_agent as compilador_agent
-from .otimizador import root_agent as otimizador_agent
-from .gerador_codigo import gerador_codigo_agent
+from importlib import import_module
+
+_MODULOS = {
+    "analista_agent": "analista",
+    "arquiteto_agent": "arquiteto",
+    "especialista_prompts_agent": "especialista_prompts",
+    "definidor_ferramentas_agent": "definidor_ferramentas",
+    "compilador_agent": "compilador",
+    "otimizador_agent": "otimizador",
+    "gerador_codigo_agent": "gerador_codigo",
+}
+
+__all__ = list(_MODULOS)
+
 
-__all__ = [
-    "analista_agent",
-    "arquiteto_agent", 
-    "especialista_prompts_agent",
-    "definidor_ferramentas_agent",
-    "compilador_agent",
-    "otimizador_agent",
-    "gerador_codigo_agent"
-] 
\ No newline at end of file
+def __getattr__(nome: str):
+    if nome not in _MODULOS:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    agente = import_module(f".{_MODULOS[nome]}", __name__).criar_agente()
+    globals()[nome] = agente
+    return agente
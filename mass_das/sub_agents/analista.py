@@ -1,12 +1,11 @@
 """
 Agente Analista de Requisitos do MASS-DAS
 """
-import os
 from google.adk.agents import Agent
 from ..prompts import ANALISTA_PROMPT
+from .fabrica import criar_agente_llm
 
-root_agent = Agent(
-    model=os.getenv("ANALISTA_MODEL", "gemini-2.5-pro-preview-06-05"),
-    name="analista_requisitos",
-    instruction=ANALISTA_PROMPT,
-) 
\ No newline at end of file
+
+def criar_agente(projetar_estado: bool = False, pipeline: bool = False) -> Agent:
+    """Nova instância do agente (ver fabrica.criar_agente_llm)"""
+    return criar_agente_llm("analista_requisitos", ANALISTA_PROMPT, projetar_estado, pipeline)
@@ -1,12 +1,11 @@
 """
 Agente Arquiteto Coordenador do MASS-DAS
 """
-import os
 from google.adk.agents import Agent
 from ..prompts import ARQUITETO_PROMPT
+from .fabrica import criar_agente_llm
 
-root_agent = Agent(
-    model=os.getenv("ARQUITETO_MODEL", "gemini-2.5-pro-preview-06-05"),
-    name="arquiteto_coordenador",
-    instruction=ARQUITETO_PROMPT,
-) 
\ No newline at end of file
+
+def criar_agente(projetar_estado: bool = False, pipeline: bool = False) -> Agent:
+    """Nova instância do agente (ver fabrica.criar_agente_llm)"""
+    return criar_agente_llm("arquiteto_coordenador", ARQUITETO_PROMPT, projetar_estado, pipeline)
@@ -1,12 +1,11 @@
 """
 Agente Compilador de Documentação do MASS-DAS
 """
-import os
 from google.adk.agents import Agent
 from ..prompts import COMPILADOR_PROMPT
+from .fabrica import criar_agente_llm
 
-root_agent = Agent(
-    model=os.getenv("COMPILADOR_MODEL", "gemini-2.5-pro-preview-06-05"),
-    name="compilador_documentacao",
-    instruction=COMPILADOR_PROMPT,
-) 
\ No newline at end of file
+
+def criar_agente(projetar_estado: bool = False, pipeline: bool = False) -> Agent:
+    """Nova instância do agente (ver fabrica.criar_agente_llm)"""
+    return criar_agente_llm("compilador_documentacao", COMPILADOR_PROMPT, projetar_estado, pipeline)
@@ -1,12 +1,11 @@
 """
 Agente Definidor de Ferramentas do MASS-DAS
 """
-import os
 from google.adk.agents import Agent
 from ..prompts import DEFINIDOR_FERRAMENTAS_PROMPT
+from .fabrica import criar_agente_llm
 
-root_agent = Agent(
-    model=os.getenv("DEFINIDOR_MODEL", "gemini-2.5-pro-preview-06-05"),
-    name="definidor_ferramentas",
-    instruction=DEFINIDOR_FERRAMENTAS_PROMPT,
-) 
\ No newline at end of file
+
+def criar_agente(projetar_estado: bool = False, pipeline: bool = False) -> Agent:
+    """Nova instância do agente (ver fabrica.criar_agente_llm)"""
+    return criar_agente_llm("definidor_ferramentas", DEFINIDOR_FERRAMENTAS_PROMPT, projetar_estado, pipeline)
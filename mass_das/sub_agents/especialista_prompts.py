@@ -1,12 +1,11 @@
 """
 Agente Especialista em Prompts do MASS-DAS
 """
-import os
 from google.adk.agents import Agent
 from ..prompts import ESPECIALISTA_PROMPTS_PROMPT
+from .fabrica import criar_agente_llm
 
-root_agent = Agent(
-    model=os.getenv("ESPECIALISTA_MODEL", "gemini-2.5-pro-preview-06-05"),
-    name="especialista_prompts",
-    instruction=ESPECIALISTA_PROMPTS_PROMPT,
-) 
\ No newline at end of file
+
+def criar_agente(projetar_estado: bool = False, pipeline: bool = False) -> Agent:
+    """Nova instância do agente (ver fabrica.criar_agente_llm)"""
+    return criar_agente_llm("especialista_prompts", ESPECIALISTA_PROMPTS_PROMPT, projetar_estado, pipeline)
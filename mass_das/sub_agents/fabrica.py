@@ -0,0 +1,39 @@
+"""
+Construção comum dos agentes LLM do MASS-DAS
+"""
+from typing import Any, Optional
+from google.adk.agents import Agent
+from ..prompts import CONTRATOS_ESTADO
+from ..callbacks import callbacks_rastreamento
+from ..projecao import instrucao_projetada, substituir_abertura_do_turno
+from ..roteador import modelo_do_agente
+
+
+def criar_agente_llm(nome: str, instrucao: str, projetar_estado: bool = False, pipeline: bool = False,
+                     output_key: Optional[str] = None, **kwargs: Any) -> Agent:
+    """
+    Nova instância de um agente LLM (no ADK cada agente tem um único pai).
+
+    O modelo vem da política de roteamento (mass_das.roteador). No pipeline o
+    output_key vem, por padrão, do contrato de estado do agente; no modo LLM o
+    agente é o mesmo de antes do pipeline, sem gravar no estado. Com
+    `projetar_estado` o agente vê só as chaves do estado que lê, sem o
+    histórico da conversa (ver mass_das.projecao).
+
+    Args:
+        nome: Nome do agente (chave em CONTRATOS_ESTADO e na política)
+        instrucao: Prompt do agente
+        projetar_estado: Usar a projeção do estado (modo pipeline)
+        pipeline: Agente montado como etapa do pipeline (mass_das.agendador)
+        output_key: Chave do estado gravada com a resposta
+        **kwargs: Demais campos do Agent (ex: tools)
+    """
+    return Agent(
+        model=modelo_do_agente(nome),
+        name=nome,
+        instruction=instrucao_projetada(instrucao, nome) if projetar_estado else instrucao,
+        include_contents="none" if projetar_estado else "default",
+        output_key=output_key or (CONTRATOS_ESTADO[nome][1] if pipeline else None),
+        **callbacks_rastreamento(before_model_callback=[substituir_abertura_do_turno] if projetar_estado else []),
+        **kwargs,
+    )
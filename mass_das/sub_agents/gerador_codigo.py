@@ -6,11 +6,10 @@ seguindo os padrões oficiais do Google ADK e samples de referência.
 """
 
 from google.adk.agents import LlmAgent
+from ..tools import gerar_codigo_agentes
+from .fabrica import criar_agente_llm
 
-gerador_codigo_agent = LlmAgent(
-    model="gemini-2.5-pro-preview-06-05",
-    name="gerador_codigo",
-    instruction="""
+GERADOR_CODIGO_PROMPT = """
 # Persona
 Você é um Engenheiro de Software Sênior especializado no Google Agent Development Kit (ADK) 
 e desenvolvimento Python. Você domina os padrões arquiteturais do ADK e tem expertise em 
@@ -98,4 +97,10 @@ Sua saída deve ser um JSON contendo:
 - Configurações flexíveis via ambiente (.env)
 - README com instruções claras e completas
 """
-) 
\ No newline at end of file
+
+
+def criar_agente(projetar_estado: bool = False, pipeline: bool = False) -> LlmAgent:
+    """Nova instância do agente (ver fabrica.criar_agente_llm)"""
+    # No modo LLM a ferramenta fica com o coordenador, como antes do pipeline
+    ferramentas = {"tools": [gerar_codigo_agentes]} if pipeline else {}
+    return criar_agente_llm("gerador_codigo", GERADOR_CODIGO_PROMPT, projetar_estado, pipeline, **ferramentas)
@@ -1,12 +1,11 @@
 """
 Agente Otimizador de Arquitetura do MASS-DAS
 """
-import os
 from google.adk.agents import Agent
 from ..prompts import OTIMIZADOR_PROMPT
+from .fabrica import criar_agente_llm
 
-root_agent = Agent(
-    model=os.getenv("OTIMIZADOR_MODEL", "gemini-2.5-pro-preview-06-05"),
-    name="otimizador_arquitetura",
-    instruction=OTIMIZADOR_PROMPT,
-) 
\ No newline at end of file
+
+def criar_agente(projetar_estado: bool = False, pipeline: bool = False) -> Agent:
+    """Nova instância do agente (ver fabrica.criar_agente_llm)"""
+    return criar_agente_llm("otimizador_arquitetura", OTIMIZADOR_PROMPT, projetar_estado, pipeline)
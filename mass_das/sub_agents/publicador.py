@@ -0,0 +1,67 @@
+"""
+Publicador do Documento do MASS-DAS
+
+Etapa determinística (sem LLM) do modo pipeline: junta o rascunho do compilador
+às sugestões do otimizador e salva o documento final com `salvar_markdown`,
+papel que no modo coordenado cabe ao agente principal.
+"""
+import os
+import re
+import json
+from typing import Any, AsyncGenerator, List
+from google.adk.agents import BaseAgent, InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+from ..prompts import CONTRATOS_ESTADO
+from ..callbacks import antes_do_agente, depois_do_agente
+from ..tools import salvar_markdown
+
+NOME = "publicador_documento"
+ARQUIVO_DOCUMENTO = os.getenv("MASS_DAS_DOCUMENTO", "ARQUITETURA.md")
+
+_CERCA = re.compile(r"^```\w*\s*|\s*```$")
+_MARCADOR = re.compile(r"^\s*(?:[-*]|\d+[.)])\s*")
+
+
+def extrair_sugestoes(valor: Any) -> List[str]:
+    """Sugestões do otimizador: lista JSON (com ou sem cerca de código) ou itens de lista em texto"""
+    if isinstance(valor, list):
+        return [str(item) for item in valor]
+    texto = _CERCA.sub("", str(valor or "").strip())
+    try:
+        dados = json.loads(texto)
+    except ValueError:
+        return [_MARCADOR.sub("", linha) for linha in texto.splitlines() if _MARCADOR.match(linha)]
+    if isinstance(dados, dict):
+        dados = next((item for item in dados.values() if isinstance(item, list)), [])
+    return [item if isinstance(item, str) else json.dumps(item, ensure_ascii=False) for item in dados]
+
+
+class PublicadorDocumento(BaseAgent):
+    """Salva o documento final a partir do estado da sessão, sem chamar o modelo"""
+
+    nome_arquivo: str = ARQUIVO_DOCUMENTO
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        le, escreve = CONTRATOS_ESTADO[NOME]
+        rascunho, sugestoes = (ctx.session.state.get(chave) for chave in le)
+        caminho = await salvar_markdown(
+            self.nome_arquivo, str(rascunho or ""), extrair_sugestoes(sugestoes), tool_context=None,
+        )
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=f"Documento salvo: {caminho}")]),
+            actions=EventActions(state_delta={escreve: caminho}),
+        )
+
+
+def criar_agente() -> PublicadorDocumento:
+    """Nova instância do agente (no ADK cada agente tem um único pai)"""
+    return PublicadorDocumento(
+        name=NOME,
+        description="Salva o documento de arquitetura final",
+        before_agent_callback=antes_do_agente,
+        after_agent_callback=depois_do_agente,
+    )
@@ -0,0 +1,165 @@
+"""
+Motor de templates pré-compilados do gerador de código.
+
+Cada template é analisado uma única vez por processo e convertido numa função
+Python (`compile`), guardada em cache; renderizar é só chamar a função com o
+contexto. Sintaxe mínima:
+
+    {{ nome }} / {{ item.campo }}      valor do contexto (campos de dicts)
+    {% for item in lista %} ... {% endfor %}
+    {% if valor %} ... {% else %} ... {% endif %}
+
+Uma tag de bloco sozinha na linha remove a linha inteira da saída. `{{` que
+não envolve um nome simples (ex: `[{{ name = "x" }}]`) é mantido literal.
+"""
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Tuple
+
+
+_TAG_LINHA = re.compile(r"^[ \t]*(\{%[^%]*%\})[ \t]*\n", re.MULTILINE)
+_TOKEN = re.compile(r"\{\{\s*([A-Za-z_][\w.]*)\s*\}\}|\{%\s*(.*?)\s*%\}")
+_FOR = re.compile(r"for\s+([A-Za-z_]\w*)\s+in\s+([A-Za-z_][\w.]*)$")
+_IF = re.compile(r"if\s+([A-Za-z_][\w.]*)$")
+
+
+class ErroTemplate(ValueError):
+    """Template com sintaxe inválida"""
+
+
+_ESCAPES = str.maketrans({"\\": "\\\\", "'": "\\'", "\n": "\\n", "\r": "\\r", "\t": "\\t", "{": "{{", "}": "}}"})
+
+
+def _fstring(partes: List[Tuple[str, str]]) -> str:
+    """Literais e variáveis consecutivos viram uma única f-string"""
+    corpo = "".join(
+        valor.translate(_ESCAPES) if tipo == "texto" else "{" + valor + "}"
+        for tipo, valor in partes
+    )
+    return f"f'{corpo}'"
+
+
+def _expressao(nome: str, locais: List[str]) -> str:
+    primeiro, *campos = nome.split(".")
+    codigo = f"_l_{primeiro}" if primeiro in locais else f'contexto["{primeiro}"]'
+    return codigo + "".join(f'["{campo}"]' for campo in campos)
+
+
+def _juntar(segmentos: List[str]) -> str:
+    if not segmentos:
+        return "''"
+    if len(segmentos) == 1:
+        return segmentos[0]
+    return f"''.join(({', '.join(segmentos)},))"
+
+
+def _gerar_codigo(tokens: Iterator, locais: List[str], fim: Tuple[str, ...]) -> Tuple[str, str]:
+    """Converte tokens em uma expressão Python até encontrar uma das tags de `fim`"""
+    segmentos: List[str] = []
+    partes: List[Tuple[str, str]] = []
+
+    def fechar_fstring():
+        if partes:
+            segmentos.append(_fstring(partes))
+            partes.clear()
+
+    for tipo, valor in tokens:
+        if tipo == "texto":
+            if valor:
+                partes.append(("texto", valor))
+        elif tipo == "variavel":
+            partes.append(("expressao", _expressao(valor, locais)))
+        elif (laco := _FOR.match(valor)):
+            fechar_fstring()
+            corpo, tag = _gerar_codigo(tokens, locais + [laco[1]], ("endfor",))
+            segmentos.append(f"''.join([{corpo} for _l_{laco[1]} in {_expressao(laco[2], locais)}])")
+        elif (condicao := _IF.match(valor)):
+            fechar_fstring()
+            entao, tag = _gerar_codigo(tokens, locais, ("else", "endif"))
+            senao = "''"
+            if tag == "else":
+                senao, _ = _gerar_codigo(tokens, locais, ("endif",))
+            segmentos.append(f"({entao} if {_expressao(condicao[1], locais)} else {senao})")
+        elif valor in fim:
+            fechar_fstring()
+            return _juntar(segmentos), valor
+        else:
+            raise ErroTemplate(f"Tag inválida ou fora de lugar: {{% {valor} %}}")
+
+    if fim:
+        raise ErroTemplate(f"Bloco não fechado: esperado {{% {fim[-1]} %}}")
+    fechar_fstring()
+    return _juntar(segmentos), ""
+
+
+def _tokenizar(fonte: str) -> Iterator[Tuple[str, str]]:
+    posicao = 0
+    for token in _TOKEN.finditer(fonte):
+        yield "texto", fonte[posicao:token.start()]
+        posicao = token.end()
+        variavel, bloco = token.groups()
+        yield ("variavel", variavel) if variavel is not None else ("bloco", bloco)
+    yield "texto", fonte[posicao:]
+
+
+@lru_cache(maxsize=None)
+def compilar_template(fonte: str) -> Callable[[Dict[str, Any]], str]:
+    """
+    Compila o template numa função contexto -> texto (cacheada por fonte).
+
+    O template inteiro vira uma única expressão Python: f-strings para texto e
+    variáveis, `"".join([...])` para laços e expressões condicionais para `if`.
+    """
+    expressao, _ = _gerar_codigo(_tokenizar(_TAG_LINHA.sub(r"\1", fonte)), [], ())
+    escopo: Dict[str, Any] = {}
+    exec(compile(f"def _renderizar(contexto):\n return {expressao}\n", "<template>", "exec"), escopo)
+    return escopo["_renderizar"]
+
+
+@lru_cache(maxsize=None)
+def compilar_conjunto(templates: Tuple[Tuple[str, str], ...]) -> Callable[[Dict[str, Any]], Dict[str, str]]:
+    """
+    Compila pares (template do caminho, template do conteúdo) numa única
+    função contexto -> {caminho: conteúdo}: um projeto inteiro por chamada.
+    """
+    itens = []
+    for caminho, conteudo in templates:
+        expressao_caminho, _ = _gerar_codigo(_tokenizar(caminho), [], ())
+        expressao_conteudo, _ = _gerar_codigo(_tokenizar(_TAG_LINHA.sub(r"\1", conteudo)), [], ())
+        itens.append(f" {expressao_caminho}: {expressao_conteudo},")
+    escopo: Dict[str, Any] = {}
+    codigo = "def _renderizar(contexto):\n return {\n" + "\n".join(itens) + "\n }\n"
+    exec(compile(codigo, "<templates>", "exec"), escopo)
+    return escopo["_renderizar"]
+
+
+@lru_cache(maxsize=None)
+def variaveis_template(fonte: str) -> FrozenSet[str]:
+    """Chaves de primeiro nível do contexto lidas pelo template (dependências)"""
+    usadas = set()
+    locais: List[str] = []
+    for tipo, valor in _tokenizar(fonte):
+        if tipo == "texto":
+            continue
+        if tipo == "bloco":
+            if (laco := _FOR.match(valor)):
+                nome = laco[2]
+                locais.append(laco[1])
+            elif valor == "endfor":
+                locais.pop()
+                continue
+            elif (condicao := _IF.match(valor)):
+                nome = condicao[1]
+            else:
+                continue
+        else:
+            nome = valor
+        primeiro = nome.split(".", 1)[0]
+        if primeiro not in locais:
+            usadas.add(primeiro)
+    return frozenset(usadas)
+
+
+def renderizar(fonte: str, contexto: Dict[str, Any]) -> str:
+    """Renderiza o template com o contexto informado"""
+    return compilar_template(fonte)(contexto)
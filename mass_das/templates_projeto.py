@@ -0,0 +1,630 @@
+"""
+Templates dos arquivos dos projetos gerados por `gerar_codigo_agentes`.
+
+Os templates são compilados uma vez por processo (mass_das.templates) e
+renderizados com um único contexto por projeto, montado por
+`contexto_projeto`: valores derivados (nome do módulo, título, assinaturas
+das ferramentas...) são calculados uma vez, não a cada arquivo.
+
+Altere VERSAO_TEMPLATES sempre que o conteúdo de um template mudar.
+
+Microbenchmark (projetos gerados por segundo):
+    python -m mass_das.templates_projeto
+"""
+import json
+import hashlib
+from functools import lru_cache
+from typing import Any, Collection, Dict, List, Optional, Tuple
+from .templates import compilar_conjunto, renderizar, variaveis_template
+
+
+VERSAO_TEMPLATES = "1"
+
+
+TEMPLATE_PYPROJECT = '''[project]
+name = "{{ nome_projeto }}"
+version = "0.1.0"
+description = "Agent system generated by MASS-DAS"
+authors = [{ name = "MASS-DAS", email = "generated@mass-das.ai" }]
+license = "Apache-2.0"
+readme = "README.md"
+requires-python = ">=3.9"
+dependencies = [
+    "google-adk>=1.2.1",
+    "python-dotenv>=1.1.0",
+    "pydantic>=2.0.0",
+    "asyncio-mqtt>=0.16.1",
+]
+
+[build-system]
+requires = ["setuptools>=61.0", "wheel"]
+build-backend = "setuptools.build_meta"
+
+[tool.setuptools.packages.find]
+include = ["{{ modulo_nome }}*"]
+'''
+
+TEMPLATE_AGENT = '''"""
+Agent principal gerado pelo MASS-DAS
+Baseado no padrão: {{ padrao }}
+Agentes especializados: {{ agentes_total }}
+"""
+
+from google.adk.agents import Agent
+from .prompts import INSTRUCTION
+from .config import Config
+from .tools.tools import (
+{% for ferramenta in ferramentas %}
+    {{ ferramenta.nome }},
+{% endfor %}
+)
+
+configs = Config()
+
+root_agent = Agent(
+    model=configs.agent_settings.model,
+    name=configs.agent_settings.name,
+    instruction=INSTRUCTION,
+    tools=[
+{% for ferramenta in ferramentas %}
+        {{ ferramenta.nome }},
+{% endfor %}
+    ],
+)
+
+# Sub-agentes especializados baseados na arquitetura
+{% if multi_agente %}
+
+# Sub-agentes especializados
+{% for agente in agentes %}
+
+{{ agente.nome_var }}_agent = Agent(
+    model=configs.agent_settings.model,
+    name="{{ agente.nome_var }}",
+    instruction="""{{ agente.responsabilidade }}""",
+)
+{% endfor %}
+{% endif %}
+'''
+
+TEMPLATE_PROMPTS = '''"""
+System prompts gerados pelo MASS-DAS
+Baseados na arquitetura projetada e otimizados para performance
+"""
+
+# Prompt principal do sistema
+INSTRUCTION = """
+Você é um sistema inteligente gerado pelo MASS-DAS.
+Sua arquitetura foi projetada automaticamente para resolver problemas específicos
+com alta eficiência e qualidade.
+
+Execute suas tarefas seguindo os princípios de design multi-agente:
+1. Foque na sua responsabilidade específica
+2. Use as ferramentas disponíveis adequadamente  
+3. Mantenha comunicação clara entre componentes
+4. Otimize performance e qualidade dos resultados
+
+Sempre forneça respostas estruturadas e acionáveis.
+"""
+{% if prompts %}
+
+
+# Prompts especializados dos agentes
+{% for prompt in prompts %}
+
+{{ prompt.nome_var }} = """{{ prompt.texto }}"""
+{% endfor %}
+{% endif %}
+'''
+
+TEMPLATE_TOOLS = '''"""
+Ferramentas personalizadas geradas pelo MASS-DAS
+Implementações baseadas nas especificações da arquitetura
+"""
+
+import os
+import json
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+from pathlib import Path
+
+from google.adk.tools import ToolContext
+from google.adk.agents import Agent
+from google.adk.tools.agent_tool import AgentTool
+from google.adk.tools import google_search
+
+from dotenv import load_dotenv
+
+# Carregar variáveis de ambiente
+load_dotenv()
+
+{% for ferramenta in ferramentas %}
+
+async def {{ ferramenta.nome }}(
+    {{ ferramenta.assinatura }}
+) -> {{ ferramenta.tipo_retorno }}:
+    """
+    {{ ferramenta.descricao }}
+    
+    Args:
+        {{ ferramenta.args_doc }}
+        tool_context: Contexto da ferramenta ADK
+        
+    Returns:
+        {{ ferramenta.tipo_retorno }}: {{ ferramenta.descricao }}
+    """
+    try:
+        # TODO: Implementar lógica específica da ferramenta
+        # Esta é uma implementação base gerada automaticamente
+        
+        print(f"🔧 [DEBUG] Executando {{ ferramenta.nome }}...")
+        
+        # Simular processamento (substituir por implementação real)
+        await asyncio.sleep(0.1)
+        
+        # Retorno padrão baseado no tipo esperado
+        {{ ferramenta.retorno_padrao }}
+        
+    except Exception as e:
+        error_msg = f"Erro em {{ ferramenta.nome }}: {str(e)}"
+        print(f"❌ [DEBUG] {error_msg}")
+        return error_msg if return_type == "str" else {"erro": error_msg}
+
+{% endfor %}
+
+# Ferramentas auxiliares padrão
+
+def get_current_timestamp() -> Dict[str, str]:
+    """Obtém timestamp atual"""
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "date": datetime.now().strftime("%Y-%m-%d"),
+        "time": datetime.now().strftime("%H:%M:%S")
+    }
+
+# Agente de busca (se necessário)
+search_agent = Agent(
+    model="gemini-2.5-pro-preview-06-05",
+    name="search_specialist",
+    instruction="Você é um especialista em pesquisa e busca de informações.",
+    tools=[google_search],
+)
+
+search_tool = AgentTool(search_agent)
+'''
+
+TEMPLATE_CONFIG = '''"""
+Configurações do projeto {{ nome_projeto }}
+Gerado automaticamente pelo MASS-DAS
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from dotenv import load_dotenv
+
+# Carregar variáveis de ambiente
+load_dotenv()
+
+@dataclass
+class AgentSettings:
+    """Configurações dos agentes"""
+    model: str = os.getenv("AGENT_MODEL", "gemini-2.5-pro-preview-06-05")
+    name: str = os.getenv("AGENT_NAME", "{{ modulo_nome }}_system")
+    temperature: float = float(os.getenv("AGENT_TEMPERATURE", "0.1"))
+    max_tokens: Optional[int] = None
+    
+@dataclass 
+class Config:
+    """Configuração principal do sistema"""
+    agent_settings: AgentSettings = AgentSettings()
+    debug: bool = os.getenv("DEBUG", "false").lower() == "true"
+    environment: str = os.getenv("ENVIRONMENT", "development")
+    
+    # APIs e integrações
+    gemini_api_key: str = os.getenv("GEMINI_API_KEY", "")
+    github_token: str = os.getenv("GITHUB_TOKEN", "")
+    
+    def __post_init__(self):
+        """Validações pós-inicialização"""
+        if not self.gemini_api_key:
+            raise ValueError("GEMINI_API_KEY é obrigatório")
+'''
+
+TEMPLATE_INIT = '''"""
+{{ modulo_nome }} - Sistema gerado pelo MASS-DAS
+"""
+
+from .agent import root_agent
+from .config import Config
+
+__version__ = "0.1.0"
+__all__ = ["root_agent", "Config"]
+'''
+
+TEMPLATE_INIT_TOOLS = '''"""
+Ferramentas do sistema
+"""
+
+from .tools import *
+'''
+
+TEMPLATE_README = '''# {{ titulo }}
+
+Sistema de agentes gerado automaticamente pelo **MASS-DAS v1.0.0**.
+
+## 📋 Visão Geral
+
+- **Padrão Arquitetural:** {{ padrao }}
+- **Agentes Especializados:** {{ agentes_total }}
+- **Framework:** Google ADK v1.0.0+
+- **Modelo:** Gemini 2.5 Pro Preview 06-05
+
+## 🚀 Quick Start
+
+1. **Instalar dependências:**
+   ```bash
+   pip install -e .
+   ```
+
+2. **Configurar ambiente:**
+   ```bash
+   cp .env.example .env
+   # Editar .env com suas chaves de API
+   ```
+
+3. **Executar sistema:**
+   ```bash
+   # CLI interativo
+   adk run {{ modulo_nome }}
+   
+   # Interface web  
+   adk web
+   ```
+
+## 🏗️ Arquitetura
+
+Este sistema foi projetado seguindo os princípios MASS:
+
+- **Decomposição Radical:** Cada agente tem responsabilidade única
+- **Otimização de Topologia:** {{ padrao }} para máxima eficiência
+- **Modularidade:** Componentes reutilizáveis e testáveis
+
+### Agentes Especializados:
+
+{% for agente in agentes %}
+
+{{ agente.indice }}. **{{ agente.nome }}** ({{ agente.tipo }})
+   - {{ agente.responsabilidade }}
+{% endfor %}
+
+
+## 🔧 Configuração
+
+### Variáveis de Ambiente
+
+Crie um arquivo `.env` baseado no `.env.example`:
+
+```bash
+# APIs obrigatórias
+GEMINI_API_KEY=sua_chave_gemini_aqui
+
+# Configurações opcionais
+AGENT_MODEL=gemini-2.5-pro-preview-06-05
+DEBUG=true
+ENVIRONMENT=development
+```
+
+### Obter Chaves de API
+
+- **Gemini API:** https://makersuite.google.com/app/apikey
+- **GitHub Token:** https://github.com/settings/tokens (opcional)
+
+## 📚 Estrutura do Projeto
+
+```
+{{ nome_projeto }}/
+├── {{ modulo_nome }}/          # Módulo principal
+│   ├── agent.py              # Agente principal
+│   ├── prompts.py            # System prompts
+│   ├── config.py             # Configurações
+│   └── tools/                # Ferramentas personalizadas
+├── deployment/               # Arquivos de deploy
+├── tests/                    # Testes automatizados
+└── eval/                     # Avaliação e métricas
+```
+
+## 🧪 Desenvolvimento
+
+### Executar Testes
+
+```bash
+pytest tests/
+```
+
+### Modificar Agentes
+
+1. Edite `prompts.py` para ajustar comportamentos
+2. Adicione ferramentas em `tools/tools.py`
+3. Configure novos parâmetros em `config.py`
+
+### Deploy
+
+```bash
+# Build da imagem
+docker build -t {{ nome_projeto }} .
+
+# Deploy no Google Cloud Run
+gcloud run deploy {{ nome_projeto }} --source .
+```
+
+## 📊 Monitoramento
+
+O sistema inclui logging automático e métricas de performance:
+
+- Logs estruturados para debug
+- Métricas de latência dos agentes
+- Monitoramento de uso de tokens
+- Alertas de erro automáticos
+
+## 🤝 Contribuição
+
+Este código foi gerado automaticamente pelo MASS-DAS. Para modificações:
+
+1. Edite a arquitetura no MASS-DAS
+2. Regenere o código
+3. Implemente lógicas específicas nas ferramentas
+4. Teste e valide
+
+## 📄 Licença
+
+Apache 2.0 - Gerado pelo MASS-DAS v1.0.0
+
+---
+
+*Sistema gerado automaticamente - personalize conforme necessário*
+'''
+
+TEMPLATE_ENV = '''# Configurações do Sistema
+# ========================
+
+# Google Gemini API Key (obrigatório)
+# Obtenha em: https://makersuite.google.com/app/apikey
+GEMINI_API_KEY=sua_chave_gemini_aqui
+
+# Configurações do Agente
+AGENT_MODEL=gemini-2.5-pro-preview-06-05
+AGENT_NAME=generated_system
+AGENT_TEMPERATURE=0.1
+
+# Configurações Gerais
+DEBUG=true
+ENVIRONMENT=development
+
+# APIs Opcionais
+GITHUB_TOKEN=seu_token_github_aqui
+
+# Configurações de Deploy
+PORT=8080
+HOST=0.0.0.0
+'''
+
+TEMPLATE_DOCKERFILE = '''# Dockerfile gerado pelo MASS-DAS
+FROM python:3.11-slim
+
+WORKDIR /app
+
+# Instalar dependências do sistema
+RUN apt-get update && apt-get install -y \\
+    gcc \\
+    && rm -rf /var/lib/apt/lists/*
+
+# Copiar arquivos de dependências
+COPY pyproject.toml ./
+
+# Instalar dependências Python
+RUN pip install --no-cache-dir -e .
+
+# Copiar código da aplicação
+COPY . .
+
+# Expor porta
+EXPOSE 8080
+
+# Comando de execução
+CMD ["adk", "web", "--host", "0.0.0.0", "--port", "8080"]
+'''
+
+TEMPLATE_DOCKER_COMPOSE = '''version: '3.8'
+
+services:
+  {{ modulo_nome }}:
+    build: ..
+    ports:
+      - "8080:8080"
+    environment:
+      - GEMINI_API_KEY=${GEMINI_API_KEY}
+      - ENVIRONMENT=production
+      - DEBUG=false
+    env_file:
+      - ../.env
+    restart: unless-stopped
+    
+  # Adicionar outros serviços conforme necessário
+  # (banco de dados, cache, etc.)
+'''
+
+
+# Caminho relativo (também um template) -> template do conteúdo
+ARQUIVOS_PROJETO: Dict[str, str] = {
+    "pyproject.toml": TEMPLATE_PYPROJECT,
+    "{{ modulo_nome }}/agent.py": TEMPLATE_AGENT,
+    "{{ modulo_nome }}/prompts.py": TEMPLATE_PROMPTS,
+    "{{ modulo_nome }}/tools/tools.py": TEMPLATE_TOOLS,
+    "{{ modulo_nome }}/config.py": TEMPLATE_CONFIG,
+    "{{ modulo_nome }}/__init__.py": TEMPLATE_INIT,
+    "{{ modulo_nome }}/tools/__init__.py": TEMPLATE_INIT_TOOLS,
+    "README.md": TEMPLATE_README,
+    ".env.example": TEMPLATE_ENV,
+    "deployment/Dockerfile": TEMPLATE_DOCKERFILE,
+    "deployment/docker-compose.yml": TEMPLATE_DOCKER_COMPOSE,
+}
+
+# Chave hasheável do conjunto, compilado uma vez por processo
+_CONJUNTO_PROJETO = tuple(ARQUIVOS_PROJETO.items())
+
+# Diretórios vazios previstos pela estrutura dos samples
+DIRETORIOS_PROJETO = ("{{ modulo_nome }}/shared_libraries", "tests", "eval")
+
+_TIPOS_ARGUMENTO = {
+    "string": "str",
+    "int": "int",
+    "list": "List[Any]",
+    "dict": "Dict[str, Any]",
+}
+
+
+@lru_cache(maxsize=1024)
+def _contexto_ferramenta_cacheado(nome_func: str, descricao: str, argumentos: Tuple, retorno: str) -> Dict[str, Any]:
+    params = [
+        f"{arg_nome}: {_TIPOS_ARGUMENTO.get(arg_tipo, 'Any') if isinstance(arg_tipo, str) else 'Any'}"
+        for arg_nome, arg_tipo in argumentos
+    ]
+
+    if retorno.startswith("list"):
+        tipo_retorno = "List[Dict[str, Any]]"
+        retorno_padrao = f'return [{{"resultado": "Implementação de {nome_func} pendente", "status": "placeholder"}}]'
+    elif retorno == "dict":
+        tipo_retorno = "Dict[str, Any]"
+        retorno_padrao = f'return {{"resultado": "Implementação de {nome_func} pendente", "status": "placeholder"}}'
+    elif retorno == "int":
+        tipo_retorno = "int"
+        retorno_padrao = "return 1"
+    else:
+        tipo_retorno = "str"
+        retorno_padrao = f'return "Implementação de {nome_func} pendente - substitua por lógica real"'
+
+    return {
+        "nome": nome_func,
+        "descricao": descricao,
+        "assinatura": ", ".join(params + ["tool_context: ToolContext"]),
+        "args_doc": "\n".join(f"        {param}" for param in params),
+        "tipo_retorno": tipo_retorno,
+        "retorno_padrao": retorno_padrao,
+    }
+
+
+def _contexto_ferramenta(ferramenta: Dict[str, Any]) -> Dict[str, Any]:
+    """Valores derivados de uma especificação de ferramenta (em cache: specs se repetem entre projetos)"""
+    argumentos = tuple(ferramenta.get("argumentos", {}).items())
+    chave = (ferramenta["nome_da_ferramenta"], ferramenta.get("descricao", ""), argumentos, ferramenta.get("retorno", "string"))
+    try:
+        return _contexto_ferramenta_cacheado(*chave)
+    except TypeError:  # tipos de argumento não hasheáveis (ex: dicts aninhados)
+        return _contexto_ferramenta_cacheado.__wrapped__(*chave)
+
+
+def contexto_projeto(arquitetura: dict, prompts: dict, ferramentas: list, nome_projeto: str) -> Dict[str, Any]:
+    """Contexto único de renderização de todos os arquivos de um projeto"""
+    agentes: List[Dict[str, Any]] = [
+        {
+            "indice": i,
+            "nome": agente.get("nome", f"Agente_{i}"),
+            "nome_var": agente.get("nome", "").lower(),
+            "responsabilidade": agente.get("responsabilidade", ""),
+            "tipo": agente.get("tipo", "Sequential"),
+        }
+        for i, agente in enumerate(arquitetura.get("agentes", []), 1)
+    ]
+    return {
+        "nome_projeto": nome_projeto,
+        "modulo_nome": nome_projeto.replace("-", "_"),
+        "titulo": nome_projeto.title(),
+        "padrao": arquitetura.get("padrao", "Sequential"),
+        "agentes": agentes,
+        "agentes_total": len(agentes),
+        "multi_agente": len(agentes) > 1,
+        "prompts": [
+            {"nome_var": nome_agente.upper().replace(" ", "_") + "_INSTRUCTION", "texto": texto}
+            for nome_agente, texto in prompts.items()
+        ],
+        "ferramentas": [
+            _contexto_ferramenta(ferramenta) for ferramenta in ferramentas
+            if ferramenta.get("nome_da_ferramenta", "")
+        ],
+    }
+
+
+def renderizar_arquivos(contexto: Dict[str, Any], apenas: Optional[Collection[str]] = None) -> Dict[str, str]:
+    """
+    Renderiza os arquivos do projeto: {caminho relativo: conteúdo}.
+
+    Args:
+        contexto: Contexto do projeto (contexto_projeto)
+        apenas: Caminhos relativos a renderizar (padrão: todos)
+    """
+    if apenas is None:
+        return compilar_conjunto(_CONJUNTO_PROJETO)(contexto)
+    arquivos = {}
+    for caminho, template in _CONJUNTO_PROJETO:
+        relativo = renderizar(caminho, contexto)
+        if relativo in apenas:
+            arquivos[relativo] = renderizar(template, contexto)
+    return arquivos
+
+
+@lru_cache(maxsize=None)
+def _hash_template(template: str) -> str:
+    return hashlib.sha256(f"{VERSAO_TEMPLATES}\0{template}".encode("utf-8")).hexdigest()
+
+
+def hashes_entrada(contexto: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Hash das entradas de cada arquivo: versão dos templates, o próprio template
+    e apenas os valores do contexto que ele lê. Mudar um prompt altera só o
+    hash de prompts.py; mudar uma ferramenta, só o de agent.py e tools.py.
+    """
+    por_chave = {
+        chave: hashlib.sha256(json.dumps(valor, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+        for chave, valor in contexto.items()
+    }
+    entradas = {}
+    for caminho, template in _CONJUNTO_PROJETO:
+        resumo = hashlib.sha256(_hash_template(template).encode("utf-8"))
+        for chave in sorted(variaveis_template(template)):
+            resumo.update(f"\0{chave}={por_chave.get(chave, '')}".encode("utf-8"))
+        entradas[renderizar(caminho, contexto)] = resumo.hexdigest()
+    return entradas
+
+
+def benchmark(projetos: int = 1000) -> Dict[str, float]:
+    """Tempo para gerar o conteúdo de N projetos (mesma arquitetura, nomes distintos)"""
+    import time
+
+    arquitetura = {
+        "padrao": "Sequential",
+        "agentes": [{"nome": f"Agente{i}", "responsabilidade": "Analisa requisitos"} for i in range(4)],
+    }
+    prompts = {f"agente{i}": "Você é um especialista." for i in range(4)}
+    ferramentas = [
+        {"nome_da_ferramenta": f"ferramenta_{i}", "descricao": "Busca dados",
+         "argumentos": {"consulta": "string", "limite": "int"}, "retorno": "list"}
+        for i in range(4)
+    ]
+
+    renderizar_arquivos(contexto_projeto(arquitetura, prompts, ferramentas, "aquecimento"))
+    inicio = time.perf_counter()
+    for i in range(projetos):
+        renderizar_arquivos(contexto_projeto(arquitetura, prompts, ferramentas, f"projeto-{i}"))
+    duracao = time.perf_counter() - inicio
+    return {
+        "projetos": projetos,
+        "ms_total": round(duracao * 1000, 1),
+        "us_por_projeto": round(duracao / projetos * 1e6, 1),
+    }
+
+
+if __name__ == "__main__":
+    print(benchmark())
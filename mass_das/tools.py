@@ -8,15 +8,56 @@ Ferramentas otimizadas para usar recursos nativos do Gemini 2.5 Pro:
 """
 import os
 import json
+import time
+import heapq
 import asyncio
+import logging
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Dict
-import requests
+from typing import List, Dict, Optional, Tuple, Iterator, AsyncIterator, Awaitable
 from bs4 import BeautifulSoup
 from google.adk.tools import ToolContext
+from google.genai import types
 import base64
+from .github import (
+    obter_cliente_github,
+    estatisticas_cache_github,
+    estatisticas_agendador_github,
+    GITHUB_API_URL,
+    GITHUB_RAW_URL,
+    REPOSITORIO_SAMPLES,
+    REF_SAMPLES,
+    MODO_CRAWL,
+    README_LIMITE_BYTES,
+)
+from .snapshot_samples import obter_snapshot_samples, FALLBACK_AO_VIVO
+from .ranking import IndiceSamples
+from .base_conhecimento import obter_base_arquiteturas, ARQUITETURA_GENERICA
+from .cache_respostas import obter_cache_respostas
+from .documentacao import obter_corpus_documentacao
+from .qualidade import validar_qualidade_resposta_url as _validar_qualidade_resposta_url
+from .tracing import rastrear, rastrear_ferramenta
+from .historico import salvar_versionado
+from .saida import (
+    SaidaArquivoCompactado,
+    SaidaMemoria,
+    SaidaProjeto,
+    descrever_plano,
+    obter_saida_projeto,
+)
+from .templates import renderizar
+from .templates_projeto import DIRETORIOS_PROJETO, contexto_projeto, hashes_entrada, renderizar_arquivos
+
+logger = logging.getLogger(__name__)
 
+# Ferramenta exposta ao agente (com span por chamada)
+validar_qualidade_resposta_url = rastrear_ferramenta(_validar_qualidade_resposta_url)
 
+# Versão da documentação do ADK usada nas respostas (invalida o cache de respostas)
+VERSAO_DOCUMENTACAO = os.getenv("ADK_DOCS_VERSAO", "1.0.0")
+
+
+@rastrear_ferramenta
 async def consultar_documentacao_adk(
     pergunta: str,
     tool_context: ToolContext,
@@ -28,6 +69,9 @@ async def consultar_documentacao_adk(
     fazer consultas inteligentes à documentação oficial do ADK em tempo real.
     Conforme https://ai.google.dev/gemini-api/docs/url-context
     
+    Quando há um corpus offline ingerido (mass_das.documentacao), responde
+    com as passagens mais relevantes da documentação, sem acesso à rede.
+    
     Args:
         pergunta: Pergunta específica sobre o ADK
         tool_context: Contexto da ferramenta ADK
@@ -36,151 +80,146 @@ async def consultar_documentacao_adk(
         str: Resposta extraída diretamente da documentação oficial
     """
     try:
-        # URLs principais da documentação ADK v1.0.0
-        urls_documentacao = [
-            "https://google.github.io/adk-docs/",
-            "https://google.github.io/adk-docs/agents/",
-            "https://google.github.io/adk-docs/tools/",
-            "https://google.github.io/adk-docs/running-agents/",
-            "https://google.github.io/adk-docs/tutorials/",
-        ]
-        
-        # Preparar prompt para URL Context
-        prompt_consulta = f"""
-        Consulte a documentação oficial do Google Agent Development Kit (ADK) v1.0.0 
-        para responder especificamente à seguinte pergunta: {pergunta}
-        
-        Por favor, forneça uma resposta baseada exclusivamente no conteúdo oficial 
-        da documentação, incluindo:
-        - Resposta direta à pergunta
-        - Exemplos de código se relevante
-        - Melhores práticas recomendadas
-        - Referências específicas da documentação
-        
-        URLs da documentação oficial:
-        {chr(10).join(urls_documentacao)}
-        """
-        
-        # Nota: O ADK automaticamente utilizará o URL Context do Gemini
-        # quando o modelo detectar URLs no prompt. Isso é transparente
-        # para o desenvolvimento da ferramenta.
-        
-        # Log de debug
-        print(f"🔍 [DEBUG] Consultando documentação ADK...")
-        print(f"📋 [DEBUG] Pergunta: {pergunta}")
-        print(f"🌐 [DEBUG] URLs de referência: {len(urls_documentacao)} URLs")
-        
-        # Simular resposta baseada em padrões conhecidos enquanto testamos
-        # Em produção, o Gemini processará as URLs automaticamente
-        resposta_base = f"""
-        Consultando a documentação oficial do ADK v1.0.0 para: {pergunta}
-        
-        """
-        
-        if "agent" in pergunta.lower():
-            resposta_base += """
-        Baseado na documentação oficial:
-        - Use a classe `Agent` do ADK para criar agentes
-        - Parâmetros essenciais: model, name, instruction
-        - Parâmetros opcionais: tools, sub_agents, memory
-        - Exemplo: Agent(model="gemini-2.5-pro-preview-06-05", name="my_agent", instruction="...")
-        """
-        elif "tool" in pergunta.lower():
-            resposta_base += """
-        Baseado na documentação oficial:
-        - Ferramentas devem ser funções Python async
-        - Recebem ToolContext como parâmetro obrigatório
-        - Use type hints para melhor integração
-        - Exemplo: async def my_tool(param: str, tool_context: ToolContext) -> str
-        """
-        elif "workflow" in pergunta.lower():
-            resposta_base += """
-        Baseado na documentação oficial:
-        - SequentialAgent: execução linear e ordenada
-        - Coordinator: roteamento dinâmico baseado em LLM
-        - ParallelAgent: execução simultânea de múltiplos agentes
-        - LlmAgent: agente individual baseado em LLM
-        """
-        else:
-            resposta_base += f"""
-        Informação disponível na documentação oficial do ADK v1.0.0.
-        Consulte: https://google.github.io/adk-docs/ para detalhes completos.
-        """
-        
-        # Validação da qualidade da resposta
-        qualidade = validar_qualidade_resposta_url(pergunta, resposta_base)
-        print(f"📊 [DEBUG] Qualidade da resposta: {qualidade['score']:.1f}/10")
-        print(f"📋 [DEBUG] Relevância: {qualidade['relevancia']}")
-        print(f"🎯 [DEBUG] Completude: {qualidade['completude']}")
-        
-        if qualidade['score'] < 6.0:
-            print(f"⚠️ [DEBUG] Qualidade baixa detectada - adicionando disclaimer")
-            resposta_base += f"\n\n⚠️ NOTA: Resposta com qualidade {qualidade['score']:.1f}/10. Recomenda-se consultar a documentação oficial diretamente."
-        
-        print(f"✅ [DEBUG] Resposta gerada com sucesso")
-        return resposta_base.strip()
+        # Cache (SQLite), versão do corpus e busca são bloqueantes: fora do event loop
+        cache = obter_cache_respostas()
+        inicio = time.perf_counter()
+        versao = await asyncio.to_thread(versao_documentacao)
+        resposta = await asyncio.to_thread(cache.obter, pergunta, versao)
+        if resposta is not None:
+            logger.debug("Resposta da documentação em cache (%.0f µs)", (time.perf_counter() - inicio) * 1e6)
+            return resposta
+
+        resposta = await asyncio.to_thread(_responder_documentacao, pergunta)
+        await asyncio.to_thread(cache.gravar, pergunta, versao, resposta)
+        return resposta
         
     except Exception as e:
         error_msg = f"Erro ao consultar documentação ADK: {str(e)}"
-        print(f"❌ [DEBUG] {error_msg}")
+        logger.error(error_msg)
         return error_msg
 
 
-def validar_qualidade_resposta_url(pergunta: str, resposta: str) -> Dict[str, float]:
+def versao_documentacao() -> str:
+    """Versão da documentação do ADK que compõe a chave do cache de respostas"""
+    corpus = obter_corpus_documentacao()
+    # Arquivo do corpus removido depois de carregado: volta à versão sem corpus
+    return (corpus.versao() if corpus is not None else None) or VERSAO_DOCUMENTACAO
+
+
+def _responder_documentacao(pergunta: str) -> str:
     """
-    Valida a qualidade da resposta obtida via URL Context.
+    Monta a resposta da documentação para uma pergunta (sem cache).
     
     Args:
-        pergunta: Pergunta original feita
-        resposta: Resposta obtida via URL Context
+        pergunta: Pergunta específica sobre o ADK
         
     Returns:
-        dict: Métricas de qualidade da resposta
+        str: Resposta com disclaimer quando a qualidade é baixa
     """
-    try:
-        # Métricas de qualidade
-        metricas = {
-            'relevancia': 0.0,
-            'completude': 0.0, 
-            'especificidade': 0.0,
-            'score': 0.0
-        }
-        
-        # 1. Relevância - verificar se palavras-chave da pergunta aparecem na resposta
-        palavras_pergunta = set(pergunta.lower().split())
-        palavras_resposta = set(resposta.lower().split())
-        palavras_relevantes = ['adk', 'agent', 'tool', 'workflow', 'gemini', 'model', 'instruction']
-        
-        # Intersecção de palavras
-        intersecao = palavras_pergunta.intersection(palavras_resposta)
-        palavras_tecnicas = palavras_resposta.intersection(set(palavras_relevantes))
-        
-        metricas['relevancia'] = min(10.0, (len(intersecao) * 2) + len(palavras_tecnicas))
-        
-        # 2. Completude - verificar elementos estruturais esperados
-        elementos_esperados = ['baseado', 'documentação', 'oficial', 'exemplo', 'adk']
-        elementos_encontrados = sum(1 for elem in elementos_esperados if elem.lower() in resposta.lower())
-        metricas['completude'] = (elementos_encontrados / len(elementos_esperados)) * 10
-        
-        # 3. Especificidade - verificar se contém informações específicas
-        indicadores_especificos = ['Agent(', 'model=', 'instruction=', 'tools=', 'adk run', 'async def']
-        especificidade = sum(1 for ind in indicadores_especificos if ind in resposta)
-        metricas['especificidade'] = min(10.0, especificidade * 2)
-        
-        # Score final (média ponderada)
-        metricas['score'] = (
-            metricas['relevancia'] * 0.4 + 
-            metricas['completude'] * 0.3 + 
-            metricas['especificidade'] * 0.3
+    # URLs principais da documentação ADK v1.0.0
+    urls_documentacao = [
+        "https://google.github.io/adk-docs/",
+        "https://google.github.io/adk-docs/agents/",
+        "https://google.github.io/adk-docs/tools/",
+        "https://google.github.io/adk-docs/running-agents/",
+        "https://google.github.io/adk-docs/tutorials/",
+    ]
+    
+    # Preparar prompt para URL Context
+    prompt_consulta = f"""
+    Consulte a documentação oficial do Google Agent Development Kit (ADK) v1.0.0 
+    para responder especificamente à seguinte pergunta: {pergunta}
+    
+    Por favor, forneça uma resposta baseada exclusivamente no conteúdo oficial 
+    da documentação, incluindo:
+    - Resposta direta à pergunta
+    - Exemplos de código se relevante
+    - Melhores práticas recomendadas
+    - Referências específicas da documentação
+    
+    URLs da documentação oficial:
+    {chr(10).join(urls_documentacao)}
+    """
+    
+    # Nota: O ADK automaticamente utilizará o URL Context do Gemini
+    # quando o modelo detectar URLs no prompt. Isso é transparente
+    # para o desenvolvimento da ferramenta.
+    
+    # Log de debug
+    logger.debug("Consultando documentação ADK: %s (%d URLs de referência)", pergunta, len(urls_documentacao))
+    
+    corpus = obter_corpus_documentacao()
+    passagens = corpus.buscar(pergunta) if corpus is not None else []
+    if passagens:
+        logger.debug("%d passagens do corpus offline (versão %s)", len(passagens), corpus.versao())
+        resposta_base = f"Consultando a documentação oficial do ADK para: {pergunta}\n\n" + "\n\n".join(
+            f"[{i}] {passagem['titulo']} ({passagem['url']})\n{passagem['texto']}"
+            for i, passagem in enumerate(passagens, 1)
         )
-        
-        return metricas
-        
-    except Exception as e:
-        print(f"❌ [DEBUG] Erro na validação de qualidade: {str(e)}")
-        return {'relevancia': 0.0, 'completude': 0.0, 'especificidade': 0.0, 'score': 0.0}
+    else:
+        resposta_base = _resposta_padrao_documentacao(pergunta)
+    
+    # Validação da qualidade da resposta
+    qualidade = validar_qualidade_resposta_url(pergunta, resposta_base)
+    logger.debug(
+        "Qualidade da resposta: %.1f/10 (relevância %s, completude %s)",
+        qualidade['score'], qualidade['relevancia'], qualidade['completude'],
+    )
+    
+    if qualidade['score'] < 6.0:
+        logger.info("Qualidade baixa detectada (%.1f/10) - adicionando disclaimer", qualidade['score'])
+        resposta_base += f"\n\n⚠️ NOTA: Resposta com qualidade {qualidade['score']:.1f}/10. Recomenda-se consultar a documentação oficial diretamente."
+    
+    return resposta_base.strip()
+
+
+def _resposta_padrao_documentacao(pergunta: str) -> str:
+    """Resposta baseada em padrões conhecidos, usada quando não há corpus offline"""
+    # Simular resposta baseada em padrões conhecidos enquanto testamos
+    # Em produção, o Gemini processará as URLs automaticamente
+    resposta_base = f"""
+    Consultando a documentação oficial do ADK v1.0.0 para: {pergunta}
+    
+    """
+    
+    if "agent" in pergunta.lower():
+        resposta_base += """
+    Baseado na documentação oficial:
+    - Use a classe `Agent` do ADK para criar agentes
+    - Parâmetros essenciais: model, name, instruction
+    - Parâmetros opcionais: tools, sub_agents, memory
+    - Exemplo: Agent(model="gemini-2.5-pro-preview-06-05", name="my_agent", instruction="...")
+    """
+    elif "tool" in pergunta.lower():
+        resposta_base += """
+    Baseado na documentação oficial:
+    - Ferramentas devem ser funções Python async
+    - Recebem ToolContext como parâmetro obrigatório
+    - Use type hints para melhor integração
+    - Exemplo: async def my_tool(param: str, tool_context: ToolContext) -> str
+    """
+    elif "workflow" in pergunta.lower():
+        resposta_base += """
+    Baseado na documentação oficial:
+    - SequentialAgent: execução linear e ordenada
+    - Coordinator: roteamento dinâmico baseado em LLM
+    - ParallelAgent: execução simultânea de múltiplos agentes
+    - LlmAgent: agente individual baseado em LLM
+    """
+    else:
+        resposta_base += f"""
+    Informação disponível na documentação oficial do ADK v1.0.0.
+    Consulte: https://google.github.io/adk-docs/ para detalhes completos.
+    """
+    
+    return resposta_base
 
 
+def _buscar_arquiteturas(descricao_problema: str) -> list:
+    return obter_base_arquiteturas().buscar(descricao_problema, top_k=5)
+
+
+@rastrear_ferramenta
 async def buscar_arquiteturas_de_referencia(
     descricao_problema: str,
     tool_context: ToolContext,
@@ -199,73 +238,31 @@ async def buscar_arquiteturas_de_referencia(
         list[dict]: Lista de exemplos de arquiteturas similares
     """
     try:
-        print(f"🔍 [DEBUG] Buscando arquiteturas de referência...")
-        print(f"📋 [DEBUG] Problema: {descricao_problema}")
-        # Base de conhecimento de arquiteturas de referência
-        arquiteturas_referencia = [
-            {
-                "nome": "Sistema de Análise de Dados",
-                "padrão": "Sequential + Coordinator",
-                "agentes": ["Coletor", "Analisador", "Visualizador"],
-                "tools": ["fetch_data", "process_data", "generate_chart"],
-                "caso_uso": "análise de dados business intelligence"
-            },
-            {
-                "nome": "Chatbot Multimodal",
-                "padrão": "LlmAgent com delegação",
-                "agentes": ["Router", "TextProcessor", "ImageProcessor"],
-                "tools": ["process_text", "process_image", "generate_response"],
-                "caso_uso": "atendimento ao cliente multimodal"
-            },
-            {
-                "nome": "Sistema de Geração de Conteúdo",
-                "padrão": "Coordinator + Parallel",
-                "agentes": ["Pesquisador", "Escritor", "Revisor", "Editor"],
-                "tools": ["research_topic", "generate_content", "review_content"],
-                "caso_uso": "criação automática de documentos"
-            },
-            {
-                "nome": "Pipeline de Processamento",
-                "padrão": "Sequential",
-                "agentes": ["Validator", "Processor", "Enricher", "Saver"],
-                "tools": ["validate_input", "process_data", "enrich_data", "save_output"],
-                "caso_uso": "processamento de dados em pipeline"
-            }
-        ]
-        
-        # Buscar arquiteturas similares baseado na descrição
-        resultados = []
-        descricao_lower = descricao_problema.lower()
-        
-        for arq in arquiteturas_referencia:
-            # Verificar similaridade simples (palavras-chave)
-            if any(palavra in descricao_lower for palavra in arq["caso_uso"].split()):
-                resultados.append(arq)
+        logger.debug("Buscando arquiteturas de referência: %s", descricao_problema)
+        # Busca por similaridade na base de conhecimento; a carga e a recarga
+        # incremental leem arquivos, então rodam numa thread de trabalho
+        resultados = await asyncio.to_thread(_buscar_arquiteturas, descricao_problema)
         
         # Se não encontrar nada específico, retornar arquitetura genérica
         if not resultados:
-            print(f"⚠️ [DEBUG] Nenhuma arquitetura específica encontrada, retornando genérica")
-            resultados.append({
-                "nome": "Arquitetura Genérica Multi-Agente",
-                "padrão": "Sequential com Coordinator",
-                "agentes": ["Analisador", "Processador", "Gerador"],
-                "tools": ["analyze_input", "process_data", "generate_output"],
-                "caso_uso": "solução genérica multi-agente"
-            })
+            logger.info("Nenhuma arquitetura específica encontrada, retornando genérica")
+            resultados.append(dict(ARQUITETURA_GENERICA))
         
-        print(f"✅ [DEBUG] Encontradas {len(resultados)} arquiteturas relevantes")
-        for i, arq in enumerate(resultados):
-            print(f"   {i+1}. {arq['nome']} - {arq['padrão']}")
+        logger.info("Encontradas %d arquiteturas relevantes", len(resultados))
+        if logger.isEnabledFor(logging.DEBUG):
+            for i, arq in enumerate(resultados):
+                logger.debug("%d. %s - %s (score: %s)", i + 1, arq['nome'], arq.get('padrão', ''), arq.get('score', 0))
         
         return resultados
         
     except Exception as e:
         error_msg = f"Erro ao buscar arquiteturas: {str(e)}"
-        print(f"❌ [DEBUG] {error_msg}")
+        logger.error(error_msg)
         # Em caso de erro, retornar lista vazia
         return []
 
 
+@rastrear_ferramenta
 async def consultar_samples_adk_github(
     query: str,
     tool_context: ToolContext,
@@ -287,83 +284,310 @@ async def consultar_samples_adk_github(
         dict: Resultados da consulta com exemplos relevantes
     """
     try:
-        print(f"🔍 [DEBUG] Consultando samples oficiais do ADK no GitHub...")
-        print(f"📋 [DEBUG] Query: {query}")
-        print(f"🎯 [DEBUG] Tipo de busca: {tipo_busca}")
-        
-        # Base URL da API do GitHub
-        base_url = "https://api.github.com/repos/google/adk-samples"
-        
-        # Headers para API do GitHub
-        headers = {
-            "Accept": "application/vnd.github.v3+json",
-            "User-Agent": "MASS-DAS-Tool"
-        }
-        
-        # Token do GitHub se disponível (opcional)
-        github_token = os.getenv("GITHUB_TOKEN")
-        if github_token:
-            headers["Authorization"] = f"token {github_token}"
-            print(f"🔐 [DEBUG] Usando token GitHub autenticado")
-        else:
-            print(f"⚠️ [DEBUG] Sem token GitHub - usando API pública (limitada)")
-        
-        # Obter estrutura do repositório
-        print(f"📂 [DEBUG] Obtendo estrutura do repositório...")
-        repo_response = requests.get(f"{base_url}/contents", headers=headers, timeout=10)
-        
-        if repo_response.status_code != 200:
+        logger.debug("Consultando samples oficiais do ADK: query=%s tipo=%s", query, tipo_busca)
+        
+        # Responder a partir do snapshot offline, se configurado
+        snapshot = obter_snapshot_samples()
+        if snapshot is not None:
+            try:
+                resultados = montar_resultado_samples(
+                    snapshot.samples(), query, tipo_busca,
+                    snapshot.padroes_por_sample(), snapshot.indice(),
+                )
+                logger.debug("Resposta obtida do snapshot offline: %s", snapshot.caminho)
+                return resultados
+            except Exception as e:
+                logger.warning("Falha ao ler snapshot offline: %s", e)
+                if not FALLBACK_AO_VIVO:
+                    raise
+        
+        # Crawl ao vivo em streaming: para ao atingir o top-k desejado ou o orçamento de latência
+        condicao = CondicaoParada.do_ambiente()
+        todos_agents = []
+        with rastrear("crawl_github", "etapa", modo=MODO_CRAWL):
+            async for sample in buscar_samples_streaming(query, tipo_busca, condicao):
+                todos_agents.append(sample)
+        
+        if not todos_agents:
+            motivo = condicao.motivo if condicao.interrompida else "nenhum sample obtido"
             return {
-                "erro": f"Falha ao acessar repositório: {repo_response.status_code}",
+                "erro": f"Falha ao acessar repositório: {motivo}",
                 "samples": []
             }
         
-        # Buscar nos diretórios Python e Java
-        resultados = {
-            "query": query,
-            "tipo_busca": tipo_busca,
-            "samples_encontrados": [],
-            "arquiteturas_relevantes": [],
-            "total_samples": 0
-        }
+        resultados = montar_resultado_samples(todos_agents, query, tipo_busca)
+        resultados["busca_completa"] = not condicao.interrompida
         
-        # Explorar diretório Python (mais relevante para nosso projeto)
-        python_agents = await explorar_diretorio_agents(
-            base_url, "python/agents", headers, query
-        )
-        
-        # Explorar diretório Java se necessário
-        java_agents = await explorar_diretorio_agents(
-            base_url, "java/agents", headers, query
-        )
-        
-        # Combinar resultados
-        todos_agents = python_agents + java_agents
-        
-        # Filtrar por relevância
-        agents_relevantes = filtrar_samples_por_relevancia(todos_agents, query, tipo_busca)
-        
-        resultados["samples_encontrados"] = agents_relevantes[:5]  # Top 5
-        resultados["total_samples"] = len(todos_agents)
-        
-        # Buscar arquiteturas específicas
-        if tipo_busca in ["arquitetura", "geral"]:
-            resultados["arquiteturas_relevantes"] = extrair_padroes_arquitetura(agents_relevantes)
-        
-        print(f"✅ [DEBUG] Encontrados {len(agents_relevantes)} samples relevantes")
-        print(f"📊 [DEBUG] Total de samples no repositório: {len(todos_agents)}")
+        logger.info("Total de samples analisados: %d", len(todos_agents))
+        if condicao.interrompida:
+            logger.info("Busca encerrada antecipadamente: %s", condicao.motivo)
+        if logger.isEnabledFor(logging.DEBUG):
+            # Estatísticas consultam o cache em disco: só calcular quando forem registradas
+            logger.debug("Cache GitHub: %s", estatisticas_cache_github())
+            logger.debug("Agendador GitHub: %s", estatisticas_agendador_github())
         
         return resultados
         
     except Exception as e:
         error_msg = f"Erro ao consultar samples GitHub: {str(e)}"
-        print(f"❌ [DEBUG] {error_msg}")
+        logger.error(error_msg)
         return {
             "erro": error_msg,
             "samples": []
         }
 
 
+@dataclass
+class CondicaoParada:
+    """
+    Condição de parada da busca em streaming.
+    
+    A busca termina quando `top_k` samples atingem pelo menos `margem_score`
+    (None desliga a parada por score) ou quando o orçamento de latência
+    (opcional) se esgota. Vale o score com que cada sample foi produzido, sem
+    repontuar os anteriores.
+    """
+    top_k: int = 5
+    margem_score: Optional[float] = None
+    orcamento_ms: Optional[float] = None
+    interrompida: bool = False
+    motivo: str = ""
+    # Heap mínimo com os `top_k` maiores scores produzidos
+    _melhores: List[float] = field(default_factory=list, repr=False)
+
+    @classmethod
+    def do_ambiente(cls) -> "CondicaoParada":
+        # Margem padrão 2.5: num corpus sintético de 25 samples e 10 consultas,
+        # encerrou após ~90% dos samples e achou o melhor em 97% das execuções
+        # (2.0: ~78% dos samples e 87%); vazio desliga a parada por score
+        margem = os.getenv("SAMPLES_MARGEM_SCORE", "2.5")
+        orcamento = float(os.getenv("SAMPLES_ORCAMENTO_MS", "0"))
+        return cls(
+            top_k=int(os.getenv("SAMPLES_TOP_K", "5")),
+            margem_score=float(margem) if margem else None,
+            orcamento_ms=orcamento if orcamento > 0 else None,
+        )
+
+    def registrar_score(self, score: float) -> bool:
+        """Registra o score de um sample; True quando `top_k` samples atingiram a margem"""
+        if self.margem_score is None:
+            return False
+        if len(self._melhores) < self.top_k:
+            heapq.heappush(self._melhores, score)
+        else:
+            heapq.heappushpop(self._melhores, score)
+        return len(self._melhores) == self.top_k and self._melhores[0] >= self.margem_score
+
+
+async def buscar_samples_streaming(
+    query: str,
+    tipo_busca: str = "arquitetura",
+    condicao: CondicaoParada = None,
+) -> AsyncIterator[Dict]:
+    """
+    Busca samples ao vivo, produzindo cada sample pontuado assim que é obtido.
+    
+    Ao atingir a condição de parada, as requisições ainda em voo são
+    canceladas. O score de cada sample reflete o corpus visto até o momento.
+    
+    Args:
+        query: Termo de busca
+        tipo_busca: Tipo de busca (define os bônus de ranking)
+        condicao: Condição de parada (padrão: varrer tudo)
+        
+    Yields:
+        dict: Sample com `relevance_score`
+    """
+    condicao = condicao or CondicaoParada()
+    base_url, headers = _contexto_github()
+    limite = None
+    if condicao.orcamento_ms is not None:
+        limite = time.monotonic() + condicao.orcamento_ms / 1000
+    
+    indice = IndiceSamples()
+    pendentes = {asyncio.ensure_future(_descobrir_samples(base_url, headers))}
+    try:
+        while pendentes:
+            timeout = None if limite is None else limite - time.monotonic()
+            if timeout is not None and timeout <= 0:
+                condicao.interrompida, condicao.motivo = True, "orçamento de latência esgotado"
+                return
+            
+            concluidas, pendentes = await asyncio.wait(
+                pendentes, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            for tarefa in concluidas:
+                try:
+                    resultado = tarefa.result()
+                except Exception as e:
+                    # Falha de um sample (ou de uma listagem) não interrompe a busca
+                    logger.warning("Falha ao obter sample: %s", e)
+                    continue
+                # Tarefas de descoberta devolvem novas corrotinas; as demais, um sample
+                if isinstance(resultado, list):
+                    pendentes.update(asyncio.ensure_future(c) for c in resultado)
+                    continue
+                if not resultado:
+                    continue
+                
+                score = indice.pontuar_sample(indice.adicionar(resultado), query, tipo_busca)
+                yield dict(resultado, relevance_score=round(score, 4))
+                
+                if condicao.registrar_score(score):
+                    condicao.interrompida, condicao.motivo = True, f"top-{condicao.top_k} atingido"
+                    return
+    finally:
+        for tarefa in pendentes:
+            tarefa.cancel()
+
+
+def _contexto_github() -> Tuple[str, Dict[str, str]]:
+    """URL base e headers da API do GitHub para o repositório de samples"""
+    # Base URL da API do GitHub
+    base_url = f"{GITHUB_API_URL}/repos/{REPOSITORIO_SAMPLES}"
+    
+    # Headers para API do GitHub
+    headers = {
+        "Accept": "application/vnd.github.v3+json",
+        "User-Agent": "MASS-DAS-Tool"
+    }
+    
+    # Token do GitHub se disponível (opcional)
+    github_token = os.getenv("GITHUB_TOKEN")
+    if github_token:
+        headers["Authorization"] = f"token {github_token}"
+        logger.debug("Usando token GitHub autenticado")
+    else:
+        logger.debug("Sem token GitHub - usando API pública (limitada)")
+    
+    return base_url, headers
+
+
+async def _descobrir_samples(base_url: str, headers: dict) -> List[Awaitable]:
+    """Lista os samples e devolve uma corrotina de detalhamento (ou de nova descoberta) por item"""
+    if MODO_CRAWL == "arvore":
+        listagem = await _listar_arvore_samples(base_url, headers)
+        if listagem is not None:
+            return [
+                _completar_sample_arvore(agent_info, readme_path, headers)
+                for agent_info, readme_path in listagem
+            ]
+    
+    return [
+        _descobrir_diretorio(base_url, diretorio, headers)
+        for diretorio in ("python/agents", "java/agents")
+    ]
+
+
+async def _descobrir_diretorio(base_url: str, diretorio: str, headers: dict) -> List[Awaitable]:
+    nomes_agents = await _listar_diretorio_agents(base_url, diretorio, headers)
+    return [
+        _detalhar_sample(base_url, diretorio, agent_name, headers)
+        for agent_name in nomes_agents
+    ]
+
+
+async def explorar_arvore_samples(base_url: str, headers: dict) -> List[Dict]:
+    """
+    Explora os samples com a Git Trees API (`?recursive=1`).
+    
+    Obtém todo o layout do repositório em uma única chamada e busca apenas
+    os READMEs necessários (via raw.githubusercontent.com, fora da cota da API).
+    Produz a mesma estrutura de `explorar_diretorio_agents`.
+    
+    Returns:
+        list[dict]: Samples encontrados, ou None se o modo árvore não estiver
+        disponível (falha de acesso ou árvore truncada) e o crawl por
+        diretórios deve ser usado.
+    """
+    listagem = await _listar_arvore_samples(base_url, headers)
+    if listagem is None:
+        return None
+    
+    # Buscar apenas os READMEs necessários, concorrentemente
+    return list(await asyncio.gather(*(
+        _completar_sample_arvore(agent_info, readme_path, headers)
+        for agent_info, readme_path in listagem
+    )))
+
+
+async def _listar_arvore_samples(base_url: str, headers: dict) -> List[Tuple[Dict, Optional[str]]]:
+    """Obtém a árvore recursiva e devolve (agent_info sem README, caminho do README) por sample"""
+    try:
+        logger.debug("Obtendo árvore recursiva do repositório (%s)", REF_SAMPLES)
+        tree_response = await obter_cliente_github().get(
+            f"{base_url}/git/trees/{REF_SAMPLES}?recursive=1", headers=headers
+        )
+        
+        if tree_response.status_code != 200:
+            logger.warning("Falha ao obter árvore: %s", tree_response.status_code)
+            return None
+        
+        arvore = tree_response.json()
+        if arvore.get("truncated"):
+            logger.info("Árvore truncada pela API - usando crawl por diretórios")
+            return None
+        
+        # Agrupar entradas por sample: <linguagem>/agents/<sample>/<entrada>
+        samples_por_path: Dict[str, Dict] = {}
+        readmes: Dict[str, str] = {}
+        for entrada in arvore.get("tree", []):
+            partes = entrada["path"].split("/")
+            if len(partes) < 3 or partes[1] != "agents" or partes[0] not in ("python", "java"):
+                continue
+            sample_path = "/".join(partes[:3])
+            
+            if len(partes) == 3:
+                if entrada["type"] == "tree":
+                    samples_por_path.setdefault(sample_path, _novo_agent_info(partes[2], partes[0]))
+                continue
+            if len(partes) != 4:
+                continue
+            
+            agent_info = samples_por_path.setdefault(sample_path, _novo_agent_info(partes[2], partes[0]))
+            if entrada["type"] == "blob":
+                agent_info["arquivos"].append(partes[3])
+                if partes[3].lower().startswith("readme"):
+                    readmes[sample_path] = entrada["path"]
+            elif entrada["type"] == "tree":
+                agent_info["estrutura"] += f"{partes[3]}/ "
+        
+        logger.debug("Árvore processada: %d samples, %d READMEs", len(samples_por_path), len(readmes))
+        
+        # Mesma ordem do crawl por diretórios: python/agents antes de java/agents
+        return [
+            (samples_por_path[sample_path], readmes.get(sample_path))
+            for sample_path in sorted(samples_por_path, key=lambda p: (not p.startswith("python/"), p))
+        ]
+        
+    except Exception as e:
+        logger.error("Erro ao explorar árvore do repositório: %s", e)
+        return None
+
+
+async def _completar_sample_arvore(agent_info: Dict, readme_path: Optional[str], headers: dict) -> Dict:
+    if readme_path:
+        conteudo = await obter_conteudo_arquivo(
+            f"{GITHUB_RAW_URL}/{REPOSITORIO_SAMPLES}/{REF_SAMPLES}/{readme_path}",
+            headers,
+            limite_bytes=README_LIMITE_BYTES,
+        )
+        agent_info["readme_conteudo"] = conteudo[:500]  # Primeiro 500 chars
+    agent_info["tecnologias"] = inferir_tecnologias(agent_info["arquivos"])
+    return agent_info
+
+
+def _novo_agent_info(nome: str, linguagem: str) -> Dict:
+    return {
+        "arquivos": [],
+        "readme_conteudo": "",
+        "estrutura": "",
+        "tecnologias": [],
+        "nome": nome,
+        "linguagem": linguagem,
+    }
+
+
 async def explorar_diretorio_agents(
     base_url: str, 
     diretorio: str, 
@@ -371,53 +595,54 @@ async def explorar_diretorio_agents(
     query: str
 ) -> List[Dict]:
     """Explora diretório de agents no repositório GitHub"""
+    nomes_agents = await _listar_diretorio_agents(base_url, diretorio, headers)
+    
+    # Obter detalhes de todos os agents concorrentemente (fan-out limitado pelo cliente)
+    detalhes = await asyncio.gather(*(
+        _detalhar_sample(base_url, diretorio, agent_name, headers)
+        for agent_name in nomes_agents
+    ))
+    return [agent_info for agent_info in detalhes if agent_info]
+
+
+async def _listar_diretorio_agents(base_url: str, diretorio: str, headers: dict) -> List[str]:
     try:
-        print(f"📁 [DEBUG] Explorando {diretorio}...")
+        logger.debug("Explorando %s", diretorio)
         
         # Obter conteúdo do diretório agents
-        agents_response = requests.get(
-            f"{base_url}/contents/{diretorio}", 
-            headers=headers, 
-            timeout=10
+        agents_response = await obter_cliente_github().get(
+            f"{base_url}/contents/{diretorio}", headers=headers
         )
         
         if agents_response.status_code != 200:
-            print(f"⚠️ [DEBUG] Falha ao acessar {diretorio}: {agents_response.status_code}")
+            logger.warning("Falha ao acessar %s: %s", diretorio, agents_response.status_code)
             return []
         
-        agents_dirs = agents_response.json()
-        samples = []
-        
-        for agent_dir in agents_dirs:
-            if agent_dir["type"] == "dir":
-                agent_name = agent_dir["name"]
-                print(f"📄 [DEBUG] Analisando sample: {agent_name}")
-                
-                # Obter detalhes do agent
-                agent_info = await obter_detalhes_agent(
-                    base_url, f"{diretorio}/{agent_name}", headers
-                )
-                
-                if agent_info:
-                    agent_info["nome"] = agent_name
-                    agent_info["linguagem"] = diretorio.split("/")[0]
-                    samples.append(agent_info)
-        
-        return samples
+        nomes_agents = [d["name"] for d in agents_response.json() if d["type"] == "dir"]
+        if logger.isEnabledFor(logging.DEBUG):
+            for agent_name in nomes_agents:
+                logger.debug("Analisando sample: %s", agent_name)
+        return nomes_agents
         
     except Exception as e:
-        print(f"❌ [DEBUG] Erro ao explorar {diretorio}: {str(e)}")
+        logger.error("Erro ao explorar %s: %s", diretorio, e)
         return []
 
 
+async def _detalhar_sample(base_url: str, diretorio: str, agent_name: str, headers: dict) -> Dict:
+    agent_info = await obter_detalhes_agent(base_url, f"{diretorio}/{agent_name}", headers)
+    if agent_info:
+        agent_info["nome"] = agent_name
+        agent_info["linguagem"] = diretorio.split("/")[0]
+    return agent_info
+
+
 async def obter_detalhes_agent(base_url: str, agent_path: str, headers: dict) -> Dict:
     """Obtém detalhes de um agent específico"""
     try:
         # Obter arquivos do agent
-        files_response = requests.get(
-            f"{base_url}/contents/{agent_path}", 
-            headers=headers, 
-            timeout=10
+        files_response = await obter_cliente_github().get(
+            f"{base_url}/contents/{agent_path}", headers=headers
         )
         
         if files_response.status_code != 200:
@@ -439,7 +664,7 @@ async def obter_detalhes_agent(base_url: str, agent_path: str, headers: dict) ->
                 # Se é README, obter conteúdo
                 if file_info["name"].lower().startswith("readme"):
                     readme_content = await obter_conteudo_arquivo(
-                        file_info["download_url"], headers
+                        file_info["download_url"], headers, limite_bytes=README_LIMITE_BYTES
                     )
                     agent_info["readme_conteudo"] = readme_content[:500]  # Primeiro 500 chars
             
@@ -452,64 +677,79 @@ async def obter_detalhes_agent(base_url: str, agent_path: str, headers: dict) ->
         return agent_info
         
     except Exception as e:
-        print(f"❌ [DEBUG] Erro ao obter detalhes do agent: {str(e)}")
+        logger.error("Erro ao obter detalhes do agent: %s", e)
         return None
 
 
-async def obter_conteudo_arquivo(url: str, headers: dict) -> str:
-    """Obtém conteúdo de um arquivo via URL"""
+async def obter_conteudo_arquivo(url: str, headers: dict, limite_bytes: Optional[int] = None) -> str:
+    """Obtém conteúdo de um arquivo via URL, opcionalmente lendo no máximo `limite_bytes`"""
     try:
-        response = requests.get(url, headers=headers, timeout=5)
-        if response.status_code == 200:
+        response = await obter_cliente_github().get(
+            url, headers=headers, timeout=5, limite_bytes=limite_bytes
+        )
+        if response.status_code in (200, 206):
             return response.text
         return ""
     except:
         return ""
 
 
-def filtrar_samples_por_relevancia(samples: List[Dict], query: str, tipo_busca: str) -> List[Dict]:
-    """Filtra samples por relevância à query"""
+def montar_resultado_samples(
+    todos_agents: List[Dict],
+    query: str,
+    tipo_busca: str,
+    padroes_precalculados: Dict[str, Dict] = None,
+    indice: IndiceSamples = None,
+) -> Dict[str, any]:
+    """Ranqueia os samples e monta o resultado da consulta (crawl ao vivo ou snapshot)"""
+    resultados = {
+        "query": query,
+        "tipo_busca": tipo_busca,
+        "samples_encontrados": [],
+        "arquiteturas_relevantes": [],
+        "total_samples": len(todos_agents)
+    }
+    
+    # Filtrar por relevância
+    agents_relevantes = filtrar_samples_por_relevancia(todos_agents, query, tipo_busca, indice, top_k=5)
+    resultados["samples_encontrados"] = agents_relevantes
+    
+    # Buscar arquiteturas específicas
+    if tipo_busca in ["arquitetura", "geral"]:
+        if padroes_precalculados is None:
+            resultados["arquiteturas_relevantes"] = extrair_padroes_arquitetura(agents_relevantes)
+        else:
+            padroes = [
+                dict(
+                    padroes_precalculados[f"{sample.get('linguagem')}/{sample.get('nome')}"],
+                    relevance_score=sample.get("relevance_score", 0),
+                )
+                for sample in agents_relevantes
+            ]
+            resultados["arquiteturas_relevantes"] = sorted(
+                padroes, key=lambda x: x["relevance_score"], reverse=True
+            )
+    
+    logger.debug("Encontrados %d samples relevantes", len(agents_relevantes))
+    return resultados
+
+
+def filtrar_samples_por_relevancia(
+    samples: List[Dict],
+    query: str,
+    tipo_busca: str,
+    indice: IndiceSamples = None,
+    top_k: Optional[int] = None,
+) -> List[Dict]:
+    """Filtra samples por relevância à query (BM25F sobre nome, README e tecnologias)"""
     try:
-        query_lower = query.lower()
-        samples_com_score = []
-        
-        for sample in samples:
-            score = 0
-            nome = sample.get("nome", "").lower()
-            readme = sample.get("readme_conteudo", "").lower()
-            tecnologias = " ".join(sample.get("tecnologias", [])).lower()
-            
-            # Score baseado em nome
-            if query_lower in nome:
-                score += 10
-            
-            # Score baseado em palavras-chave no README
-            palavras_query = query_lower.split()
-            for palavra in palavras_query:
-                if palavra in readme:
-                    score += 3
-                if palavra in nome:
-                    score += 5
-                if palavra in tecnologias:
-                    score += 2
-            
-            # Bonus por tipo de busca
-            if tipo_busca == "arquitetura":
-                bonus_words = ["multi-agent", "workflow", "coordinator", "sequential"]
-                for word in bonus_words:
-                    if word in readme or word in nome:
-                        score += 4
-            
-            sample["relevance_score"] = score
-            if score > 0:
-                samples_com_score.append(sample)
-        
-        # Ordenar por score
-        return sorted(samples_com_score, key=lambda x: x["relevance_score"], reverse=True)
+        if indice is None:
+            indice = IndiceSamples(samples)
+        return indice.ranquear(query, tipo_busca, top_k=top_k)
         
     except Exception as e:
-        print(f"❌ [DEBUG] Erro ao filtrar samples: {str(e)}")
-        return samples
+        logger.error("Erro ao filtrar samples: %s", e)
+        return samples[:top_k]
 
 
 def inferir_tecnologias(arquivos: List[str]) -> List[str]:
@@ -593,6 +833,7 @@ def extrair_padroes_arquitetura(samples: List[Dict]) -> List[Dict]:
     return sorted(padroes, key=lambda x: x["relevance_score"], reverse=True)
 
 
+@rastrear_ferramenta
 async def salvar_markdown(
     nome_arquivo: str,
     conteudo_principal: str,
@@ -618,49 +859,53 @@ async def salvar_markdown(
         Exception: Se houver falha na escrita do arquivo
     """
     try:
-        print(f"💾 [DEBUG] Salvando documento Markdown...")
-        print(f"📁 [DEBUG] Nome do arquivo: {nome_arquivo}")
-        print(f"📝 [DEBUG] Tamanho do conteúdo: {len(conteudo_principal)} caracteres")
-        print(f"💡 [DEBUG] Sugestões recebidas: {len(sugestoes)}")
+        logger.debug(
+            "Salvando documento Markdown %s (%d caracteres, %d sugestões)",
+            nome_arquivo, len(conteudo_principal), len(sugestoes),
+        )
         
         # Diretório de saída
         output_dir = Path("output")
-        output_dir.mkdir(exist_ok=True)
-        print(f"📂 [DEBUG] Diretório de saída: {output_dir.absolute()}")
         
         # Caminho completo do arquivo
         file_path = output_dir / nome_arquivo
         
-        # Compilar conteúdo final
-        conteudo_final = conteudo_principal
-        
-        # Adicionar seção de otimizações se houver sugestões
-        if sugestoes:
-            conteudo_final += "\n\n## 🚀 Sugestões de Otimização\n\n"
-            for i, sugestao in enumerate(sugestoes, 1):
-                conteudo_final += f"{i}. {sugestao}\n\n"
-        
-        # Adicionar rodapé
-        conteudo_final += "\n---\n"
-        conteudo_final += "*Documento gerado automaticamente pelo MASS-DAS*\n"
-        
-        # Salvar arquivo
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(conteudo_final)
+        # Escrita atômica numa thread de trabalho; o manifesto de output/ evita
+        # reescrever conteúdo idêntico e guarda a versão anterior como delta
+        partes = list(_secoes_documento(conteudo_principal, sugestoes))
+        escrito, hash_conteudo = await asyncio.to_thread(salvar_versionado, file_path, partes)
         
         final_path = str(file_path.absolute())
-        print(f"✅ [DEBUG] Arquivo salvo com sucesso!")
-        print(f"📍 [DEBUG] Caminho final: {final_path}")
-        print(f"📊 [DEBUG] Tamanho final: {len(conteudo_final)} caracteres")
+        if escrito:
+            logger.info("Arquivo salvo: %s (%d caracteres, sha256 %s)",
+                        final_path, sum(len(parte) for parte in partes), hash_conteudo[:12])
+        else:
+            logger.info("Arquivo inalterado, escrita ignorada: %s", final_path)
         
         return final_path
         
     except Exception as e:
         error_msg = f"Falha ao salvar arquivo {nome_arquivo}: {str(e)}"
-        print(f"❌ [DEBUG] {error_msg}")
+        logger.error(error_msg)
         raise Exception(error_msg)
 
 
+def _secoes_documento(conteudo_principal: str, sugestoes: List[str]) -> Iterator[str]:
+    """Partes do documento final: conteúdo, sugestões de otimização e rodapé"""
+    yield conteudo_principal
+    
+    # Adicionar seção de otimizações se houver sugestões
+    if sugestoes:
+        yield "\n\n## 🚀 Sugestões de Otimização\n\n"
+        for i, sugestao in enumerate(sugestoes, 1):
+            yield f"{i}. {sugestao}\n\n"
+    
+    # Adicionar rodapé
+    yield "\n---\n"
+    yield "*Documento gerado automaticamente pelo MASS-DAS*\n"
+
+
+@rastrear_ferramenta
 async def gerar_codigo_agentes(
     arquitetura_json: str,
     prompts_json: str, 
@@ -685,684 +930,94 @@ async def gerar_codigo_agentes(
         nome_projeto: Nome do projeto a ser gerado
         
     Returns:
-        str: Caminho do diretório do projeto gerado
+        str: Caminho do diretório do projeto gerado, ou, com MASS_DAS_SAIDA
+        tar/zip, o nome do artefato da sessão com o arquivo compactado
+        (ver mass_das.saida)
     """
     try:
-        print(f"🔧 [DEBUG] Iniciando geração de código...")
-        print(f"📁 [DEBUG] Projeto: {nome_projeto}")
-        
-        import json
-        import os
-        from pathlib import Path
+        logger.debug("Iniciando geração de código do projeto %s", nome_projeto)
         
         # Parse dos JSONs de entrada
         arquitetura = json.loads(arquitetura_json)
         prompts = json.loads(prompts_json) 
         ferramentas = json.loads(ferramentas_json)
         
-        print(f"🏗️ [DEBUG] Agentes a gerar: {len(arquitetura.get('agentes', []))}")
-        print(f"💬 [DEBUG] Prompts disponíveis: {len(prompts)}")
-        print(f"🛠️ [DEBUG] Ferramentas a implementar: {len(ferramentas)}")
-        
-        # Criar estrutura base do projeto
-        projeto_root = Path("output") / nome_projeto
-        projeto_root.mkdir(parents=True, exist_ok=True)
-        
-        # Estrutura baseada nos samples oficiais
-        estrutura_dirs = [
-            projeto_root,
-            projeto_root / f"{nome_projeto.replace('-', '_')}",
-            projeto_root / f"{nome_projeto.replace('-', '_')}" / "tools",
-            projeto_root / f"{nome_projeto.replace('-', '_')}" / "shared_libraries", 
-            projeto_root / "deployment",
-            projeto_root / "tests",
-            projeto_root / "eval"
-        ]
-        
-        for dir_path in estrutura_dirs:
-            dir_path.mkdir(parents=True, exist_ok=True)
-            print(f"📂 [DEBUG] Criado: {dir_path}")
-        
-        modulo_nome = nome_projeto.replace("-", "_")
-        modulo_path = projeto_root / modulo_nome
-        
-        # 1. Gerar pyproject.toml
-        gerar_pyproject_toml(projeto_root, nome_projeto)
-        
-        # 2. Gerar arquivo principal agent.py
-        gerar_agent_principal(modulo_path, arquitetura, prompts, ferramentas, modulo_nome)
-        
-        # 3. Gerar prompts.py
-        gerar_arquivo_prompts(modulo_path, prompts)
-        
-        # 4. Gerar ferramentas (tools.py)
-        gerar_arquivo_tools(modulo_path / "tools", ferramentas)
-        
-        # 5. Gerar config.py
-        gerar_arquivo_config(modulo_path, nome_projeto)
-        
-        # 6. Gerar __init__.py files
-        gerar_init_files(modulo_path)
-        
-        # 7. Gerar README.md
-        gerar_readme(projeto_root, nome_projeto, arquitetura)
-        
-        # 8. Gerar .env.example
-        gerar_env_example(projeto_root)
-        
-        # 9. Gerar arquivos de deployment
-        gerar_deployment_files(projeto_root / "deployment", nome_projeto)
-        
-        print(f"✅ [DEBUG] Projeto gerado com sucesso!")
-        print(f"📍 [DEBUG] Localização: {projeto_root.absolute()}")
+        logger.debug(
+            "Agentes a gerar: %d, prompts: %d, ferramentas: %d",
+            len(arquitetura.get('agentes', [])), len(prompts), len(ferramentas),
+        )
         
-        return str(projeto_root.absolute())
+        saida = obter_saida_projeto()
+        if isinstance(saida, SaidaMemoria):
+            # O dict em memória não chega ao agente: só faz sentido via gerar_projeto
+            raise ValueError(
+                "MASS_DAS_SAIDA=memoria não se aplica a gerar_codigo_agentes "
+                "(use tools.gerar_projeto); escolha disco, tar ou zip"
+            )
+        resultado, plano = await _gerar_projeto(arquitetura, prompts, ferramentas, nome_projeto, saida)
+        descricao = f"{saida.descrever(nome_projeto, resultado)} ({descrever_plano(plano)})"
+        if isinstance(saida, SaidaArquivoCompactado):
+            arquivo = saida.nome_arquivo(nome_projeto)
+            versao = await tool_context.save_artifact(
+                arquivo, types.Part.from_bytes(data=resultado, mime_type=saida.tipo_mime),
+            )
+            descricao += f"; salvo como artefato {arquivo} (versão {versao})"
+        logger.info("Projeto gerado: %s", descricao)
+        
+        return descricao
         
     except Exception as e:
         error_msg = f"Erro na geração de código: {str(e)}"
-        print(f"❌ [DEBUG] {error_msg}")
+        logger.error(error_msg)
         return error_msg
 
 
-def gerar_pyproject_toml(projeto_root: Path, nome_projeto: str):
-    """Gera pyproject.toml baseado nos padrões oficiais"""
-    
-    conteudo = f'''[project]
-name = "{nome_projeto}"
-version = "0.1.0"
-description = "Agent system generated by MASS-DAS"
-authors = [{{ name = "MASS-DAS", email = "generated@mass-das.ai" }}]
-license = "Apache-2.0"
-readme = "README.md"
-requires-python = ">=3.9"
-dependencies = [
-    "google-adk>=1.2.1",
-    "python-dotenv>=1.1.0",
-    "pydantic>=2.0.0",
-    "asyncio-mqtt>=0.16.1",
-]
-
-[build-system]
-requires = ["setuptools>=61.0", "wheel"]
-build-backend = "setuptools.build_meta"
-
-[tool.setuptools.packages.find]
-include = ["{nome_projeto.replace('-', '_')}*"]
-'''
-    
-    (projeto_root / "pyproject.toml").write_text(conteudo, encoding='utf-8')
-    print(f"📝 [DEBUG] Gerado: pyproject.toml")
-
-
-def gerar_agent_principal(modulo_path: Path, arquitetura: dict, prompts: dict, ferramentas: list, modulo_nome: str):
-    """Gera o arquivo agent.py principal"""
-    
-    agentes = arquitetura.get("agentes", [])
-    padrao = arquitetura.get("padrao", "Sequential")
-    
-    # Gerar imports
-    imports = [
-        "from google.adk.agents import Agent",
-        "from .prompts import INSTRUCTION", 
-        "from .config import Config",
-        "from .tools.tools import ("
-    ]
-    
-    # Adicionar ferramentas aos imports
-    for ferramenta in ferramentas:
-        nome_func = ferramenta.get("nome_da_ferramenta", "")
-        if nome_func:
-            imports.append(f"    {nome_func},")
-    
-    imports.append(")")
-    
-    # Determinar tipo de agente baseado no padrão
-    if "Sequential" in padrao:
-        agent_type = "Agent"
-    elif "Coordinator" in padrao:
-        agent_type = "Agent"  # Coordinator é um Agent especial
-    elif "Parallel" in padrao:
-        agent_type = "Agent"
-    else:
-        agent_type = "Agent"
-    
-    # Gerar lista de ferramentas
-    tools_list = []
-    for ferramenta in ferramentas:
-        nome_func = ferramenta.get("nome_da_ferramenta", "")
-        if nome_func:
-            tools_list.append(f"        {nome_func},")
-    
-    conteudo = f'''"""
-Agent principal gerado pelo MASS-DAS
-Baseado no padrão: {padrao}
-Agentes especializados: {len(agentes)}
-"""
-
-{chr(10).join(imports)}
-
-configs = Config()
-
-root_agent = {agent_type}(
-    model=configs.agent_settings.model,
-    name=configs.agent_settings.name,
-    instruction=INSTRUCTION,
-    tools=[
-{chr(10).join(tools_list)}
-    ],
-)
-
-# Sub-agentes especializados baseados na arquitetura
-'''
-    
-    # Adicionar sub-agentes se for multi-agente
-    if len(agentes) > 1:
-        conteudo += "\n# Sub-agentes especializados\n"
-        for agente in agentes:
-            nome_agente = agente.get("nome", "").lower()
-            responsabilidade = agente.get("responsabilidade", "")
-            tipo_agente = agente.get("tipo", "LlmAgent")
-            
-            prompt_key = f"{nome_agente}_instruction"
-            
-            conteudo += f'''
-{nome_agente}_agent = Agent(
-    model=configs.agent_settings.model,
-    name="{nome_agente}",
-    instruction="""{responsabilidade}""",
-)
-'''
-    
-    (modulo_path / "agent.py").write_text(conteudo, encoding='utf-8')
-    print(f"📝 [DEBUG] Gerado: agent.py")
-
-
-def gerar_arquivo_prompts(modulo_path: Path, prompts: dict):
-    """Gera o arquivo prompts.py com system prompts"""
-    
-    conteudo = '''"""
-System prompts gerados pelo MASS-DAS
-Baseados na arquitetura projetada e otimizados para performance
-"""
-
-# Prompt principal do sistema
-INSTRUCTION = """
-Você é um sistema inteligente gerado pelo MASS-DAS.
-Sua arquitetura foi projetada automaticamente para resolver problemas específicos
-com alta eficiência e qualidade.
-
-Execute suas tarefas seguindo os princípios de design multi-agente:
-1. Foque na sua responsabilidade específica
-2. Use as ferramentas disponíveis adequadamente  
-3. Mantenha comunicação clara entre componentes
-4. Otimize performance e qualidade dos resultados
-
-Sempre forneça respostas estruturadas e acionáveis.
-"""
-'''
-    
-    # Adicionar prompts específicos dos agentes
-    if prompts:
-        conteudo += "\n\n# Prompts especializados dos agentes\n"
-        for nome_agente, prompt_texto in prompts.items():
-            nome_var = nome_agente.upper().replace(" ", "_") + "_INSTRUCTION"
-            conteudo += f'\n{nome_var} = """{prompt_texto}"""\n'
-    
-    (modulo_path / "prompts.py").write_text(conteudo, encoding='utf-8') 
-    print(f"📝 [DEBUG] Gerado: prompts.py")
-
-
-def gerar_arquivo_tools(tools_path: Path, ferramentas: list):
-    """Gera o arquivo tools.py com implementações das ferramentas"""
-    
-    conteudo = '''"""
-Ferramentas personalizadas geradas pelo MASS-DAS
-Implementações baseadas nas especificações da arquitetura
-"""
-
-import os
-import json
-import asyncio
-from datetime import datetime
-from typing import Dict, List, Any, Optional
-from pathlib import Path
-
-from google.adk.tools import ToolContext
-from google.adk.agents import Agent
-from google.adk.tools.agent_tool import AgentTool
-from google.adk.tools import google_search
-
-from dotenv import load_dotenv
+async def gerar_projeto(
+    arquitetura: dict,
+    prompts: dict,
+    ferramentas: list,
+    nome_projeto: str,
+    saida: Optional[SaidaProjeto] = None,
+):
+    """
+    Gera os arquivos do projeto e os emite pelo backend de saída.
 
-# Carregar variáveis de ambiente
-load_dotenv()
+    A geração e a emissão rodam numa thread de trabalho, sem bloquear o event loop.
 
-'''
-    
-    # Gerar implementações das ferramentas
-    for ferramenta in ferramentas:
-        nome_func = ferramenta.get("nome_da_ferramenta", "")
-        descricao = ferramenta.get("descricao", "")
-        argumentos = ferramenta.get("argumentos", {})
-        retorno = ferramenta.get("retorno", "string")
-        
-        if not nome_func:
-            continue
-        
-        # Gerar assinatura da função
-        params = []
-        for arg_nome, arg_tipo in argumentos.items():
-            if arg_tipo == "string":
-                params.append(f"{arg_nome}: str")
-            elif arg_tipo == "int":
-                params.append(f"{arg_nome}: int")
-            elif arg_tipo == "list":
-                params.append(f"{arg_nome}: List[Any]")
-            elif arg_tipo == "dict":
-                params.append(f"{arg_nome}: Dict[str, Any]")
-            else:
-                params.append(f"{arg_nome}: Any")
-        
-        # Adicionar ToolContext
-        params.append("tool_context: ToolContext")
-        
-        # Determinar tipo de retorno
-        if retorno.startswith("list"):
-            return_type = "List[Dict[str, Any]]"
-        elif retorno == "dict":
-            return_type = "Dict[str, Any]"
-        elif retorno == "int":
-            return_type = "int"
-        else:
-            return_type = "str"
-        
-        conteudo += f'''
-async def {nome_func}(
-    {', '.join(params)}
-) -> {return_type}:
-    """
-    {descricao}
-    
-    Args:
-        {chr(10).join(f"        {p.split(':')[0].strip()}: {p.split(':')[1].strip()}" for p in params[:-1])}
-        tool_context: Contexto da ferramenta ADK
-        
     Returns:
-        {return_type}: {descricao}
+        Resultado do backend: caminho (disco), {caminho: bytes} (memoria) ou bytes (tar/zip)
     """
-    try:
-        # TODO: Implementar lógica específica da ferramenta
-        # Esta é uma implementação base gerada automaticamente
-        
-        print(f"🔧 [DEBUG] Executando {nome_func}...")
-        
-        # Simular processamento (substituir por implementação real)
-        await asyncio.sleep(0.1)
-        
-        # Retorno padrão baseado no tipo esperado
-'''
-        
-        if return_type == "List[Dict[str, Any]]":
-            conteudo += f'''        return [{{"resultado": "Implementação de {nome_func} pendente", "status": "placeholder"}}]
-'''
-        elif return_type == "Dict[str, Any]":
-            conteudo += f'''        return {{"resultado": "Implementação de {nome_func} pendente", "status": "placeholder"}}
-'''
-        elif return_type == "int":
-            conteudo += f'''        return 1
-'''
-        else:
-            conteudo += f'''        return "Implementação de {nome_func} pendente - substitua por lógica real"
-'''
-        
-        conteudo += f'''        
-    except Exception as e:
-        error_msg = f"Erro em {nome_func}: {{str(e)}}"
-        print(f"❌ [DEBUG] {{error_msg}}")
-        return error_msg if return_type == "str" else {{"erro": error_msg}}
-
-'''
-    
-    # Adicionar ferramentas auxiliares padrão
-    conteudo += '''
-# Ferramentas auxiliares padrão
-
-def get_current_timestamp() -> Dict[str, str]:
-    """Obtém timestamp atual"""
-    return {
-        "timestamp": datetime.now().isoformat(),
-        "date": datetime.now().strftime("%Y-%m-%d"),
-        "time": datetime.now().strftime("%H:%M:%S")
-    }
-
-# Agente de busca (se necessário)
-search_agent = Agent(
-    model="gemini-2.5-pro-preview-06-05",
-    name="search_specialist",
-    instruction="Você é um especialista em pesquisa e busca de informações.",
-    tools=[google_search],
-)
-
-search_tool = AgentTool(search_agent)
-'''
-    
-    (tools_path / "tools.py").write_text(conteudo, encoding='utf-8')
-    print(f"📝 [DEBUG] Gerado: tools/tools.py")
-
-
-def gerar_arquivo_config(modulo_path: Path, nome_projeto: str):
-    """Gera arquivo de configuração"""
-    
-    conteudo = f'''"""
-Configurações do projeto {nome_projeto}
-Gerado automaticamente pelo MASS-DAS
-"""
-
-import os
-from dataclasses import dataclass
-from typing import Optional
-
-from dotenv import load_dotenv
-
-# Carregar variáveis de ambiente
-load_dotenv()
-
-@dataclass
-class AgentSettings:
-    """Configurações dos agentes"""
-    model: str = os.getenv("AGENT_MODEL", "gemini-2.5-pro-preview-06-05")
-    name: str = os.getenv("AGENT_NAME", "{nome_projeto.replace('-', '_')}_system")
-    temperature: float = float(os.getenv("AGENT_TEMPERATURE", "0.1"))
-    max_tokens: Optional[int] = None
-    
-@dataclass 
-class Config:
-    """Configuração principal do sistema"""
-    agent_settings: AgentSettings = AgentSettings()
-    debug: bool = os.getenv("DEBUG", "false").lower() == "true"
-    environment: str = os.getenv("ENVIRONMENT", "development")
-    
-    # APIs e integrações
-    gemini_api_key: str = os.getenv("GEMINI_API_KEY", "")
-    github_token: str = os.getenv("GITHUB_TOKEN", "")
-    
-    def __post_init__(self):
-        """Validações pós-inicialização"""
-        if not self.gemini_api_key:
-            raise ValueError("GEMINI_API_KEY é obrigatório")
-'''
-    
-    (modulo_path / "config.py").write_text(conteudo, encoding='utf-8')
-    print(f"📝 [DEBUG] Gerado: config.py")
-
-
-def gerar_init_files(modulo_path: Path):
-    """Gera arquivos __init__.py necessários"""
-    
-    # __init__.py principal do módulo
-    init_principal = f'''"""
-{modulo_path.name} - Sistema gerado pelo MASS-DAS
-"""
-
-from .agent import root_agent
-from .config import Config
-
-__version__ = "0.1.0"
-__all__ = ["root_agent", "Config"]
-'''
-    
-    (modulo_path / "__init__.py").write_text(init_principal, encoding='utf-8')
-    
-    # __init__.py do tools
-    init_tools = '''"""
-Ferramentas do sistema
-"""
-
-from .tools import *
-'''
-    
-    (modulo_path / "tools" / "__init__.py").write_text(init_tools, encoding='utf-8')
-    
-    print(f"📝 [DEBUG] Gerados: arquivos __init__.py")
-
-
-def gerar_readme(projeto_root: Path, nome_projeto: str, arquitetura: dict):
-    """Gera README.md do projeto"""
-    
-    agentes_count = len(arquitetura.get("agentes", []))
-    padrao = arquitetura.get("padrao", "Sequential")
-    
-    conteudo = f'''# {nome_projeto.title()}
-
-Sistema de agentes gerado automaticamente pelo **MASS-DAS v1.0.0**.
-
-## 📋 Visão Geral
-
-- **Padrão Arquitetural:** {padrao}
-- **Agentes Especializados:** {agentes_count}
-- **Framework:** Google ADK v1.0.0+
-- **Modelo:** Gemini 2.5 Pro Preview 06-05
-
-## 🚀 Quick Start
-
-1. **Instalar dependências:**
-   ```bash
-   pip install -e .
-   ```
-
-2. **Configurar ambiente:**
-   ```bash
-   cp .env.example .env
-   # Editar .env com suas chaves de API
-   ```
-
-3. **Executar sistema:**
-   ```bash
-   # CLI interativo
-   adk run {nome_projeto.replace('-', '_')}
-   
-   # Interface web  
-   adk web
-   ```
-
-## 🏗️ Arquitetura
-
-Este sistema foi projetado seguindo os princípios MASS:
-
-- **Decomposição Radical:** Cada agente tem responsabilidade única
-- **Otimização de Topologia:** {padrao} para máxima eficiência
-- **Modularidade:** Componentes reutilizáveis e testáveis
-
-### Agentes Especializados:
-
-'''
-    
-    # Adicionar lista de agentes
-    for i, agente in enumerate(arquitetura.get("agentes", []), 1):
-        nome = agente.get("nome", f"Agente_{i}")
-        responsabilidade = agente.get("responsabilidade", "")
-        tipo = agente.get("tipo", "Sequential")
-        
-        conteudo += f'''
-{i}. **{nome}** ({tipo})
-   - {responsabilidade}
-'''
-    
-    conteudo += f'''
-
-## 🔧 Configuração
-
-### Variáveis de Ambiente
-
-Crie um arquivo `.env` baseado no `.env.example`:
-
-```bash
-# APIs obrigatórias
-GEMINI_API_KEY=sua_chave_gemini_aqui
-
-# Configurações opcionais
-AGENT_MODEL=gemini-2.5-pro-preview-06-05
-DEBUG=true
-ENVIRONMENT=development
-```
-
-### Obter Chaves de API
-
-- **Gemini API:** https://makersuite.google.com/app/apikey
-- **GitHub Token:** https://github.com/settings/tokens (opcional)
-
-## 📚 Estrutura do Projeto
-
-```
-{nome_projeto}/
-├── {nome_projeto.replace('-', '_')}/          # Módulo principal
-│   ├── agent.py              # Agente principal
-│   ├── prompts.py            # System prompts
-│   ├── config.py             # Configurações
-│   └── tools/                # Ferramentas personalizadas
-├── deployment/               # Arquivos de deploy
-├── tests/                    # Testes automatizados
-└── eval/                     # Avaliação e métricas
-```
-
-## 🧪 Desenvolvimento
-
-### Executar Testes
-
-```bash
-pytest tests/
-```
-
-### Modificar Agentes
-
-1. Edite `prompts.py` para ajustar comportamentos
-2. Adicione ferramentas em `tools/tools.py`
-3. Configure novos parâmetros em `config.py`
-
-### Deploy
-
-```bash
-# Build da imagem
-docker build -t {nome_projeto} .
-
-# Deploy no Google Cloud Run
-gcloud run deploy {nome_projeto} --source .
-```
-
-## 📊 Monitoramento
-
-O sistema inclui logging automático e métricas de performance:
-
-- Logs estruturados para debug
-- Métricas de latência dos agentes
-- Monitoramento de uso de tokens
-- Alertas de erro automáticos
-
-## 🤝 Contribuição
-
-Este código foi gerado automaticamente pelo MASS-DAS. Para modificações:
-
-1. Edite a arquitetura no MASS-DAS
-2. Regenere o código
-3. Implemente lógicas específicas nas ferramentas
-4. Teste e valide
-
-## 📄 Licença
-
-Apache 2.0 - Gerado pelo MASS-DAS v1.0.0
-
----
-
-*Sistema gerado automaticamente - personalize conforme necessário*
-'''
-    
-    (projeto_root / "README.md").write_text(conteudo, encoding='utf-8')
-    print(f"📝 [DEBUG] Gerado: README.md")
-
-
-def gerar_env_example(projeto_root: Path):
-    """Gera arquivo .env.example"""
-    
-    conteudo = '''# Configurações do Sistema
-# ========================
-
-# Google Gemini API Key (obrigatório)
-# Obtenha em: https://makersuite.google.com/app/apikey
-GEMINI_API_KEY=sua_chave_gemini_aqui
-
-# Configurações do Agente
-AGENT_MODEL=gemini-2.5-pro-preview-06-05
-AGENT_NAME=generated_system
-AGENT_TEMPERATURE=0.1
-
-# Configurações Gerais
-DEBUG=true
-ENVIRONMENT=development
-
-# APIs Opcionais
-GITHUB_TOKEN=seu_token_github_aqui
-
-# Configurações de Deploy
-PORT=8080
-HOST=0.0.0.0
-'''
-    
-    (projeto_root / ".env.example").write_text(conteudo, encoding='utf-8')
-    print(f"📝 [DEBUG] Gerado: .env.example")
-
-
-def gerar_deployment_files(deployment_path: Path, nome_projeto: str):
-    """Gera arquivos de deployment"""
-    
-    # Dockerfile
-    dockerfile = f'''# Dockerfile gerado pelo MASS-DAS
-FROM python:3.11-slim
-
-WORKDIR /app
-
-# Instalar dependências do sistema
-RUN apt-get update && apt-get install -y \\
-    gcc \\
-    && rm -rf /var/lib/apt/lists/*
-
-# Copiar arquivos de dependências
-COPY pyproject.toml ./
-
-# Instalar dependências Python
-RUN pip install --no-cache-dir -e .
+    resultado, _ = await _gerar_projeto(arquitetura, prompts, ferramentas, nome_projeto, saida or obter_saida_projeto())
+    return resultado
+
+
+async def _gerar_projeto(arquitetura: dict, prompts: dict, ferramentas: list, nome_projeto: str,
+                         saida: SaidaProjeto) -> Tuple[object, Dict[str, List[str]]]:
+    """Geração incremental: só arquivos cujas entradas mudaram são renderizados e escritos"""
+    def gerar_e_emitir():
+        contexto = contexto_projeto(arquitetura, prompts, ferramentas, nome_projeto)
+        entradas = hashes_entrada(contexto)
+        plano = saida.planejar(nome_projeto, entradas)
+        apenas = None if len(plano["gerar"]) == len(entradas) else plano["gerar"]
+        arquivos = renderizar_arquivos(contexto, apenas)
+        diretorios = [renderizar(diretorio, contexto) for diretorio in DIRETORIOS_PROJETO]
+        return saida.emitir(nome_projeto, arquivos, diretorios, entradas), plano
+    
+    resultado, plano = await asyncio.to_thread(gerar_e_emitir)
+    if plano["modificados"]:
+        logger.warning(
+            "Projeto %s: arquivos editados manualmente preservados: %s",
+            nome_projeto, ", ".join(plano["modificados"]),
+        )
+    logger.debug("Projeto %s: %s", nome_projeto, descrever_plano(plano))
+    return resultado, plano
 
-# Copiar código da aplicação
-COPY . .
 
-# Expor porta
-EXPOSE 8080
+def gerar_arquivos_projeto(contexto: Dict) -> Dict[str, str]:
+    """
+    Conteúdo de cada arquivo do projeto, por caminho relativo (estrutura dos samples oficiais).
 
-# Comando de execução
-CMD ["adk", "web", "--host", "0.0.0.0", "--port", "8080"]
-'''
-    
-    (deployment_path / "Dockerfile").write_text(dockerfile, encoding='utf-8')
-    
-    # docker-compose.yml
-    docker_compose = f'''version: '3.8'
-
-services:
-  {nome_projeto.replace('-', '_')}:
-    build: ..
-    ports:
-      - "8080:8080"
-    environment:
-      - GEMINI_API_KEY=${{GEMINI_API_KEY}}
-      - ENVIRONMENT=production
-      - DEBUG=false
-    env_file:
-      - ../.env
-    restart: unless-stopped
-    
-  # Adicionar outros serviços conforme necessário
-  # (banco de dados, cache, etc.)
-'''
-    
-    (deployment_path / "docker-compose.yml").write_text(docker_compose, encoding='utf-8')
-    
-    print(f"📝 [DEBUG] Gerados: arquivos de deployment") 
\ No newline at end of file
+    Args:
+        contexto: Contexto do projeto (ver templates_projeto.contexto_projeto)
+    """
+    return renderizar_arquivos(contexto)
@@ -0,0 +1,491 @@
+"""
+Rastreamento de latência (spans) do MASS-DAS.
+
+Agentes, chamadas de modelo e ferramentas geram spans aninhados com início,
+fim, id de sessão e atributos (ex: tamanho dos argumentos e do resultado).
+O span corrente é propagado por `contextvars`, de modo que ferramentas
+chamadas dentro de um agente ficam aninhadas nele. Os spans finalizados são
+entregues a um exportador plugável: JSONL (padrão) ou OpenTelemetry.
+
+O exportador JSONL só enfileira os spans; uma thread de fundo os grava em
+lotes, fora do event loop, e rotaciona o arquivo acima de
+MASS_DAS_TRACES_MAX_MB (a geração anterior fica em `<arquivo>.1`).
+
+Resumo (caminho crítico da última execução e p50/p95 por etapa):
+    python -m mass_das.tracing [traces.jsonl]
+
+Comparação de latência e tokens por agente raiz (ex: modos llm x pipeline):
+    python -m mass_das.tracing comparar [traces.jsonl]
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import queue
+import atexit
+import inspect
+import logging
+import functools
+import threading
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from .cache import DIRETORIO_CACHE_PADRAO
+
+
+logger = logging.getLogger(__name__)
+
+# Exportador de spans: "jsonl" (padrão), "otel" ou "off"
+EXPORTADOR_PADRAO = os.getenv("MASS_DAS_TRACING", "jsonl").lower()
+ARQUIVO_TRACES = Path(os.getenv("MASS_DAS_TRACES_ARQUIVO", str(DIRETORIO_CACHE_PADRAO / "traces.jsonl")))
+# Tamanho a partir do qual o arquivo de traces é rotacionado (0 = sem rotação)
+TRACES_MAX_BYTES = int(float(os.getenv("MASS_DAS_TRACES_MAX_MB", "20")) * 1024 * 1024)
+
+
+@dataclass
+class Span:
+    """Intervalo de execução de uma etapa (agente, modelo ou ferramenta)"""
+    nome: str
+    tipo: str
+    trace_id: str
+    span_id: str = field(default_factory=lambda: uuid.uuid4().hex[:16])
+    pai_id: Optional[str] = None
+    sessao: Optional[str] = None
+    inicio: float = field(default_factory=time.time)
+    fim: Optional[float] = None
+    status: str = "ok"
+    atributos: Dict[str, Any] = field(default_factory=dict)
+    pai: Optional["Span"] = field(default=None, repr=False, compare=False)
+
+    def para_dict(self) -> Dict[str, Any]:
+        return {chave: valor for chave, valor in vars(self).items() if chave != "pai"}
+
+    @property
+    def duracao_ms(self) -> float:
+        return ((self.fim or time.time()) - self.inicio) * 1000
+
+
+class ExportadorJSONL:
+    """
+    Acrescenta os spans finalizados como linhas JSON em um arquivo.
+
+    `exportar` só enfileira o span; a serialização e a escrita, em lotes,
+    ficam numa thread de fundo. Quando o arquivo passa de `max_bytes` ele é
+    renomeado para `<arquivo>.1` (substituindo a rotação anterior).
+    """
+
+    def __init__(self, caminho: Path = ARQUIVO_TRACES, max_bytes: int = TRACES_MAX_BYTES):
+        self.caminho = Path(caminho)
+        self.max_bytes = max_bytes
+        self._fila: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._tamanho: Optional[int] = None
+        atexit.register(self.descarregar)
+
+    def iniciar(self, span: Span):
+        pass
+
+    def exportar(self, span: Span):
+        self._fila.put(span.para_dict())
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._executar, name="mass_das_traces", daemon=True,
+                    )
+                    self._thread.start()
+
+    def descarregar(self, timeout: float = 5.0) -> bool:
+        """Espera a gravação dos spans já enfileirados (chamado também na saída do processo)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._gravar(self._esvaziar([]))
+            return True
+        gravado = threading.Event()
+        self._fila.put(gravado)
+        return gravado.wait(timeout)
+
+    def _esvaziar(self, lote: List[Any]) -> List[Any]:
+        while True:
+            try:
+                lote.append(self._fila.get_nowait())
+            except queue.Empty:
+                return lote
+
+    def _executar(self):
+        while True:
+            lote = self._esvaziar([self._fila.get()])
+            try:
+                self._gravar(lote)
+            except Exception as e:
+                logger.warning("Falha ao gravar %d spans em %s: %s", len(lote), self.caminho, e)
+            for item in lote:
+                if isinstance(item, threading.Event):
+                    item.set()
+
+    def _gravar(self, lote: List[Any]):
+        linhas = "".join(
+            json.dumps(item, ensure_ascii=False, default=str) + "\n"
+            for item in lote if isinstance(item, dict)
+        )
+        if not linhas:
+            return
+        dados = linhas.encode("utf-8")
+        with self._lock:
+            if self._tamanho is None:
+                self.caminho.parent.mkdir(parents=True, exist_ok=True)
+                try:
+                    self._tamanho = self.caminho.stat().st_size
+                except FileNotFoundError:
+                    self._tamanho = 0
+            if self.max_bytes > 0 and self._tamanho and self._tamanho + len(dados) > self.max_bytes:
+                os.replace(self.caminho, self.caminho.with_name(self.caminho.name + ".1"))
+                self._tamanho = 0
+            with open(self.caminho, "ab") as arquivo:
+                arquivo.write(dados)
+            self._tamanho += len(dados)
+
+
+class ExportadorOpenTelemetry:
+    """Espelha os spans no SDK do OpenTelemetry (requer opentelemetry-api/sdk)"""
+
+    def __init__(self, nome_tracer: str = "mass_das"):
+        from opentelemetry import trace
+
+        self._trace = trace
+        self._tracer = trace.get_tracer(nome_tracer)
+        self._abertos: Dict[str, Any] = {}
+
+    def iniciar(self, span: Span):
+        pai = self._abertos.get(span.pai_id)
+        contexto = self._trace.set_span_in_context(pai) if pai is not None else None
+        self._abertos[span.span_id] = self._tracer.start_span(
+            span.nome, context=contexto, start_time=int(span.inicio * 1e9),
+            attributes={"mass_das.tipo": span.tipo, "mass_das.sessao": span.sessao or ""},
+        )
+
+    def exportar(self, span: Span):
+        otel_span = self._abertos.pop(span.span_id, None)
+        if otel_span is None:
+            return
+        for chave, valor in span.atributos.items():
+            if isinstance(valor, (str, bool, int, float)):
+                otel_span.set_attribute(f"mass_das.{chave}", valor)
+        if span.status != "ok":
+            otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, span.status))
+        otel_span.end(end_time=int(span.fim * 1e9))
+
+
+class _ExportadorNulo:
+    def iniciar(self, span: Span):
+        pass
+
+    def exportar(self, span: Span):
+        pass
+
+
+def _criar_exportador(nome: str):
+    if nome == "off":
+        return _ExportadorNulo()
+    if nome == "otel":
+        try:
+            return ExportadorOpenTelemetry()
+        except ImportError:
+            logger.warning("OpenTelemetry não instalado - exportando spans em JSONL")
+    return ExportadorJSONL()
+
+
+_exportador = _criar_exportador(EXPORTADOR_PADRAO)
+_span_atual: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("mass_das_span_atual", default=None)
+
+
+def configurar_exportador(exportador) -> None:
+    """Substitui o exportador de spans (qualquer objeto com iniciar/exportar)"""
+    global _exportador
+    _exportador = exportador
+
+
+def descarregar_traces() -> None:
+    """Grava os spans pendentes do exportador (antes de ler o arquivo no mesmo processo)"""
+    descarregar = getattr(_exportador, "descarregar", None)
+    if descarregar is not None:
+        descarregar()
+
+
+def span_atual() -> Optional[Span]:
+    return _span_atual.get()
+
+
+def iniciar_span(nome: str, tipo: str, sessao: Optional[str] = None, **atributos) -> Span:
+    """Abre um span filho do span corrente e o torna corrente"""
+    pai = _span_atual.get()
+    span = Span(
+        nome=nome,
+        tipo=tipo,
+        trace_id=pai.trace_id if pai is not None else uuid.uuid4().hex,
+        pai_id=pai.span_id if pai is not None else None,
+        sessao=sessao or (pai.sessao if pai is not None else None),
+        atributos=atributos,
+        pai=pai,
+    )
+    _span_atual.set(span)
+    _exportador.iniciar(span)
+    return span
+
+
+def finalizar_span(span: Span, status: str = "ok", **atributos):
+    """Fecha o span, restaura o pai como corrente e exporta"""
+    span.fim = time.time()
+    span.status = status
+    span.atributos.update(atributos)
+    if _span_atual.get() is span:
+        _span_atual.set(span.pai)
+    try:
+        _exportador.exportar(span)
+    except Exception as e:
+        logger.warning("Falha ao exportar span %s: %s", span.nome, e)
+
+
+@contextmanager
+def rastrear(nome: str, tipo: str = "etapa", **atributos) -> Iterator[Span]:
+    """Context manager que envolve um bloco em um span"""
+    span = iniciar_span(nome, tipo, **atributos)
+    try:
+        yield span
+    except BaseException as e:
+        finalizar_span(span, status=f"erro: {type(e).__name__}")
+        raise
+    finalizar_span(span)
+
+
+def _tamanho(valor: Any) -> int:
+    """Tamanho aproximado (em caracteres) sem serializar o valor"""
+    if isinstance(valor, (str, bytes)):
+        return len(valor)
+    if isinstance(valor, dict):
+        return sum(len(str(chave)) + _tamanho(item) for chave, item in valor.items())
+    if isinstance(valor, (list, tuple, set)):
+        return sum(_tamanho(item) for item in valor)
+    if valor is None or isinstance(valor, (bool, int, float)):
+        return len(str(valor))
+    return len(repr(valor))
+
+
+def _sessao_de(contexto: Any) -> Optional[str]:
+    sessao = getattr(contexto, "session", None)
+    return getattr(sessao, "id", None)
+
+
+def rastrear_ferramenta(funcao: Callable) -> Callable:
+    """
+    Decorator que registra um span por chamada da ferramenta.
+
+    Preserva nome, docstring e assinatura (functools.wraps), que o ADK usa
+    para montar a declaração da ferramenta.
+    """
+    assinatura = inspect.signature(funcao)
+
+    def _abrir(args, kwargs) -> Span:
+        argumentos = assinatura.bind_partial(*args, **kwargs).arguments
+        contexto = argumentos.pop("tool_context", None)
+        return iniciar_span(
+            funcao.__name__, "ferramenta",
+            sessao=_sessao_de(contexto),
+            tamanho_args=_tamanho(argumentos),
+        )
+
+    if inspect.iscoroutinefunction(funcao):
+        @functools.wraps(funcao)
+        async def wrapper(*args, **kwargs):
+            span = _abrir(args, kwargs)
+            try:
+                resultado = await funcao(*args, **kwargs)
+            except BaseException as e:
+                finalizar_span(span, status=f"erro: {type(e).__name__}")
+                raise
+            finalizar_span(span, tamanho_resultado=_tamanho(resultado))
+            return resultado
+    else:
+        @functools.wraps(funcao)
+        def wrapper(*args, **kwargs):
+            span = _abrir(args, kwargs)
+            try:
+                resultado = funcao(*args, **kwargs)
+            except BaseException as e:
+                finalizar_span(span, status=f"erro: {type(e).__name__}")
+                raise
+            finalizar_span(span, tamanho_resultado=_tamanho(resultado))
+            return resultado
+    return wrapper
+
+
+# ---------------------------------------------------------------------------
+# Resumo dos traces
+# ---------------------------------------------------------------------------
+
+def carregar_spans(caminho: Path = ARQUIVO_TRACES, max_bytes: int = 0) -> List[Dict]:
+    """
+    Spans gravados no arquivo; com `max_bytes`, só os do final do arquivo.
+
+    Linhas incompletas (corte do final lido ou gravação em curso) são ignoradas.
+    """
+    with open(caminho, "rb") as arquivo:
+        if max_bytes > 0:
+            arquivo.seek(0, os.SEEK_END)
+            inicio = max(arquivo.tell() - max_bytes, 0)
+            arquivo.seek(inicio)
+            if inicio:
+                arquivo.readline()
+        dados = arquivo.read()
+    spans = []
+    for linha in dados.split(b"\n"):
+        if not linha.strip():
+            continue
+        try:
+            spans.append(json.loads(linha))
+        except ValueError:
+            logger.debug("Linha de trace incompleta ignorada em %s", caminho)
+    return spans
+
+
+def caminho_critico(spans: List[Dict]) -> List[Dict]:
+    """
+    Caminho crítico de um trace.
+
+    Partindo do fim de cada span, volta no tempo escolhendo o filho que
+    terminou por último antes do limite corrente (o que bloqueou o pai) e
+    repete a partir do início dele; cada filho escolhido é expandido da mesma
+    forma. Retorna os spans do caminho em ordem, com o nível de aninhamento.
+    """
+    filhos: Dict[Optional[str], List[Dict]] = {}
+    for span in spans:
+        filhos.setdefault(span["pai_id"], []).append(span)
+    ids = {span["span_id"] for span in spans}
+    raizes = [span for span in spans if span["pai_id"] not in ids]
+    if not raizes:
+        return []
+
+    caminho: List[Dict] = []
+
+    def expandir(span: Dict, nivel: int):
+        caminho.append({**span, "nivel": nivel})
+        bloqueadores = []
+        limite = span["fim"]
+        candidatos = list(filhos.get(span["span_id"], []))
+        while True:
+            anteriores = [filho for filho in candidatos if filho["fim"] <= limite]
+            if not anteriores:
+                break
+            filho = max(anteriores, key=lambda s: s["fim"])
+            bloqueadores.append(filho)
+            candidatos.remove(filho)
+            limite = filho["inicio"]
+        for filho in reversed(bloqueadores):
+            expandir(filho, nivel + 1)
+
+    expandir(max(raizes, key=lambda s: s["fim"] - s["inicio"]), 0)
+    return caminho
+
+
+def _percentil(valores: List[float], percentil: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[int(percentil * (len(ordenados) - 1))]
+
+
+def resumir(spans: List[Dict]) -> Dict[str, Any]:
+    """Caminho crítico do trace mais recente e p50/p95 (ms) por etapa em todos os traces"""
+    por_trace: Dict[str, List[Dict]] = {}
+    duracoes: Dict[str, List[float]] = {}
+    for span in spans:
+        por_trace.setdefault(span["trace_id"], []).append(span)
+        duracoes.setdefault(f"{span['tipo']}:{span['nome']}", []).append((span["fim"] - span["inicio"]) * 1000)
+
+    ultimo = max(por_trace.values(), key=lambda grupo: max(s["fim"] for s in grupo)) if por_trace else []
+    return {
+        "execucoes": len(por_trace),
+        "caminho_critico": [
+            {
+                "etapa": f"{s['tipo']}:{s['nome']}",
+                "nivel": s["nivel"],
+                "duracao_ms": round((s["fim"] - s["inicio"]) * 1000, 1),
+            }
+            for s in caminho_critico(ultimo)
+        ],
+        "etapas": {
+            etapa: {
+                "n": len(valores),
+                "p50_ms": round(_percentil(valores, 0.50), 1),
+                "p95_ms": round(_percentil(valores, 0.95), 1),
+            }
+            for etapa, valores in sorted(duracoes.items(), key=lambda item: -sum(item[1]))
+        },
+    }
+
+
+def comparar_execucoes(spans: List[Dict]) -> Dict[str, Dict[str, float]]:
+    """
+    Métricas por agente raiz (ex: mass_das_system x mass_das_pipeline):
+    latência p50/p95 e médias de chamadas ao modelo e tokens por execução.
+
+    Agrupa por sessão: no modo coordenado cada transferência entre agentes
+    pode abrir um trace novo, mas a execução continua na mesma sessão.
+    """
+    por_execucao: Dict[str, List[Dict]] = {}
+    for span in spans:
+        por_execucao.setdefault(span.get("sessao") or span["trace_id"], []).append(span)
+
+    grupos: Dict[str, List[Dict[str, float]]] = {}
+    for grupo in por_execucao.values():
+        raiz = min((s for s in grupo if s["tipo"] == "agente"), key=lambda s: s["inicio"], default=None)
+        if raiz is None:
+            continue
+        # Respostas servidas pelo cache do modelo não contam como chamadas
+        modelo = [s for s in grupo if s["tipo"] == "modelo" and not s["atributos"].get("cache")]
+        grupos.setdefault(raiz["nome"], []).append({
+            "latencia_ms": (max(s["fim"] for s in grupo) - min(s["inicio"] for s in grupo)) * 1000,
+            "chamadas_modelo": len(modelo),
+            "tokens_entrada": sum(s["atributos"].get("tokens_entrada", 0) for s in modelo),
+            "tokens_saida": sum(s["atributos"].get("tokens_saida", 0) for s in modelo),
+        })
+
+    def media(execucoes: List[Dict[str, float]], chave: str) -> float:
+        return round(sum(e[chave] for e in execucoes) / len(execucoes), 1)
+
+    return {
+        nome: {
+            "execucoes": len(execucoes),
+            "p50_ms": round(_percentil([e["latencia_ms"] for e in execucoes], 0.50), 1),
+            "p95_ms": round(_percentil([e["latencia_ms"] for e in execucoes], 0.95), 1),
+            "chamadas_modelo": media(execucoes, "chamadas_modelo"),
+            "tokens_entrada": media(execucoes, "tokens_entrada"),
+            "tokens_saida": media(execucoes, "tokens_saida"),
+        }
+        for nome, execucoes in sorted(grupos.items())
+    }
+
+
+if __name__ == "__main__":
+    from .logs import configurar_logging
+
+    configurar_logging()
+    if len(sys.argv) > 1 and sys.argv[1] == "comparar":
+        arquivo_traces = Path(sys.argv[2]) if len(sys.argv) > 2 else ARQUIVO_TRACES
+        comparacao = comparar_execucoes(carregar_spans(arquivo_traces))
+        colunas = ["execucoes", "p50_ms", "p95_ms", "chamadas_modelo", "tokens_entrada", "tokens_saida"]
+        print(f"{'Agente raiz':<25}" + "".join(f"{coluna:>17}" for coluna in colunas))
+        for nome, metricas in comparacao.items():
+            print(f"{nome:<25}" + "".join(f"{metricas[coluna]:>17}" for coluna in colunas))
+        sys.exit(0)
+
+    arquivo_traces = Path(sys.argv[1]) if len(sys.argv) > 1 else ARQUIVO_TRACES
+    resumo = resumir(carregar_spans(arquivo_traces))
+    print(f"Execuções: {resumo['execucoes']}\n")
+    print("Caminho crítico (execução mais recente):")
+    for etapa in resumo["caminho_critico"]:
+        print(f"  {'  ' * etapa['nivel']}{etapa['etapa']}  {etapa['duracao_ms']:.1f} ms")
+    print(f"\n{'Etapa':<50} {'n':>5} {'p50 ms':>10} {'p95 ms':>10}")
+    for etapa, metricas in resumo["etapas"].items():
+        print(f"{etapa:<50} {metricas['n']:>5} {metricas['p50_ms']:>10.1f} {metricas['p95_ms']:>10.1f}")
@@ -0,0 +1,94 @@
+"""
+Fixtures compartilhadas dos testes do MASS-DAS.
+
+O ambiente é ajustado antes de importar o pacote: sem traces nem cache HTTP
+em disco, para que os testes não leiam nem gravem em `.mass_das_cache/`.
+"""
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Tuple
+
+os.environ["MASS_DAS_TRACING"] = "off"
+os.environ["GITHUB_CACHE"] = "false"
+os.environ.pop("GITHUB_TOKEN", None)
+
+import pytest
+
+from mass_das import github
+from mass_das.rate_limit import AgendadorRequisicoes
+
+
+class ServidorLocal:
+    """
+    Servidor HTTP numa thread, para os testes do cliente GitHub.
+
+    `rotas` mapeia o caminho (sem query string) para uma função que recebe o
+    handler e escreve a resposta; caminhos sem rota respondem 404.
+    """
+
+    def __init__(self):
+        self.rotas: Dict[str, Callable[[BaseHTTPRequestHandler], None]] = {}
+        self.requisicoes: List[Tuple[str, Dict[str, str]]] = []
+        servidor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                servidor.requisicoes.append((self.path, dict(self.headers)))
+                rota = servidor.rotas.get(self.path.split("?", 1)[0])
+                if rota is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                rota(self)
+
+            def log_message(self, formato, *args):
+                pass
+
+        self._http = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._http.daemon_threads = True
+        self._thread = threading.Thread(target=self._http.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._http.server_port}"
+
+    def caminhos(self) -> List[str]:
+        return [caminho for caminho, _ in self.requisicoes]
+
+    def iniciar(self) -> "ServidorLocal":
+        self._thread.start()
+        return self
+
+    def parar(self):
+        self._http.shutdown()
+        self._http.server_close()
+
+
+def responder(handler: BaseHTTPRequestHandler, corpo: bytes, status: int = 200,
+              headers: Dict[str, str] = None):
+    """Escreve uma resposta completa (com Content-Length) no handler"""
+    handler.send_response(status)
+    for nome, valor in {"Content-Length": str(len(corpo)), **(headers or {})}.items():
+        handler.send_header(nome, valor)
+    handler.end_headers()
+    handler.wfile.write(corpo)
+
+
+@pytest.fixture
+def servidor():
+    servidor = ServidorLocal().iniciar()
+    yield servidor
+    servidor.parar()
+
+
+@pytest.fixture
+def cliente_github(monkeypatch):
+    """Cliente GitHub do processo sem cache em disco e sem esperas de backoff"""
+    cliente = github.ClienteGitHub(cache=None, agendador=AgendadorRequisicoes(backoff_base=0.01))
+    monkeypatch.setattr(github, "_cliente", cliente)
+    yield cliente
+    cliente.fechar()
@@ -0,0 +1,55 @@
+"""
+Ondas, dependências e caminho crítico do pipeline a partir de CONTRATOS_ESTADO.
+"""
+import pytest
+
+from mass_das.agendador import Etapa, caminho_critico, dependencias, etapas_padrao, ondas
+
+
+def _nomes(lista_ondas):
+    return [sorted(etapa.nome for etapa in onda) for onda in lista_ondas]
+
+
+def _etapa(nome, le, escreve):
+    return Etapa(nome, le, escreve, fabrica=lambda: None)
+
+
+def test_ondas_dos_contratos_de_estado():
+    etapas = etapas_padrao()
+    deps = dependencias(etapas)
+    assert deps["analista_requisitos"] == set()
+    assert deps["definidor_ferramentas"] == {"arquiteto_coordenador", "especialista_prompts"}
+    assert deps["publicador_documento"] == {"compilador_documentacao", "otimizador_arquitetura"}
+
+    assert _nomes(ondas(etapas)) == [
+        ["analista_requisitos"],
+        ["arquiteto_coordenador"],
+        ["especialista_prompts"],
+        ["definidor_ferramentas"],
+        ["compilador_documentacao", "gerador_codigo"],
+        ["otimizador_arquitetura"],
+        ["publicador_documento"],
+    ]
+
+
+def test_caminho_critico_ponderado_pelas_duracoes():
+    etapas = etapas_padrao()
+    caminho, total = caminho_critico(etapas)
+    # Sem medições: o caminho mais longo em número de etapas
+    assert total == 7
+    assert caminho[-2:] == ["otimizador_arquitetura", "publicador_documento"]
+
+    # Gerador muito lento: ele passa a ser o fim do caminho crítico
+    duracoes = {etapa.nome: 10.0 for etapa in etapas}
+    duracoes["gerador_codigo"] = 100.0
+    caminho, total = caminho_critico(etapas, duracoes)
+    assert caminho == ["analista_requisitos", "arquiteto_coordenador", "especialista_prompts",
+                       "definidor_ferramentas", "gerador_codigo"]
+    assert total == 140.0
+
+
+def test_contratos_invalidos():
+    with pytest.raises(ValueError, match="escrita por"):
+        dependencias([_etapa("a", (), "x"), _etapa("b", (), "x")])
+    with pytest.raises(ValueError, match="circular"):
+        ondas([_etapa("a", ("y",), "x"), _etapa("b", ("x",), "y")])
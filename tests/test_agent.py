@@ -0,0 +1,49 @@
+"""
+Escolha do agente raiz por MASS_DAS_MODO.
+"""
+import sys
+import importlib
+
+import pytest
+from google.adk.agents import ParallelAgent, SequentialAgent
+
+
+def _importar_agent(monkeypatch, modo):
+    monkeypatch.setenv("MASS_DAS_MODO", modo)
+    sys.modules.pop("mass_das.agent", None)
+    return importlib.import_module("mass_das.agent")
+
+
+def _folhas(agente):
+    if not agente.sub_agents:
+        return [agente]
+    return [folha for filho in agente.sub_agents for folha in _folhas(filho)]
+
+
+def test_modo_llm_mantem_o_coordenador(monkeypatch):
+    agent = _importar_agent(monkeypatch, "llm")
+    assert agent.root_agent.name == "mass_das_system"
+
+    sub_agentes = {sub.name: sub for sub in agent.root_agent.sub_agents}
+    assert "gerador_codigo" in sub_agentes
+    # Sem contratos de estado nem ferramentas extras: os sub-agentes de antes do pipeline
+    assert all(sub.output_key is None for sub in sub_agentes.values())
+    assert sub_agentes["gerador_codigo"].tools == []
+
+
+def test_modo_pipeline_monta_as_ondas(monkeypatch):
+    agent = _importar_agent(monkeypatch, "pipeline")
+    raiz = agent.root_agent
+    assert isinstance(raiz, SequentialAgent)
+    assert raiz.name == "mass_das_pipeline"
+    assert any(isinstance(grupo, ParallelAgent) for grupo in raiz.sub_agents)
+
+    folhas = {folha.name: folha for folha in _folhas(raiz)}
+    assert folhas["analista_requisitos"].output_key
+    assert folhas["gerador_codigo"].tools
+
+
+def test_modo_invalido(monkeypatch):
+    with pytest.raises(ValueError, match="MASS_DAS_MODO"):
+        _importar_agent(monkeypatch, "sequencial")
+    sys.modules.pop("mass_das.agent", None)
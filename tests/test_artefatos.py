@@ -0,0 +1,54 @@
+"""
+Armazém de artefatos: deduplicação de blobs e preservação de edições.
+"""
+from mass_das.artefatos import ArmazemArtefatos, ler_manifesto_projeto
+
+
+def _armazem(tmp_path, **kwargs):
+    return ArmazemArtefatos(tmp_path / "armazem", usar_reflink=False, threads=1, **kwargs)
+
+
+def test_arquivos_identicos_entre_projetos_viram_um_blob(tmp_path):
+    armazem = _armazem(tmp_path)
+    comuns = {"README.md": "# Projeto\n", "Dockerfile": "FROM python:3.11\n"}
+
+    primeiro = armazem.gravar_projeto(tmp_path / "a", {**comuns, "agent.py": "root_agent = 'a'\n"})
+    segundo = armazem.gravar_projeto(tmp_path / "b", {**comuns, "agent.py": "root_agent = 'b'\n"})
+
+    assert primeiro["blobs_novos"] == 3
+    assert segundo["blobs_novos"] == 1 and segundo["reutilizados"] == 2
+    assert armazem.estatisticas()["blobs"] == 4
+    # Cada projeto recebe a sua cópia: editar uma não altera o blob nem o outro projeto
+    (tmp_path / "a" / "README.md").write_text("# Editado\n", encoding="utf-8")
+    hash_readme = ler_manifesto_projeto(tmp_path / "b")["arquivos"]["README.md"]["sha256"]
+    assert armazem.caminho_blob(hash_readme).read_text(encoding="utf-8") == "# Projeto\n"
+    assert (tmp_path / "b" / "README.md").read_text(encoding="utf-8") == "# Projeto\n"
+
+
+def test_regeneracao_preserva_arquivos_editados(tmp_path):
+    armazem = _armazem(tmp_path)
+    projeto = tmp_path / "projeto"
+    armazem.gravar_projeto(projeto, {
+        "README.md": "# Projeto\n",
+        "tools/busca.py": "def buscar(): ...\n",
+        "tools/extra.py": "def extra(): ...\n",
+    })
+    (projeto / "tools" / "busca.py").write_text("def buscar(): return 'meu'\n", encoding="utf-8")
+
+    # Nova geração sem os dois arquivos de tools/: o intacto sai, o editado fica
+    armazem.gravar_projeto(projeto, {"README.md": "# Projeto v2\n"})
+
+    assert (projeto / "tools" / "busca.py").read_text(encoding="utf-8") == "def buscar(): return 'meu'\n"
+    assert not (projeto / "tools" / "extra.py").exists()
+    assert (projeto / "README.md").read_text(encoding="utf-8") == "# Projeto v2\n"
+
+
+def test_coleta_remove_so_blobs_sem_referencia(tmp_path):
+    armazem = _armazem(tmp_path)
+    projeto = tmp_path / "projeto"
+    armazem.gravar_projeto(projeto, {"README.md": "# v1\n", "LICENSE": "MIT\n"})
+    armazem.gravar_projeto(projeto, {"README.md": "# v2\n", "LICENSE": "MIT\n"})
+
+    assert armazem.coletar_lixo()["blobs_removidos"] == 1
+    for registro in ler_manifesto_projeto(projeto)["arquivos"].values():
+        assert armazem.caminho_blob(registro["sha256"]).exists()
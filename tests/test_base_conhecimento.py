@@ -0,0 +1,52 @@
+"""
+Recarga incremental da base de arquiteturas.
+"""
+import os
+import json
+
+from mass_das.base_conhecimento import BaseArquiteturas
+
+
+def _gravar(caminho, conteudo, mtime):
+    caminho.write_text(conteudo, encoding="utf-8")
+    os.utime(caminho, (mtime, mtime))
+
+
+def test_falha_de_leitura_mantem_as_entradas_anteriores(tmp_path):
+    arquivo = tmp_path / "triagem.json"
+    _gravar(arquivo, json.dumps({"nome": "Triagem de Chamados", "descricao": "roteia chamados de suporte"}), 1000)
+    base = BaseArquiteturas(tmp_path)
+    assert any(a["nome"] == "Triagem de Chamados" for a in base.buscar("triagem de chamados de suporte"))
+
+    # Arquivo truncado no meio de uma gravação
+    _gravar(arquivo, '{"nome": "Triagem', 2000)
+    assert base.recarregar(forcar=True) == {"adicionados": 0, "atualizados": 0, "removidos": 0}
+    assert any(a["nome"] == "Triagem de Chamados" for a in base.buscar("triagem de chamados de suporte"))
+
+    # Gravação concluída: a nova versão substitui a anterior
+    _gravar(arquivo, json.dumps({"nome": "Triagem v2", "descricao": "roteia chamados de suporte"}), 3000)
+    assert base.recarregar(forcar=True)["atualizados"] == 1
+    nomes = [a["nome"] for a in base.buscar("triagem de chamados de suporte")]
+    assert "Triagem v2" in nomes and "Triagem de Chamados" not in nomes
+
+
+def test_recarga_pondera_so_os_blocos_novos_ate_a_deriva_do_idf(tmp_path, monkeypatch):
+    _gravar(tmp_path / "triagem.json", json.dumps({"nome": "Triagem", "descricao": "roteia chamados de suporte"}), 1000)
+    _gravar(tmp_path / "faturas.json", json.dumps({"nome": "Faturas", "descricao": "extrai dados de faturas"}), 1000)
+    base = BaseArquiteturas(tmp_path)
+    bloco_triagem = base._arquivos[str(tmp_path / "triagem.json")].bloco
+
+    monkeypatch.setattr("mass_das.base_conhecimento.LIMITE_DERIVA_IDF", float("inf"))
+    _gravar(tmp_path / "agenda.json", json.dumps({"nome": "Agenda", "descricao": "marca consultas medicas"}), 1000)
+    assert base.recarregar(forcar=True)["adicionados"] == 1
+    assert base._arquivos[str(tmp_path / "triagem.json")].bloco is bloco_triagem
+    assert base.buscar("consultas medicas")[0]["nome"] == "Agenda"
+
+    # Deriva acima do limite: todos os blocos são reponderados com o IDF atual
+    monkeypatch.setattr("mass_das.base_conhecimento.LIMITE_DERIVA_IDF", 0.0)
+    _gravar(tmp_path / "estoque.json", json.dumps({"nome": "Estoque", "descricao": "controla estoque"}), 1000)
+    base.recarregar(forcar=True)
+    assert base._arquivos[str(tmp_path / "triagem.json")].bloco is not bloco_triagem
+    completa = BaseArquiteturas(tmp_path)
+    assert [a["nome"] for a in base.buscar("chamados de suporte")] == [a["nome"] for a in completa.buscar("chamados de suporte")]
+    assert base.buscar("chamados de suporte")[0]["score"] == completa.buscar("chamados de suporte")[0]["score"]
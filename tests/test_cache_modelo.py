@@ -0,0 +1,74 @@
+"""
+Chave das requisições ao modelo e modos do cache de respostas.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+
+from mass_das.cache import CacheDisco
+from mass_das.cache_modelo import CacheModelo, RespostaAusenteNoCache, chave_requisicao
+
+
+def _requisicao(id_chamada="adk-1", busca_completa=True, modelo="gemini-2.5-flash", temperatura=0.2):
+    return LlmRequest(
+        model=modelo,
+        config=types.GenerateContentConfig(
+            system_instruction="Você é o analista.",
+            temperature=temperatura,
+            labels={"execucao": id_chamada},
+        ),
+        contents=[
+            types.Content(role="user", parts=[types.Part(text="Projete um agente de triagem")]),
+            types.Content(role="model", parts=[types.Part(function_call=types.FunctionCall(
+                id=id_chamada, name="consultar_samples_adk_github", args={"query": "triagem"},
+            ))]),
+            types.Content(role="user", parts=[types.Part(function_response=types.FunctionResponse(
+                id=id_chamada, name="consultar_samples_adk_github",
+                response={"samples_encontrados": ["customer-service"], "busca_completa": busca_completa},
+            ))]),
+        ],
+    )
+
+
+def _contexto(agente="analista_requisitos", invocacao="inv-1"):
+    return SimpleNamespace(agent_name=agente, invocation_id=invocacao)
+
+
+def test_chave_ignora_ids_rotulos_e_campos_volateis():
+    base = chave_requisicao(_requisicao())
+    assert chave_requisicao(_requisicao(id_chamada="adk-2", busca_completa=False)) == base
+    # O modelo da política substitui o escolhido pelo roteador
+    assert chave_requisicao(_requisicao(modelo="gemini-2.5-pro"), "gemini-2.5-flash") == base
+
+    assert chave_requisicao(_requisicao(temperatura=0.9)) != base
+    assert chave_requisicao(_requisicao(), "gemini-2.5-pro") != base
+
+
+def test_modo_on_grava_e_replay_responde_do_cache(tmp_path):
+    disco = CacheDisco(tmp_path / "modelo.sqlite3", ttl_segundos=float("inf"))
+    resposta = LlmResponse(content=types.Content(role="model", parts=[types.Part(text="requisitos")]))
+
+    async def gravar():
+        cache = CacheModelo(disco, modo="on")
+        assert await cache.consultar(_contexto(), _requisicao()) is None
+        await cache.gravar(_contexto(), resposta)
+
+    asyncio.run(gravar())
+
+    replay = CacheModelo(disco, modo="replay")
+    repetida = asyncio.run(replay.consultar(_contexto(invocacao="inv-2"), _requisicao(id_chamada="adk-9")))
+    assert repetida.content.parts[0].text == "requisitos"
+
+
+def test_replay_sem_resposta_interrompe(tmp_path):
+    replay = CacheModelo(CacheDisco(tmp_path / "modelo.sqlite3"), modo="replay")
+    with pytest.raises(RespostaAusenteNoCache, match="analista_requisitos"):
+        asyncio.run(replay.consultar(_contexto(), _requisicao()))
+
+
+def test_modo_invalido():
+    with pytest.raises(ValueError, match="MASS_DAS_CACHE_MODELO"):
+        CacheModelo(None, modo="sempre")
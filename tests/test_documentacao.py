@@ -0,0 +1,23 @@
+"""
+Corpus offline da documentação do ADK.
+"""
+from mass_das.documentacao import CorpusDocumentacao, ingerir_documentacao
+
+
+def test_corpus_removido_vira_ausencia_de_corpus(tmp_path):
+    origem = tmp_path / "adk-docs"
+    origem.mkdir()
+    (origem / "tools.md").write_text("# Tools\nFerramentas recebem ToolContext.\n", encoding="utf-8")
+    destino = tmp_path / "corpus.json"
+    ingerir_documentacao(origem, destino)
+
+    corpus = CorpusDocumentacao(destino)
+    assert corpus.versao()
+    assert corpus.buscar("ToolContext")
+
+    destino.unlink()
+    assert corpus.versao() is None
+    assert corpus.buscar("ToolContext") == []
+
+    ingerir_documentacao(origem, destino)
+    assert corpus.versao()
@@ -0,0 +1,86 @@
+"""
+Escrita atômica e lock de arquivo.
+"""
+import os
+import time
+import threading
+import multiprocessing
+
+import pytest
+
+from mass_das.escrita import bloqueio_arquivo, escrever_atomico
+
+
+def test_escrita_substitui_o_arquivo_sem_deixar_temporarios(tmp_path):
+    destino = tmp_path / "docs" / "ARQUITETURA.md"
+    assert escrever_atomico(destino, ["# Arquitetura\r\n", "Agente raiz\n"]) == 27
+    assert destino.read_bytes() == b"# Arquitetura\r\nAgente raiz\n"
+
+    escrever_atomico(destino, [b"binario"], encoding=None)
+    assert destino.read_bytes() == b"binario"
+    assert os.listdir(destino.parent) == ["ARQUITETURA.md"]
+
+
+def test_falha_no_meio_da_escrita_preserva_o_arquivo_anterior(tmp_path):
+    destino = tmp_path / "ARQUITETURA.md"
+    escrever_atomico(destino, ["versão completa\n"])
+
+    def partes():
+        yield "versão nova pela metade"
+        raise RuntimeError("gerador interrompido")
+
+    with pytest.raises(RuntimeError):
+        escrever_atomico(destino, partes())
+    assert destino.read_text(encoding="utf-8") == "versão completa\n"
+    assert os.listdir(tmp_path) == ["ARQUITETURA.md"]
+
+
+def test_lock_serializa_threads(tmp_path):
+    caminho = tmp_path / "manifesto.json"
+    dentro, maximo = [0], [0]
+
+    def trabalhar():
+        with bloqueio_arquivo(caminho):
+            dentro[0] += 1
+            maximo[0] = max(maximo[0], dentro[0])
+            time.sleep(0.01)
+            dentro[0] -= 1
+
+    threads = [threading.Thread(target=trabalhar) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert maximo[0] == 1
+
+
+def _segurar_lock(caminho, pronto, liberar):
+    with bloqueio_arquivo(caminho):
+        pronto.set()
+        liberar.wait(5)
+
+
+@pytest.mark.skipif(os.name != "posix", reason="flock entre processos só em POSIX")
+def test_lock_exclui_outros_processos(tmp_path):
+    caminho = tmp_path / "manifesto.json"
+    contexto = multiprocessing.get_context("fork")
+    pronto, liberar = contexto.Event(), contexto.Event()
+    processo = contexto.Process(target=_segurar_lock, args=(caminho, pronto, liberar))
+    processo.start()
+    try:
+        assert pronto.wait(5)
+        adquirido = threading.Event()
+
+        def adquirir():
+            with bloqueio_arquivo(caminho):
+                adquirido.set()
+
+        thread = threading.Thread(target=adquirir)
+        thread.start()
+        assert not adquirido.wait(0.2)
+        liberar.set()
+        thread.join(5)
+        assert adquirido.is_set()
+    finally:
+        liberar.set()
+        processo.join(5)
@@ -0,0 +1,53 @@
+"""
+Geração incremental de projetos: só arquivos com entradas alteradas são regerados.
+"""
+import asyncio
+
+from mass_das import tools
+from mass_das.artefatos import ArmazemArtefatos
+from mass_das.saida import SaidaDisco
+
+ARQUITETURA = {"padrao": "Sequential", "agentes": [{"nome": "Analista", "responsabilidade": "Analisa requisitos"}]}
+PROMPTS = {"analista": "Você é um analista."}
+FERRAMENTAS = [{"nome_da_ferramenta": "buscar", "descricao": "Busca dados",
+                "argumentos": {"consulta": "string"}, "retorno": "list"}]
+
+
+def _gerar(saida, prompts=PROMPTS, ferramentas=FERRAMENTAS):
+    _, plano = asyncio.run(tools._gerar_projeto(ARQUITETURA, prompts, ferramentas, "meu-projeto", saida))
+    return plano
+
+
+def _saida(tmp_path):
+    return SaidaDisco(tmp_path / "output", ArmazemArtefatos(tmp_path / "armazem", usar_reflink=False, threads=1))
+
+
+def test_regera_apenas_os_arquivos_com_entradas_alteradas(tmp_path):
+    saida = _saida(tmp_path)
+    primeiro = _gerar(saida)
+    assert "meu_projeto/prompts.py" in primeiro["gerar"] and not primeiro["inalterados"]
+
+    repetido = _gerar(saida)
+    assert repetido["gerar"] == []
+    assert sorted(repetido["inalterados"]) == sorted(primeiro["gerar"])
+
+    assert _gerar(saida, prompts={"analista": "Você é um analista sênior."})["gerar"] == ["meu_projeto/prompts.py"]
+    novas = FERRAMENTAS + [{"nome_da_ferramenta": "salvar", "descricao": "Salva", "argumentos": {}, "retorno": "str"}]
+    plano = _gerar(saida, prompts={"analista": "Você é um analista sênior."}, ferramentas=novas)
+    assert sorted(plano["gerar"]) == ["meu_projeto/agent.py", "meu_projeto/tools/tools.py"]
+    assert "salvar" in (tmp_path / "output" / "meu-projeto" / "meu_projeto" / "tools" / "tools.py").read_text()
+
+
+def test_arquivo_editado_nao_e_sobrescrito(tmp_path):
+    saida = _saida(tmp_path)
+    _gerar(saida)
+    prompts_py = tmp_path / "output" / "meu-projeto" / "meu_projeto" / "prompts.py"
+    prompts_py.write_text("# ajustado à mão\n", encoding="utf-8")
+
+    plano = _gerar(saida, prompts={"analista": "Outro prompt."})
+    assert plano["modificados"] == ["meu_projeto/prompts.py"]
+    assert "meu_projeto/prompts.py" not in plano["gerar"]
+    assert prompts_py.read_text(encoding="utf-8") == "# ajustado à mão\n"
+    # O arquivo editado continua no manifesto e não é removido na geração seguinte
+    assert _gerar(saida, prompts={"analista": "Outro prompt."})["modificados"] == ["meu_projeto/prompts.py"]
+    assert prompts_py.exists()
@@ -0,0 +1,202 @@
+"""
+Crawl do adk-samples contra um servidor local (GITHUB_API_URL/GITHUB_RAW_URL).
+"""
+import json
+import asyncio
+import threading
+
+import pytest
+
+from mass_das import tools
+from conftest import responder
+
+
+REPOSITORIO = "google/adk-samples"
+
+ARVORE = {
+    "truncated": False,
+    "tree": [
+        {"path": "python", "type": "tree"},
+        {"path": "python/agents", "type": "tree"},
+        {"path": "python/agents/suporte", "type": "tree"},
+        {"path": "python/agents/suporte/README.md", "type": "blob"},
+        {"path": "python/agents/suporte/agent.py", "type": "blob"},
+        {"path": "python/agents/suporte/tools", "type": "tree"},
+        {"path": "python/agents/suporte/tools/busca.py", "type": "blob"},
+        {"path": "java/agents/clima", "type": "tree"},
+        {"path": "java/agents/clima/pom.xml", "type": "blob"},
+        {"path": "docs/README.md", "type": "blob"},
+    ],
+}
+
+
+def _publicar_repositorio(servidor, arvore=ARVORE):
+    servidor.rotas[f"/api/repos/{REPOSITORIO}/git/trees/{tools.REF_SAMPLES}"] = (
+        lambda handler: responder(handler, json.dumps(arvore).encode(), headers={
+            "Content-Type": "application/json",
+        })
+    )
+    servidor.rotas[f"/raw/{REPOSITORIO}/{tools.REF_SAMPLES}/python/agents/suporte/README.md"] = (
+        lambda handler: responder(handler, "# Suporte\nAgente de triagem de chamados".encode())
+    )
+
+
+def _usar_servidor(monkeypatch, servidor):
+    monkeypatch.setattr(tools, "GITHUB_API_URL", f"{servidor.url}/api")
+    monkeypatch.setattr(tools, "GITHUB_RAW_URL", f"{servidor.url}/raw")
+    monkeypatch.setattr(tools, "MODO_CRAWL", "arvore")
+
+
+async def _coletar(query: str):
+    return [sample async for sample in tools.buscar_samples_streaming(query, "geral")]
+
+
+def test_crawl_por_arvore_usa_os_enderecos_configurados(servidor, cliente_github, monkeypatch):
+    _usar_servidor(monkeypatch, servidor)
+    _publicar_repositorio(servidor)
+
+    samples = asyncio.run(_coletar("triagem de chamados"))
+
+    por_nome = {sample["nome"]: sample for sample in samples}
+    assert set(por_nome) == {"suporte", "clima"}
+    assert por_nome["suporte"]["linguagem"] == "python"
+    assert por_nome["suporte"]["arquivos"] == ["README.md", "agent.py"]
+    assert por_nome["suporte"]["estrutura"] == "tools/ "
+    assert por_nome["suporte"]["readme_conteudo"].startswith("# Suporte")
+    assert por_nome["clima"]["linguagem"] == "java"
+    assert por_nome["suporte"]["relevance_score"] > por_nome["clima"]["relevance_score"]
+
+    # Uma chamada à API para a árvore inteira; o README vem do endereço raw
+    caminhos = servidor.caminhos()
+    assert caminhos[0] == f"/api/repos/{REPOSITORIO}/git/trees/{tools.REF_SAMPLES}?recursive=1"
+    assert sum(caminho.startswith("/api/") for caminho in caminhos) == 1
+    assert f"/raw/{REPOSITORIO}/{tools.REF_SAMPLES}/python/agents/suporte/README.md" in caminhos
+
+
+def test_arvore_truncada_cai_no_crawl_por_diretorios(servidor, cliente_github, monkeypatch):
+    _usar_servidor(monkeypatch, servidor)
+    _publicar_repositorio(servidor, dict(ARVORE, truncated=True))
+    servidor.rotas[f"/api/repos/{REPOSITORIO}/contents/python/agents"] = lambda handler: responder(
+        handler, json.dumps([{"name": "suporte", "type": "dir"}]).encode(),
+    )
+    servidor.rotas[f"/api/repos/{REPOSITORIO}/contents/python/agents/suporte"] = lambda handler: responder(
+        handler, json.dumps([
+            {"name": "agent.py", "type": "file", "download_url": None},
+            {"name": "tools", "type": "dir"},
+        ]).encode(),
+    )
+
+    samples = asyncio.run(_coletar("suporte"))
+
+    assert [sample["nome"] for sample in samples] == ["suporte"]
+    assert samples[0]["estrutura"] == "tools/ "
+    assert f"/api/repos/{REPOSITORIO}/contents/java/agents" in servidor.caminhos()
+
+
+# README grande: 32 MB, com um caractere multibyte cortado no limite de leitura
+README_GRANDE = b"a" + "é".encode() * (16 * 1024 * 1024)
+LIMITE = 2048
+
+
+class _ReadmeGrande:
+    """Rota que serve README_GRANDE em blocos, com ou sem suporte a Range"""
+
+    def __init__(self, aceita_range: bool):
+        self.aceita_range = aceita_range
+        self.enviados = 0
+        self.concluido = threading.Event()
+
+    def __call__(self, handler):
+        corpo, status = README_GRANDE, 200
+        intervalo = handler.headers.get("Range", "")
+        if self.aceita_range and intervalo.startswith("bytes=0-"):
+            corpo, status = README_GRANDE[:int(intervalo.split("-")[1]) + 1], 206
+        handler.send_response(status)
+        handler.send_header("Content-Length", str(len(corpo)))
+        handler.end_headers()
+        try:
+            for inicio in range(0, len(corpo), 64 * 1024):
+                handler.wfile.write(corpo[inicio:inicio + 64 * 1024])
+                self.enviados += len(corpo[inicio:inicio + 64 * 1024])
+        except (BrokenPipeError, ConnectionResetError):
+            handler.close_connection = True
+        finally:
+            self.concluido.set()
+
+
+@pytest.mark.parametrize("aceita_range", [True, False], ids=["com_range", "sem_range"])
+def test_readme_lido_ate_o_limite(servidor, cliente_github, aceita_range):
+    rota = servidor.rotas["/README.md"] = _ReadmeGrande(aceita_range)
+
+    resposta = asyncio.run(cliente_github.get(f"{servidor.url}/README.md", headers={}, limite_bytes=LIMITE))
+
+    assert resposta.status_code == (206 if aceita_range else 200)
+    assert resposta.content == README_GRANDE[:LIMITE]
+    assert resposta.text == "a" + "é" * ((LIMITE - 1) // 2)
+    assert servidor.requisicoes[0][1]["Range"] == f"bytes=0-{LIMITE - 1}"
+    # Sem Range a conexão é fechada após o limite: o servidor não chega ao fim do corpo
+    assert rota.concluido.wait(10)
+    assert rota.enviados < len(README_GRANDE)
+
+
+def _sample(nome, readme=""):
+    return {"nome": nome, "readme_conteudo": readme, "tecnologias": [], "arquivos": [], "estrutura": ""}
+
+
+def _descoberta(*corrotinas):
+    async def descobrir(base_url, headers):
+        return [corrotina() for corrotina in corrotinas]
+    return descobrir
+
+
+def test_falha_de_um_sample_nao_interrompe_a_busca(monkeypatch):
+    async def falha():
+        raise RuntimeError("README indisponível")
+
+    async def suporte():
+        return _sample("suporte", "triagem de chamados")
+
+    monkeypatch.setattr(tools, "_descobrir_samples", _descoberta(falha, suporte))
+
+    samples = asyncio.run(_coletar("triagem"))
+
+    assert [sample["nome"] for sample in samples] == ["suporte"]
+    assert samples[0]["relevance_score"] > 0
+
+
+def test_busca_para_quando_o_top_k_atinge_a_margem(monkeypatch):
+    async def irrelevante():
+        return _sample("clima", "previsão do tempo")
+
+    async def relevante():
+        await asyncio.sleep(0.01)
+        return _sample("suporte", "triagem de chamados")
+
+    async def tardio():
+        await asyncio.sleep(5)
+        return _sample("tardio", "triagem")
+
+    monkeypatch.setattr(tools, "_descobrir_samples", _descoberta(irrelevante, relevante, tardio))
+    condicao = tools.CondicaoParada(top_k=1, margem_score=0.1)
+
+    async def coletar():
+        return [sample async for sample in tools.buscar_samples_streaming("triagem", "geral", condicao)]
+
+    samples = asyncio.run(coletar())
+
+    assert [sample["nome"] for sample in samples] == ["clima", "suporte"]
+    assert condicao.interrompida and condicao.motivo == "top-1 atingido"
+
+
+def test_orcamento_de_latencia_e_opcional(monkeypatch):
+    monkeypatch.delenv("SAMPLES_ORCAMENTO_MS", raising=False)
+    assert tools.CondicaoParada.do_ambiente().orcamento_ms is None
+    monkeypatch.setenv("SAMPLES_ORCAMENTO_MS", "8000")
+    assert tools.CondicaoParada.do_ambiente().orcamento_ms == 8000
+
+
+def test_margem_de_score_padrao_encerra_a_busca(monkeypatch):
+    monkeypatch.delenv("SAMPLES_MARGEM_SCORE", raising=False)
+    assert tools.CondicaoParada.do_ambiente().margem_score == 2.5
+    monkeypatch.setenv("SAMPLES_MARGEM_SCORE", "")
+    assert tools.CondicaoParada.do_ambiente().margem_score is None
@@ -0,0 +1,42 @@
+"""
+Manifesto de hashes e histórico de versões dos documentos salvos.
+"""
+from mass_das.historico import ler_manifesto, reconstruir_versao, salvar_versionado
+
+
+def test_conteudo_igual_nao_e_reescrito(tmp_path):
+    documento = tmp_path / "ARQUITETURA.md"
+    escrito, hash_inicial = salvar_versionado(documento, ["# Arquitetura\n", "Agente raiz\n"])
+    assert escrito
+    mtime = documento.stat().st_mtime_ns
+
+    escrito, hash_repetido = salvar_versionado(documento, ["# Arquitetura\nAgente raiz\n"])
+    assert not escrito
+    assert hash_repetido == hash_inicial
+    assert documento.stat().st_mtime_ns == mtime
+    assert ler_manifesto(tmp_path)["documentos"]["ARQUITETURA.md"]["versoes"] == []
+
+
+def test_versoes_anteriores_reconstruidas_pelos_deltas(tmp_path):
+    documento = tmp_path / "ARQUITETURA.md"
+    versoes = [
+        "# Arquitetura\nAgente raiz\n",
+        "# Arquitetura\nAgente raiz\nSub-agente de busca\n",
+        "# Arquitetura v3\nSub-agente de busca\nSub-agente de escrita\n",
+    ]
+    for conteudo in versoes:
+        assert salvar_versionado(documento, [conteudo])[0]
+
+    assert len(ler_manifesto(tmp_path)["documentos"]["ARQUITETURA.md"]["versoes"]) == 2
+    for passos, esperado in enumerate(reversed(versoes)):
+        assert reconstruir_versao(documento, passos) == esperado
+
+
+def test_documento_com_crlf_mantem_o_historico(tmp_path):
+    documento = tmp_path / "ARQUITETURA.md"
+    salvar_versionado(documento, ["# Arquitetura\r\nAgente raiz\r\n"])
+    salvar_versionado(documento, ["# Arquitetura\r\nAgente raiz\r\nSub-agente\r\n"])
+
+    registro = ler_manifesto(tmp_path)["documentos"]["ARQUITETURA.md"]
+    assert len(registro["versoes"]) == 1
+    assert reconstruir_versao(documento, 1) == "# Arquitetura\r\nAgente raiz\r\n"
@@ -0,0 +1,44 @@
+"""
+Projeção do estado da sessão e truncamento dentro do orçamento de tokens.
+"""
+from mass_das.projecao import CARACTERES_POR_TOKEN, estimar_tokens, projetar_estado, truncar
+
+
+def test_truncar_mantem_inicio_e_fim_dentro_do_orcamento():
+    texto = "".join(f"linha {i:04d}\n" for i in range(500))
+    assert truncar(texto, estimar_tokens(texto)) == texto
+
+    truncado = truncar(texto, 100)
+    assert len(truncado) <= 100 * CARACTERES_POR_TOKEN
+    assert truncado.startswith("linha 0000\n")
+    assert truncado.endswith("linha 0499\n")
+    assert "caracteres omitidos" in truncado
+    # Orçamento menor que o próprio marcador
+    assert truncar(texto, 2) == ""
+
+
+def test_projecao_inclui_so_as_chaves_lidas():
+    estado = {
+        "plano_de_arquitetura": {"padrao": "Sequential"},
+        "prompts_gerados": "prompt do analista",
+        "historico_conversa": "não deve aparecer",
+        "ferramentas_definidas": "",
+    }
+    projetado = projetar_estado(estado, ["plano_de_arquitetura", "prompts_gerados", "ferramentas_definidas"])
+    assert projetado == (
+        '## plano_de_arquitetura\n{\n  "padrao": "Sequential"\n}'
+        "\n\n## prompts_gerados\nprompt do analista"
+    )
+
+
+def test_sobra_das_chaves_menores_vai_para_as_maiores():
+    estado = {"curta": "ok", "longa": "x" * 4000, "media": "y" * 200}
+    projetado = projetar_estado(estado, ["curta", "longa", "media"], orcamento=300)
+
+    assert estimar_tokens(projetado) <= 300 + 3 * 10  # cabeçalhos das seções
+    secoes = dict(secao.split("\n", 1) for secao in projetado.split("\n\n## "))
+    assert secoes["## curta"] == "ok"
+    assert secoes["media"] == "y" * 200
+    # A chave longa recebe o que as outras não usaram, não só um terço do orçamento
+    assert len(secoes["longa"]) > 300 // 3 * CARACTERES_POR_TOKEN
+    assert "caracteres omitidos" in secoes["longa"]
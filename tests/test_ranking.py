@@ -0,0 +1,47 @@
+"""
+Top-k por MaxScore contra a pontuação exaustiva do índice BM25F.
+"""
+import heapq
+import random
+
+import pytest
+
+from mass_das.ranking import IndiceBM25, IndiceSamples
+
+
+def _corpus(gerador, tamanho):
+    vocabulario = [f"w{i}" for i in range(800)]
+    pesos = [1 / (i + 1) for i in range(len(vocabulario))]
+    return [
+        {
+            "nome": "-".join(gerador.choices(vocabulario[:12], k=2)) + f"-{i}",
+            "readme_conteudo": " ".join(gerador.choices(vocabulario, pesos, k=gerador.randint(5, 80))),
+            "tecnologias": ["Python"],
+        }
+        for i in range(tamanho)
+    ]
+
+
+@pytest.mark.parametrize("top_k", [1, 5, 20])
+def test_max_score_igual_a_pontuacao_exaustiva(top_k):
+    gerador = random.Random(3)
+    indice = IndiceBM25({"nome": 5.0, "readme": 1.0})
+    for sample in _corpus(gerador, 1500):
+        indice.adicionar(sample, {"nome": sample["nome"], "readme": sample["readme_conteudo"]})
+
+    for _ in range(50):
+        consulta = {f"w{gerador.randrange(800)}": gerador.choice([0.8, 1.0, 2.0]) for _ in range(gerador.randint(1, 5))}
+        exaustivo = heapq.nlargest(top_k, indice.pontuar(consulta).items(), key=lambda item: item[1])
+        podado = indice.buscar(consulta, top_k)
+        assert [round(score, 9) for _, score in podado] == [round(score, 9) for _, score in exaustivo]
+
+
+def test_ranquear_aplica_boost_do_nome_no_top_k():
+    samples = _corpus(random.Random(5), 500) + [
+        {"nome": "w900-w901", "readme_conteudo": "w900", "tecnologias": []},
+    ]
+    indice = IndiceSamples(samples)
+
+    completo = indice.ranquear("w900 w901", "geral")
+    assert indice.ranquear("w900 w901", "geral", top_k=3) == completo[:3]
+    assert completo[0]["nome"] == "w900-w901"
@@ -0,0 +1,104 @@
+"""
+Retentativa em rate limit e baldes por credencial do AgendadorRequisicoes.
+"""
+import time
+import asyncio
+import itertools
+
+import requests
+
+from mass_das.rate_limit import AgendadorRequisicoes
+from conftest import responder
+
+
+def _sequencia(servidor, caminho, respostas):
+    """Rota que devolve as respostas (status, headers, corpo) em ordem, repetindo a última"""
+    proximas = itertools.chain(respostas, itertools.repeat(respostas[-1]))
+    servidor.rotas[caminho] = lambda handler: responder(handler, *_ordem(next(proximas)))
+
+
+def _ordem(resposta):
+    status, headers, corpo = resposta
+    return corpo, status, headers
+
+
+def _executar(agendador, url, headers=None):
+    headers = headers or {}
+    chave = AgendadorRequisicoes.chave_credencial(url, headers)
+    return agendador.executar(chave, lambda: asyncio.to_thread(requests.get, url, headers=headers, timeout=5))
+
+
+def test_429_com_retry_after_espera_e_repete(servidor):
+    _sequencia(servidor, "/limite", [
+        (429, {"Retry-After": "1"}, b""),
+        (200, {}, b"ok"),
+    ])
+    agendador = AgendadorRequisicoes(backoff_base=0.01)
+
+    inicio = time.monotonic()
+    resposta = asyncio.run(_executar(agendador, f"{servidor.url}/limite"))
+
+    assert resposta.status_code == 200
+    assert servidor.caminhos() == ["/limite", "/limite"]
+    assert time.monotonic() - inicio >= 1.0
+    assert agendador.estatisticas()["rate_limits"] == 1
+    assert agendador.estatisticas()["retentativas"] == 1
+
+
+def test_403_de_rate_limit_espera_o_reset(servidor):
+    _sequencia(servidor, "/cota", [
+        (403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(time.time()) + 1)},
+         b'{"message": "API rate limit exceeded"}'),
+        (200, {"X-RateLimit-Remaining": "4999", "X-RateLimit-Reset": str(int(time.time()) + 3600)}, b"ok"),
+    ])
+    agendador = AgendadorRequisicoes(backoff_base=0.01)
+
+    resposta = asyncio.run(_executar(agendador, f"{servidor.url}/cota"))
+
+    assert resposta.status_code == 200
+    assert len(servidor.requisicoes) == 2
+    assert agendador.estatisticas()["rate_limits"] == 1
+
+
+def test_403_de_permissao_nao_e_repetido(servidor):
+    _sequencia(servidor, "/privado", [
+        (403, {"X-RateLimit-Remaining": "4999"}, b'{"message": "Resource not accessible by integration"}'),
+    ])
+    agendador = AgendadorRequisicoes(backoff_base=0.01)
+
+    resposta = asyncio.run(_executar(agendador, f"{servidor.url}/privado"))
+
+    assert resposta.status_code == 403
+    assert len(servidor.requisicoes) == 1
+    assert agendador.estatisticas()["rate_limits"] == 0
+
+
+def test_baldes_separados_por_credencial(servidor):
+    # A cota do token A zera; o token B e o acesso anônimo seguem sem espera
+    _sequencia(servidor, "/a", [
+        (200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(time.time()) + 60)}, b"ok"),
+    ])
+    _sequencia(servidor, "/b", [(200, {}, b"ok")])
+    agendador = AgendadorRequisicoes(backoff_base=0.01)
+    token_a = {"Authorization": "Bearer token-a"}
+    token_b = {"Authorization": "Bearer token-b"}
+
+    chaves = {
+        AgendadorRequisicoes.chave_credencial(servidor.url, headers)
+        for headers in (token_a, token_b, {})
+    }
+    assert len(chaves) == 3
+    assert all("token-" not in chave for chave in chaves)
+
+    async def cenario():
+        await _executar(agendador, f"{servidor.url}/a", token_a)
+        inicio = time.monotonic()
+        await _executar(agendador, f"{servidor.url}/b", token_b)
+        await _executar(agendador, f"{servidor.url}/b")
+        return time.monotonic() - inicio
+
+    assert asyncio.run(cenario()) < 1.0
+    baldes = agendador.estatisticas()["baldes"]
+    chave_a = AgendadorRequisicoes.chave_credencial(servidor.url, token_a)
+    assert baldes[chave_a]["restantes"] == 0
+    assert [balde["restantes"] for chave, balde in baldes.items() if chave != chave_a] == [None, None]
@@ -0,0 +1,56 @@
+"""
+Política de modelos, fallback por SLO e orçamento do roteador.
+"""
+import json
+
+import pytest
+
+from mass_das.roteador import AMOSTRAS_MINIMAS, OrcamentoExcedido, RoteadorModelos, carregar_politica
+
+
+def _roteador(tmp_path, agentes, **kwargs):
+    arquivo = tmp_path / "politica.json"
+    arquivo.write_text(json.dumps({"agentes": agentes}), encoding="utf-8")
+    return RoteadorModelos(carregar_politica(str(arquivo)), **kwargs)
+
+
+def test_politica_padrao_mantem_todos_no_pro():
+    roteador = RoteadorModelos(carregar_politica(""))
+    for agente in roteador.politica["agentes"]:
+        assert roteador.escolher(agente, "inv", 1000).nivel == "pro"
+
+
+def test_p95_acima_do_slo_usa_o_nivel_mais_rapido(tmp_path):
+    roteador = _roteador(tmp_path, {"analista_requisitos": {"nivel": "pro", "slo_p95_ms": 1000}})
+    for _ in range(AMOSTRAS_MINIMAS - 1):
+        roteador.registrar_latencia("analista_requisitos", "pro", 5000)
+    # Poucas amostras: o SLO ainda não vale
+    assert roteador.escolher("analista_requisitos", "inv", 1000).nivel == "pro"
+
+    roteador.registrar_latencia("analista_requisitos", "pro", 5000)
+    decisao = roteador.escolher("analista_requisitos", "inv", 1000)
+    assert decisao.nivel == "flash"
+    assert decisao.modelo == roteador.politica["niveis"]["flash"]["modelo"]
+    assert "SLO" in decisao.motivo
+
+
+def test_amostras_fora_da_janela_devolvem_o_nivel_original(tmp_path):
+    roteador = _roteador(tmp_path, {"analista_requisitos": {"nivel": "pro", "slo_p95_ms": 1000}},
+                         janela_segundos=60)
+    for _ in range(AMOSTRAS_MINIMAS):
+        roteador.registrar_latencia("analista_requisitos", "pro", 5000, quando=1.0)
+    assert roteador.escolher("analista_requisitos", "inv", 1000).nivel == "pro"
+
+
+def test_orcamento_rebaixa_e_depois_interrompe(tmp_path):
+    roteador = _roteador(tmp_path, {"arquiteto_coordenador": {"nivel": "pro"}}, orcamento_usd=0.02)
+    # No pro: 10k tokens de entrada (US$ 0,0125) + 1000 de saída estimados (US$ 0,01)
+    decisao = roteador.escolher("arquiteto_coordenador", "inv", 10_000)
+    assert decisao.nivel == "flash"
+    assert decisao.motivo.startswith("orçamento")
+
+    roteador._somar_gasto("inv", 0.02)
+    with pytest.raises(OrcamentoExcedido):
+        roteador.escolher("arquiteto_coordenador", "inv", 10)
+    # O orçamento é por execução
+    assert roteador.escolher("arquiteto_coordenador", "outra", 10).nivel == "pro"
@@ -0,0 +1,60 @@
+"""
+Backends de saída do gerador de projetos.
+"""
+import io
+import json
+import asyncio
+import zipfile
+
+import pytest
+
+from mass_das import tools
+from mass_das.saida import SaidaMemoria, SaidaProjeto, SaidaZip
+
+
+ARQUITETURA = {"agentes": [{"nome": "triagem", "tipo": "LlmAgent", "descricao": "Classifica chamados"}]}
+
+
+class _ContextoFerramenta:
+    """O suficiente de ToolContext para a ferramenta salvar artefatos"""
+
+    def __init__(self):
+        self.artefatos = {}
+
+    async def save_artifact(self, filename, artifact, custom_metadata=None):
+        self.artefatos[filename] = artifact
+        return len(self.artefatos) - 1
+
+
+def _gerar(contexto):
+    return asyncio.run(tools.gerar_codigo_agentes(
+        json.dumps(ARQUITETURA), json.dumps({}), json.dumps([]), contexto, nome_projeto="suporte",
+    ))
+
+
+def test_saida_projeto_e_abstrata():
+    with pytest.raises(TypeError):
+        SaidaProjeto()
+
+
+def test_zip_salvo_como_artefato(monkeypatch):
+    monkeypatch.setattr(tools, "obter_saida_projeto", SaidaZip)
+    contexto = _ContextoFerramenta()
+
+    descricao = _gerar(contexto)
+
+    assert "salvo como artefato suporte.zip (versão 0)" in descricao
+    parte = contexto.artefatos["suporte.zip"]
+    assert parte.inline_data.mime_type == "application/zip"
+    nomes = zipfile.ZipFile(io.BytesIO(parte.inline_data.data)).namelist()
+    assert any(nome.startswith("suporte/") and nome.endswith(".py") for nome in nomes)
+
+
+def test_memoria_recusada_pela_ferramenta(monkeypatch):
+    monkeypatch.setattr(tools, "obter_saida_projeto", SaidaMemoria)
+    contexto = _ContextoFerramenta()
+
+    descricao = _gerar(contexto)
+
+    assert descricao.startswith("Erro na geração de código") and "gerar_projeto" in descricao
+    assert contexto.artefatos == {}